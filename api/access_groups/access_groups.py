@@ -152,8 +152,7 @@ async def save_access_group(
             f"Unable to add access group {access_group_name}"
         ) from None
 
-    await AccessGroups.load()
-    # TODO: messaging: notify other instances
+    await AccessGroups.reload()
     return EmptyResponse()
 
 
@@ -184,7 +183,6 @@ async def delete_access_group(
     if scope == "public":
         background_tasks.add_task(clean_up_user_access_groups)
 
-    await AccessGroups.load()
-    # TODO: messaging: notify other instances
+    await AccessGroups.reload()
 
     return EmptyResponse()
@@ -123,11 +123,13 @@ class SimpleActionCache:
 
     @classmethod
     async def handle_project_changed(cls, event: EventModel):
-        keys = await Redis.keys(cls.ns)
-        for key in keys:
-            _, _, project_name, _ = key.split("|")
-            if project_name == event.project:
-                await Redis.delete(cls.ns, key)
+        async for keys in Redis.scan(cls.ns):
+            to_delete = []
+            for key in keys:
+                _, _, project_name, _ = key.split("|")
+                if project_name == event.project:
+                    to_delete.append(key)
+            await Redis.delete(cls.ns, *to_delete)
 
     @classmethod
     async def handle_settings_changed(cls, event: EventModel):
@@ -135,18 +137,19 @@ class SimpleActionCache:
         addon_version = event.summary["addon_version"]
         variant = event.summary["variant"]
 
-        keys = await Redis.keys(cls.ns)
-        for key in keys:
-            addon, version, _, v = key.split("|")
-            if addon == addon_name and version == addon_version and v == variant:
-                await Redis.delete(cls.ns, key)
+        async for keys in Redis.scan(cls.ns):
+            to_delete = []
+            for key in keys:
+                addon, version, _, v = key.split("|")
+                if addon == addon_name and version == addon_version and v == variant:
+                    to_delete.append(key)
+            await Redis.delete(cls.ns, *to_delete)
 
     @classmethod
     async def clear_action_cache(cls) -> None:
         logging.debug("Clearing actions cache")
-        keys = await Redis.keys(cls.ns)
-        for key in keys:
-            await Redis.delete(cls.ns, key)
+        async for keys in Redis.scan(cls.ns):
+            await Redis.delete(cls.ns, *keys)
 
     @classmethod
     async def get(
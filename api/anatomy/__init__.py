@@ -9,6 +9,7 @@ from ayon_server.exceptions import (
     ForbiddenException,
     NotFoundException,
 )
+from ayon_server.lib.local_cache import LocalCache
 from ayon_server.lib.postgres import Postgres
 from ayon_server.settings.anatomy import Anatomy
 from ayon_server.settings.postprocess import postprocess_settings_schema
@@ -126,6 +127,7 @@ async def update_anatomy_preset(
         preset.dict(),
         preset.dict(),
     )
+    await LocalCache.invalidate("global", "primary-anatomy-preset")
     return EmptyResponse()
 
 
@@ -154,6 +156,7 @@ async def set_primary_preset(preset_name: str, user: CurrentUser) -> EmptyRespon
                     """,
                     preset_name,
                 )
+    await LocalCache.invalidate("global", "primary-anatomy-preset")
     return EmptyResponse()
 
 
@@ -174,6 +177,7 @@ async def unset_primary_preset(preset_name: str, user: CurrentUser) -> EmptyResp
                 """,
                 preset_name,
             )
+    await LocalCache.invalidate("global", "primary-anatomy-preset")
     return EmptyResponse()
 
 
@@ -194,4 +198,5 @@ async def delete_anatomy_preset(preset_name: str, user: CurrentUser) -> EmptyRes
                 preset_name,
             )
 
+    await LocalCache.invalidate("global", "primary-anatomy-preset")
     return EmptyResponse()
@@ -1,8 +1,10 @@
 import re
+import time
 
 from ayon_server.api.dependencies import CurrentUser
 from ayon_server.api.responses import EmptyResponse
 from ayon_server.events.enroll import EnrollResponseModel, enroll_job
+from ayon_server.events.waiters import EnrollWaiter
 from ayon_server.exceptions import (
     BadRequestException,
     ForbiddenException,
@@ -52,6 +54,17 @@ class EnrollRequestModel(OPModel):
         None, title="Filter", description="Filter source events"
     )
     max_retries: int = Field(3, title="Max retries", example=3)
+    wait: int = Field(
+        0,
+        title="Wait",
+        description=(
+            "Seconds to wait for a new job, when none is available. "
+            "The request returns as soon as a job is created."
+        ),
+        ge=0,
+        le=60,
+        example=30,
+    )
     debug: bool = False
 
 
@@ -73,6 +86,11 @@ async def enroll(
     Used by workers to get a new job to process. If there is no job
     available, request returns 204 (no content).
 
+    With `wait` set, the request does not return immediately when there
+    is no job. It waits until a matching source event is finished
+    (or a target event fails), then enrolls again, so workers get
+    new jobs without polling.
+
     Returns 503 (service unavailable) if the database pool is almost full.
     Processing jobs should never block user requests.
 
@@ -104,18 +122,28 @@ async def enroll(
 
     user_name = current_user.name
 
-    res = await enroll_job(
-        source_topic,
-        payload.target_topic,
-        sender=payload.sender,
-        user_name=user_name,
-        description=payload.description,
-        sequential=payload.sequential,
-        filter=payload.filter,
-        max_retries=payload.max_retries,
-    )
-
-    if res is None:
-        return EmptyResponse()
-
-    return res
+    deadline = time.monotonic() + payload.wait
+
+    while True:
+        # Register the waiter before enrolling, so events dispatched
+        # during the enroll query wake it up too.
+        with EnrollWaiter(source_topic, payload.target_topic) as waiter:
+            res = await enroll_job(
+                source_topic,
+                payload.target_topic,
+                sender=payload.sender,
+                user_name=user_name,
+                description=payload.description,
+                sequential=payload.sequential,
+                filter=payload.filter,
+                max_retries=payload.max_retries,
+            )
+
+            if res is not None:
+                return res
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return EmptyResponse()
+
+            await waiter.wait(remaining)
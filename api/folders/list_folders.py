@@ -2,17 +2,14 @@ import datetime
 import time
 from typing import Any
 
-from fastapi import Response
-from nxtools import log_traceback
-from pydantic.error_wrappers import ValidationError
+from fastapi import Query, Response
 
+from ayon_server.access.path_access import compile_path_access
 from ayon_server.access.utils import folder_access_list
 from ayon_server.api.dependencies import CurrentUser, ProjectName
-from ayon_server.exceptions import AyonException
-from ayon_server.helpers.hierarchy_cache import rebuild_hierarchy_cache
-from ayon_server.lib.redis import Redis
-from ayon_server.types import OPModel
-from ayon_server.utils import json_loads
+from ayon_server.helpers.hierarchy_cache import get_hierarchy_cache
+from ayon_server.types import Field, OPModel
+from ayon_server.utils import json_dumps
 
 from .router import router
 
@@ -37,14 +34,23 @@ class FolderListItem(OPModel):
 class FolderListModel(OPModel):
     detail: str
     folders: list[FolderListItem]
-
-
-async def get_entities(project_name: str) -> list[dict[str, str]]:
-    entities_data = await Redis.get("project.folders", project_name)
-    if entities_data is None:
-        return await rebuild_hierarchy_cache(project_name)
-    else:
-        return json_loads(entities_data)
+    revision: int = Field(
+        0,
+        title="Revision",
+        description="Revision of the project hierarchy. "
+        "Pass it as `since` to get only the changes in the next request.",
+    )
+    since: int | None = Field(
+        None,
+        title="Since",
+        description="When set, `folders` contains only folders changed "
+        "since this revision. When null, `folders` is the full list.",
+    )
+    deleted_folder_ids: list[str] = Field(
+        default_factory=list,
+        title="Deleted folder IDs",
+        description="IDs of folders deleted since the requested revision",
+    )
 
 
 @router.get("", response_class=Response, responses={200: {"model": FolderListModel}})
@@ -52,6 +58,11 @@ async def get_folder_list(
     user: CurrentUser,
     project_name: ProjectName,
     attrib: bool = False,
+    since: int | None = Query(
+        None,
+        title="Since revision",
+        description="Return only folders changed since the given revision",
+    ),
 ):
     """Return all folders in the project. Fast.
 
@@ -60,20 +71,32 @@ async def get_folder_list(
     since it uses a cache. The cache is updated every time a
     folder is created, updated, or deleted.
 
+    The response contains the current revision of the project hierarchy.
+    Clients may pass it back as `since` to receive only the folders
+    changed since then. If the server cannot provide the changes
+    (e.g. the cache was rebuilt), the full list is returned and
+    `since` of the response is null. Users with limited folder access
+    also receive the full list when some folders were deleted.
+
     The endpoint handles ACL and also returns folder attributes.
     """
 
     start_time = time.monotonic()
     access_list = await folder_access_list(user, project_name, "read")
-    entities = await get_entities(project_name)
+    matcher = compile_path_access(access_list) if access_list is not None else None
+    snapshot = await get_hierarchy_cache(project_name, since)
+    if matcher is not None and snapshot.deleted:
+        # Paths of deleted folders are not known anymore, so we can't tell
+        # which of them the user could read. Send the full list instead.
+        snapshot = await get_hierarchy_cache(project_name)
 
     result = []
-    for folder in entities:
-        if access_list is not None and folder["path"] not in access_list:
+    for folder in snapshot.folders:
+        if matcher is not None and not matcher.match(folder["path"]):
             continue
         if not attrib:
             folder.pop("attrib", None)
-            folder.pop("own_attrib", None)
+            folder.pop("ownAttrib", None)
         else:
             pass  # TODO: handle attrib whitelist
         result.append(folder)
@@ -84,17 +107,16 @@ async def get_folder_list(
         f"of {project_name} fetched in {elapsed_time:.2f} seconds"
     )
 
-    # we need to do the validation here in order to convert snake_case to camelCase
-    # dumping to json here to bypass fastapi re-validation, which takes ages
-
-    try:
-        r = FolderListModel(detail=detail, folders=result).json(
-            by_alias=True,
-            exclude_unset=True,
-        )
-    except ValidationError:
-        await rebuild_hierarchy_cache(project_name)
-        log_traceback("Wrong model. Revalidating")
-        raise AyonException("Invalid cache data. Please try again")
-
+    # Cache entries are already stored in camelCase,
+    # so we bypass the (slow) model validation here.
+
+    r = json_dumps(
+        {
+            "detail": detail,
+            "folders": result,
+            "revision": snapshot.revision,
+            "since": snapshot.since,
+            "deletedFolderIds": snapshot.deleted,
+        }
+    )
     return Response(content=r, media_type="application/json")
@@ -3,6 +3,7 @@ from typing import TYPE_CHECKING, ForwardRef
 
 from fastapi import APIRouter, Query
 
+from ayon_server.access.path_access import compile_path_access
 from ayon_server.access.utils import folder_access_list
 from ayon_server.api.dependencies import CurrentUser, ProjectName
 from ayon_server.lib.postgres import Postgres
@@ -80,7 +81,7 @@ async def get_folder_hierarchy(
     access_list = await folder_access_list(user, project_name, "read")
 
     if access_list is not None:
-        conds.append(f"path like ANY ('{{ {','.join(access_list)} }}')")
+        conds.append(compile_path_access(access_list).sql_condition("path"))
 
     # TODO: eventually solve products too. ATM it clashes with the
     # task names list (group by hell), which is more important.
@@ -101,9 +102,9 @@ async def get_folder_hierarchy(
         FROM
             project_{project_name}.folders AS folders
         INNER JOIN
-            project_{project_name}.hierarchy AS hierarchy
+            project_{project_name}.entity_paths AS hierarchy
         ON
-            folders.id = hierarchy.id
+            folders.id = hierarchy.entity_id
         -- LEFT JOIN
         --     project_{project_name}.products AS products
         -- ON
@@ -1,22 +1,25 @@
+import asyncio
 from contextlib import suppress
 from typing import Any, Literal
 
 from fastapi import APIRouter, BackgroundTasks, Header
-from nxtools import log_traceback
+from nxtools import log_traceback, logging
 
 from ayon_server.api.dependencies import CurrentUser, ProjectName
 from ayon_server.config import ayonconfig
 from ayon_server.entities import UserEntity
 from ayon_server.entities.core import ProjectLevelEntity
-from ayon_server.events import dispatch_event
+from ayon_server.events import EventStream
 from ayon_server.events.patch import build_pl_entity_change_events
 from ayon_server.exceptions import (
     AyonException,
     BadRequestException,
     ForbiddenException,
+    NotFoundException,
 )
+from ayon_server.helpers.commit_scheduler import deferred_commits
 from ayon_server.helpers.get_entity_class import get_entity_class
-from ayon_server.lib.postgres import Postgres
+from ayon_server.lib.postgres import Connection, Postgres
 from ayon_server.types import Field, OPModel, ProjectLevelEntityType
 from ayon_server.utils import create_uuid
 
@@ -90,6 +93,76 @@ class OperationsResponseModel(OPModel):
 #
 
 
+def _create_entity(
+    project_name: str,
+    user: UserEntity,
+    operation: OperationModel,
+) -> tuple[ProjectLevelEntity, list[dict[str, Any]]]:
+    """Create a new (unsaved) entity and its event data from a create operation"""
+
+    assert operation.data is not None, "data is required for create"
+    entity_class = get_entity_class(operation.entity_type)
+    payload = entity_class.model.post_model(**operation.data)
+    payload_dict = payload.dict()
+    if operation.entity_id is not None:
+        payload_dict["id"] = operation.entity_id
+    if operation.entity_type == "version":
+        if not payload_dict.get("author"):
+            payload_dict["author"] = user.name
+    elif operation.entity_type == "workfile":
+        if not payload_dict.get("created_by"):
+            payload_dict["created_by"] = user.name
+        if not payload_dict.get("updated_by"):
+            payload_dict["updated_by"] = payload_dict["created_by"]
+    entity = entity_class(project_name, payload_dict)
+    description = f"{operation.entity_type.capitalize()} {entity.name} created"
+    events = [
+        {
+            "topic": f"entity.{operation.entity_type}.created",
+            "summary": {"entityId": entity.id, "parentId": entity.parent_id},
+            "description": description,
+            "project": project_name,
+        }
+    ]
+    return entity, events
+
+
+async def _patch_entity(
+    entity: ProjectLevelEntity,
+    user: UserEntity,
+    operation: OperationModel,
+) -> list[dict[str, Any]]:
+    """Apply an update operation to a loaded entity and return its event data"""
+
+    # in this case, thumbnailId is camelCase, since we pass a dict
+    assert operation.data is not None, "data is required for update"
+    thumbnail_only = len(operation.data) == 1 and "thumbnailId" in operation.data
+
+    payload = entity.model.patch_model(**operation.data)
+
+    if operation.entity_type == "workfile":
+        if not payload.updated_by:  # type: ignore
+            payload.updated_by = user.name  # type: ignore
+
+    await entity.ensure_update_access(user, thumbnail_only=thumbnail_only)
+    events = build_pl_entity_change_events(entity, payload)
+    entity.patch(payload)
+    return events
+
+
+def _operation_response(
+    operation: OperationModel,
+    entity: ProjectLevelEntity,
+) -> OperationResponseModel:
+    return OperationResponseModel(
+        success=True,
+        id=operation.id,
+        type=operation.type,
+        entity_id=entity.id,
+        entity_type=operation.entity_type,
+    )
+
+
 async def process_operation(
     project_name: str,
     user: UserEntity,
@@ -104,53 +177,19 @@ async def process_operation(
     events: list[dict[str, Any]] | None = None
 
     if operation.type == "create":
-        assert operation.data is not None, "data is required for create"
-        payload = entity_class.model.post_model(**operation.data)
-        payload_dict = payload.dict()
-        if operation.entity_id is not None:
-            payload_dict["id"] = operation.entity_id
-        if operation.entity_type == "version":
-            if not payload_dict.get("author"):
-                payload_dict["author"] = user.name
-        elif operation.entity_type == "workfile":
-            if not payload_dict.get("created_by"):
-                payload_dict["created_by"] = user.name
-            if not payload_dict.get("updated_by"):
-                payload_dict["updated_by"] = payload_dict["created_by"]
-        entity = entity_class(project_name, payload_dict)
+        entity, events = _create_entity(project_name, user, operation)
         await entity.ensure_create_access(user)
-        description = f"{operation.entity_type.capitalize()} {entity.name} created"
-        events = [
-            {
-                "topic": f"entity.{operation.entity_type}.created",
-                "summary": {"entityId": entity.id, "parentId": entity.parent_id},
-                "description": description,
-                "project": project_name,
-            }
-        ]
         await entity.save(transaction=transaction)
 
     elif operation.type == "update":
-        # in this case, thumbnailId is camelCase, since we pass a dict
-        assert operation.data is not None, "data is required for update"
-        thumbnail_only = len(operation.data) == 1 and "thumbnailId" in operation.data
-
-        payload = entity_class.model.patch_model(**operation.data)
         assert operation.entity_id is not None, "entity_id is required for update"
-
-        if operation.entity_type == "workfile":
-            if not payload.updated_by:  # type: ignore
-                payload.updated_by = user.name  # type: ignore
-
         entity = await entity_class.load(
             project_name,
             operation.entity_id,
             for_update=True,
             transaction=transaction,
         )
-        await entity.ensure_update_access(user, thumbnail_only=thumbnail_only)
-        events = build_pl_entity_change_events(entity, payload)
-        entity.patch(payload)
+        events = await _patch_entity(entity, user, operation)
         await entity.save(transaction=transaction)
 
     elif operation.type == "delete":
@@ -176,17 +215,121 @@ async def process_operation(
     else:
         raise BadRequestException(f"Unknown operation type {operation.type}")
 
-    return (
-        entity,
-        events,
-        OperationResponseModel(
-            success=True,
-            id=operation.id,
-            type=operation.type,
-            entity_id=entity.id,
-            entity_type=operation.entity_type,
-        ),
-    )
+    return entity, events, _operation_response(operation, entity)
+
+
+#
+# Bulk processing
+#
+
+
+def split_operations(operations: list[OperationModel]) -> list[list[OperationModel]]:
+    """Split operations to chunks, which may be processed in bulk.
+
+    A chunk is a run of consecutive create or update operations of the same
+    entity type. Splitting preserves the order of the operations, so
+    dependencies between them (e.g. a task created in a new folder)
+    are respected. Deletes always form single-operation chunks.
+    """
+    chunks: list[list[OperationModel]] = []
+    for operation in operations:
+        if (
+            chunks
+            and operation.type != "delete"
+            and chunks[-1][0].type == operation.type
+            and chunks[-1][0].entity_type == operation.entity_type
+        ):
+            chunks[-1].append(operation)
+        else:
+            chunks.append([operation])
+    return chunks
+
+
+async def _process_chunk(
+    project_name: str,
+    user: UserEntity,
+    operations: list[OperationModel],
+    transaction: Connection,
+) -> list[tuple[ProjectLevelEntity, list[dict[str, Any]], OperationResponseModel]]:
+    """Process a chunk of operations of the same type and entity type.
+
+    Entities are loaded (and locked) using one query, validated in memory
+    and written using multi-row statements. Raises an exception
+    when any of the operations fails.
+    """
+
+    entity_class = get_entity_class(operations[0].entity_type)
+    entities: list[ProjectLevelEntity] = []
+    result = []
+
+    # Access checks are awaited concurrently, so they are resolved
+    # using a single query (see ayon_server.access.utils)
+
+    if operations[0].type == "create":
+        for operation in operations:
+            entity, events = _create_entity(project_name, user, operation)
+            entities.append(entity)
+            result.append((entity, events, _operation_response(operation, entity)))
+        await asyncio.gather(*(e.ensure_create_access(user) for e in entities))
+
+    else:
+        entity_ids = [operation.entity_id for operation in operations]
+        assert None not in entity_ids, "entity_id is required for update"
+        loaded = {
+            entity.id: entity
+            for entity in await entity_class.load_many(
+                project_name,
+                entity_ids,  # type: ignore
+                transaction=transaction,
+                for_update=True,
+            )
+        }
+        for operation in operations:
+            if (entity := loaded.get(operation.entity_id)) is None:  # type: ignore
+                raise NotFoundException("Entity not found")
+            entities.append(entity)
+        patch_events = await asyncio.gather(
+            *(
+                _patch_entity(entity, user, operation)
+                for entity, operation in zip(entities, operations)
+            )
+        )
+        for entity, operation, events in zip(entities, operations, patch_events):
+            result.append((entity, events, _operation_response(operation, entity)))
+
+    await entity_class.save_many(entities, transaction)
+    return result
+
+
+async def process_chunk(
+    project_name: str,
+    user: UserEntity,
+    operations: list[OperationModel],
+    transaction=None,
+) -> (
+    list[tuple[ProjectLevelEntity, list[dict[str, Any]], OperationResponseModel]] | None
+):
+    """Try to process a chunk of operations in bulk.
+
+    Returns None when the chunk cannot be processed in bulk (any operation
+    fails). In that case, nothing is written and the operations should be
+    processed one by one to get the result of each of them.
+    """
+
+    try:
+        if transaction is None:
+            async with Postgres.acquire() as conn, conn.transaction():
+                return await _process_chunk(project_name, user, operations, conn)
+        # Nested transaction block creates a savepoint, so a failed
+        # chunk does not abort the outer transaction
+        async with transaction.transaction():
+            return await _process_chunk(project_name, user, operations, transaction)
+    except Exception as e:
+        logging.debug(
+            f"Unable to process {len(operations)} {operations[0].entity_type} "
+            f"{operations[0].type} operations in bulk: {e}"
+        )
+        return None
 
 
 async def process_operations(
@@ -201,6 +344,11 @@ async def process_operations(
     This is separated from the endpoint so the endpoint can
     run this operation within or without a transaction context.
 
+    Consecutive create or update operations of the same entity type
+    are processed in bulk. If a bulk chunk fails, its operations are
+    processed one by one, so the result of each operation is the same
+    as if there was no bulk processing.
+
     This function should not raise an exception. If an operation
     fails, success=False is returned.
     """
@@ -209,51 +357,72 @@ async def process_operations(
     to_commit: list[ProjectLevelEntity] = []
 
     events: list[dict[str, Any]] = []
+    failed = False
 
-    for _i, operation in enumerate(operations):
-        try:
-            entity, evt, response = await process_operation(
+    for chunk in split_operations(operations):
+        if len(chunk) > 1:
+            processed = await process_chunk(
                 project_name,
                 user,
-                operation,
+                chunk,
                 transaction=transaction,
             )
-            if evt is not None:
-                events.extend(evt)
-            result.append(response)
-            if entity.entity_type not in [e.entity_type for e in to_commit]:
+            if processed is not None:
+                for entity, entity_events, response in processed:
+                    events.extend(entity_events)
+                    result.append(response)
+                    to_commit.append(entity)
+                continue
+
+        for operation in chunk:
+            try:
+                entity, evt, response = await process_operation(
+                    project_name,
+                    user,
+                    operation,
+                    transaction=transaction,
+                )
+                if evt is not None:
+                    events.extend(evt)
+                result.append(response)
+                # Commits only update derived data of the entity
                 to_commit.append(entity)
-        except AyonException as e:
-            result.append(
-                OperationResponseModel(
-                    success=False,
-                    id=operation.id,
-                    type=operation.type,
-                    status=e.status,
-                    detail=e.detail,
-                    entity_id=operation.entity_id,
-                    entity_type=operation.entity_type,
+            except AyonException as e:
+                result.append(
+                    OperationResponseModel(
+                        success=False,
+                        id=operation.id,
+                        type=operation.type,
+                        status=e.status,
+                        detail=e.detail,
+                        entity_id=operation.entity_id,
+                        entity_type=operation.entity_type,
+                    )
                 )
-            )
-            if not can_fail:
-                break
-        except Exception as exc:
-            log_traceback()
-            result.append(
-                OperationResponseModel(
-                    success=False,
-                    id=operation.id,
-                    type=operation.type,
-                    status=500,
-                    detail=str(exc),
-                    entity_id=operation.entity_id,
-                    entity_type=operation.entity_type,
+                if not can_fail:
+                    failed = True
+                    break
+            except Exception as exc:
+                log_traceback()
+                result.append(
+                    OperationResponseModel(
+                        success=False,
+                        id=operation.id,
+                        type=operation.type,
+                        status=500,
+                        detail=str(exc),
+                        entity_id=operation.entity_id,
+                        entity_type=operation.entity_type,
+                    )
                 )
-            )
 
-            if not can_fail:
-                # No need to continue
-                break
+                if not can_fail:
+                    # No need to continue
+                    failed = True
+                    break
+
+        if failed:
+            break
 
     for op in result:
         if op.status:
@@ -268,12 +437,23 @@ async def process_operations(
     # Create overall success value
     success = all(op.success for op in result)
     if success or can_fail:
-        for entity in to_commit:
-            await entity.commit(transaction=transaction)
+        # Post-commit work of all entities is coalesced and executed once
+        async with deferred_commits(project_name, transaction=transaction):
+            for entity in to_commit:
+                await entity.commit(transaction=transaction)
 
     return events, OperationsResponseModel(operations=result, success=success)
 
 
+async def dispatch_events(
+    events: list[dict[str, Any]],
+    sender: str | None = None,
+    user: str | None = None,
+) -> None:
+    """Dispatch events of processed operations (in a background task)."""
+    await EventStream.dispatch_many(events, sender=sender, user=user)
+
+
 #
 # Operations request
 #
@@ -327,39 +507,43 @@ async def operations(
             )
         affected_entities.append(key)
 
-    if payload.can_fail:
-        events, response = await process_operations(
-            project_name,
-            user,
-            payload.operations,
-            can_fail=True,
-        )
-        return response
-
-    # If can_fail is false, process all items in a transaction
-    # and roll back on error
-
-    events = []
-    with suppress(RollbackException):
-        async with Postgres.acquire() as conn:
-            async with conn.transaction():
-                events, response = await process_operations(
-                    project_name,
-                    user,
-                    payload.operations,
-                    transaction=conn,
-                )
-
-                if not response.success:
-                    events = []
-                    raise RollbackException()
+    # Hierarchy cache updates are deferred until the transaction
+    # is committed and coalesced with other requests
 
-    for event in events:
+    async with deferred_commits(project_name):
+        if payload.can_fail:
+            events, response = await process_operations(
+                project_name,
+                user,
+                payload.operations,
+                can_fail=True,
+            )
+            return response
+
+        # If can_fail is false, process all items in a transaction
+        # and roll back on error
+
+        events = []
+        with suppress(RollbackException):
+            async with Postgres.acquire() as conn:
+                async with conn.transaction():
+                    events, response = await process_operations(
+                        project_name,
+                        user,
+                        payload.operations,
+                        transaction=conn,
+                    )
+
+                    if not response.success:
+                        events = []
+                        raise RollbackException()
+
+    if events:
         background_tasks.add_task(
-            dispatch_event,
+            dispatch_events,
+            events,
             sender=x_sender,
             user=user.name,
-            **event,
         )
 
     return response
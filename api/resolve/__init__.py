@@ -184,7 +184,7 @@ async def resolve_entities(
     path_only: bool = False,
 ) -> list[ResolvedEntityModel]:
     result = []
-    cols = ["h.id as folder_id"]
+    cols = ["h.entity_id as folder_id"]
     joins = []
     conds = []
 
@@ -209,7 +209,7 @@ async def resolve_entities(
 
     if req.task_name is not None or req.workfile_name is not None:
         cols.append("t.id as task_id")
-        joins.append("INNER JOIN tasks AS t ON h.id = t.folder_id")
+        joins.append("INNER JOIN tasks AS t ON h.entity_id = t.folder_id")
         conds.append(f"t.name = '{req.task_name}'")
         target_entity_type = "task"
         if req.workfile_name is not None:
@@ -231,7 +231,7 @@ async def resolve_entities(
                     "r.data->'context' as context",
                 ]
             )
-            joins.append("INNER JOIN products AS s ON h.id = s.folder_id")
+            joins.append("INNER JOIN products AS s ON h.entity_id = s.folder_id")
             joins.append("INNER JOIN versions AS v ON s.id = v.product_id")
             joins.append("INNER JOIN representations AS r ON v.id = r.version_id")
             conds.extend(get_representation_conditions(req.representation_name))
@@ -242,7 +242,7 @@ async def resolve_entities(
 
         elif req.version_name is not None:
             cols.extend(["s.id as product_id", "v.id as version_id"])
-            joins.append("INNER JOIN products AS s ON h.id = s.folder_id")
+            joins.append("INNER JOIN products AS s ON h.entity_id = s.folder_id")
             joins.append("INNER JOIN versions AS v ON s.id = v.product_id")
             conds.extend(get_version_conditions(req.version_name))
             conds.extend(get_product_conditions(req.product_name))
@@ -251,7 +251,7 @@ async def resolve_entities(
 
         elif req.product_name is not None:
             cols.append("s.id as product_id")
-            joins.append("INNER JOIN products AS s ON h.id = s.folder_id")
+            joins.append("INNER JOIN products AS s ON h.entity_id = s.folder_id")
             conds.extend(get_product_conditions(req.product_name))
             conds.extend(get_path_conditions(req.path))
             target_entity_type = "product"
@@ -262,7 +262,7 @@ async def resolve_entities(
 
     query = f"""
         SELECT {", ".join(cols)}
-        FROM hierarchy h {" ".join(joins)}
+        FROM entity_paths h {" ".join(joins)}
     """
     if conds:
         query += f""" WHERE {" AND ".join(conds)}"""
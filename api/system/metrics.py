@@ -2,10 +2,12 @@ from fastapi import Query
 from fastapi.responses import PlainTextResponse
 
 from ayon_server.api.dependencies import ApiKey, CurrentUser, CurrentUserOptional
+from ayon_server.auth.session import Session
+from ayon_server.background.request_accounting import request_accounting
 from ayon_server.config import ayonconfig
+from ayon_server.events.hooks import hook_executor
 from ayon_server.exceptions import ForbiddenException
-from ayon_server.lib.postgres import Postgres
-from ayon_server.lib.redis import Redis
+from ayon_server.lib.postgres_metrics import query_metrics
 from ayon_server.metrics import Metrics, get_metrics
 from ayon_server.metrics.system import system_metrics
 
@@ -51,17 +53,22 @@ async def get_system_metrics(
         if api_key != ayonconfig.metrics_api_key:
             raise ForbiddenException("Access denied")
 
-    # Get user requests count
+    # Get request accounting and sessions
 
-    async for record in Postgres.iterate("SELECT name FROM users"):
-        name = record["name"]
-        requests = await Redis.get("user-requests", name)
-        num_requests = 0 if requests is None else int(requests)
-        if num_requests > 0:
-            result += f'ayon_user_requests{{name="{name}"}} {num_requests}\n'
+    result += await request_accounting.render_prometheus()
+
+    result += f"ayon_active_sessions {await Session.count()}\n"
 
     # Get system metrics
 
     result += await system_metrics.render_prometheus()
 
+    # Get database query metrics
+
+    result += query_metrics.render_prometheus()
+
+    # Get event hook metrics
+
+    result += hook_executor.render_prometheus()
+
     return PlainTextResponse(result)
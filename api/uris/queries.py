@@ -3,8 +3,8 @@ from ayon_server.lib.postgres import Postgres
 
 async def folder_uris(project_name: str, ids: list[str]) -> list[tuple[str, str]]:
     query = f"""
-        SELECT id, path FROM project_{project_name}.hierarchy
-        WHERE id = ANY($1)
+        SELECT entity_id AS id, path FROM project_{project_name}.entity_paths
+        WHERE entity_id = ANY($1)
     """
     result = []
     async for row in Postgres.iterate(query, ids):
@@ -18,7 +18,7 @@ async def task_uris(project_name: str, ids: list[str]) -> list[tuple[str, str]]:
     query = f"""
         SELECT t.id, t.name, h.path FROM
         project_{project_name}.tasks t
-        JOIN project_{project_name}.hierarchy h ON h.id = t.folder_id
+        JOIN project_{project_name}.entity_paths h ON h.entity_id = t.folder_id
         WHERE t.id = ANY($1)
     """
     result = []
@@ -35,7 +35,7 @@ async def workfile_uris(project_name: str, ids: list[str]) -> list[tuple[str, st
         SELECT w.id, w.path as wpath, h.path, t.name as task FROM
         project_{project_name}.workfiles w
         JOIN project_{project_name}.tasks t ON t.id = w.task_id
-        JOIN project_{project_name}.hierarchy h ON h.id = t.folder_id
+        JOIN project_{project_name}.entity_paths h ON h.entity_id = t.folder_id
         WHERE w.id = ANY($1)
     """
     result = []
@@ -57,7 +57,7 @@ async def product_uris(project_name: str, ids: list[str]) -> list[tuple[str, str
     query = f"""
         SELECT p.id, p.name as name, h.path as path FROM
         project_{project_name}.products p
-        JOIN project_{project_name}.hierarchy h ON h.id = p.folder_id
+        JOIN project_{project_name}.entity_paths h ON h.entity_id = p.folder_id
         WHERE p.id = ANY($1)
     """
     result = []
@@ -76,7 +76,7 @@ async def version_uris(project_name: str, ids: list[str]) -> list[tuple[str, str
         SELECT v.id, v.version, h.path, p.name as product FROM
         project_{project_name}.versions v
         JOIN project_{project_name}.products p ON p.id = v.product_id
-        JOIN project_{project_name}.hierarchy h ON h.id = p.folder_id
+        JOIN project_{project_name}.entity_paths h ON h.entity_id = p.folder_id
         WHERE v.id = ANY($1)
     """
     result = []
@@ -99,7 +99,7 @@ async def representation_uris(
         project_{project_name}.representations r
         JOIN project_{project_name}.versions v ON v.id = r.version_id
         JOIN project_{project_name}.products p ON p.id = v.product_id
-        JOIN project_{project_name}.hierarchy h ON h.id = p.folder_id
+        JOIN project_{project_name}.entity_paths h ON h.entity_id = p.folder_id
         WHERE r.id = ANY($1)
     """
     result = []
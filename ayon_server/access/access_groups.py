@@ -10,6 +10,7 @@ from ayon_server.access.permissions import (
     Permissions,
 )
 from ayon_server.helpers.project_list import get_project_list
+from ayon_server.lib.local_cache import LocalCache
 from ayon_server.lib.postgres import Postgres
 from ayon_server.types import normalize_to_dict
 
@@ -17,11 +18,20 @@ from ayon_server.types import normalize_to_dict
 class AccessGroups:
     access_groups: dict[tuple[str, str], Permissions] = {}
 
+    # Combined permissions of (access group names, project name).
+    # Cleared on every change of the access groups.
+    combined: dict[tuple[tuple[str, ...], str], Permissions] = {}
+
+    @classmethod
+    def invalidate(cls) -> None:
+        cls.combined = {}
+
     @classmethod
     async def load(cls) -> None:
         cls.access_groups = {}
+        cls.invalidate()
         async for row in Postgres.iterate(
-            "SELECT name, data FROM public.access_groups"
+            "SELECT name, data FROM public.access_groups", cursor=False
         ):
             cls.add_access_group(
                 row["name"],
@@ -33,7 +43,8 @@ class AccessGroups:
         for project in project_list:
             project_name = project.name
             async for row in Postgres.iterate(
-                f"SELECT name, data FROM project_{project_name}.access_groups"
+                f"SELECT name, data FROM project_{project_name}.access_groups",
+                cursor=False,
             ):
                 cls.add_access_group(
                     row["name"],
@@ -41,12 +52,19 @@ class AccessGroups:
                     Permissions.from_record(row["data"]),
                 )
 
+    @classmethod
+    async def reload(cls) -> None:
+        """Reload access groups in this and all other workers."""
+        await cls.load()
+        await LocalCache.invalidate("access-groups")
+
     @classmethod
     def add_access_group(
         cls, name: str, project_name: str, permissions: Permissions
     ) -> None:
         logging.debug("Adding access_group", name)
         cls.access_groups[(name, project_name)] = permissions
+        cls.invalidate()
 
     @classmethod
     def combine(
@@ -57,8 +75,20 @@ class AccessGroups:
         If a project name is specified and there is a project-level override
         for a given access group, it will be used.
         Ohterwise a "_" (default) access group will be used.
+
+        Results are cached until the access groups change, so the returned
+        object is shared and read-only. Callers, which need to modify
+        it, must copy it first.
         """
 
+        key = (tuple(access_group_names), project_name)
+        if (permissions := cls.combined.get(key)) is None:
+            permissions = cls._combine(access_group_names, project_name)
+            cls.combined[key] = permissions
+        return permissions
+
+    @classmethod
+    def _combine(cls, access_group_names: list[str], project_name: str) -> Permissions:
         result: dict[str, Any] | None = None
 
         for access_group_name in access_group_names:
@@ -107,3 +137,10 @@ class AccessGroups:
         if not result:
             return Permissions()
         return Permissions(**result)
+
+
+async def _on_access_groups_invalidated(key: str | None) -> None:
+    await AccessGroups.load()
+
+
+LocalCache.on_invalidate("access-groups", _on_access_groups_invalidated)
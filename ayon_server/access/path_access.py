@@ -0,0 +1,122 @@
+"""Compiled folder path access matcher.
+
+`folder_access_list` returns the accessible folders as a list of SQL
+LIKE patterns (`"assets/characters"` for the folder itself and
+`"assets/characters/%"` for its descendants). Matching a path against
+such list in Python is a linear scan and `path LIKE ANY(...)` in SQL
+cannot use an index.
+
+`PathAccessMatcher` compiles the list into a prefix tree of path
+elements, so a path is checked in O(depth), and renders an equivalent
+SQL condition made of equality and prefix comparisons, which can use
+the `entity_paths` path index. Patterns covered by a broader pattern
+(e.g. descendants of an accessible subtree) are dropped.
+"""
+
+import functools
+
+
+class _Node:
+    __slots__ = ("children", "exact", "subtree")
+
+    def __init__(self) -> None:
+        self.children: dict[str, _Node] = {}
+        # The path itself is accessible
+        self.exact = False
+        # All descendants of the path are accessible
+        self.subtree = False
+
+
+def _sql_string(value: str) -> str:
+    return "'" + value.replace("'", "''") + "'"
+
+
+def _like_prefix(value: str) -> str:
+    for char in ("\\", "%", "_"):
+        value = value.replace(char, f"\\{char}")
+    return value
+
+
+class PathAccessMatcher:
+    def __init__(self, access_list: list[str]) -> None:
+        self.root = _Node()
+        for pattern in access_list:
+            pattern = pattern.strip('"').strip("/")
+            subtree = pattern.endswith("/%") or pattern == "%"
+            if subtree:
+                pattern = pattern[:-1].rstrip("/")
+
+            node = self.root
+            if pattern:
+                for element in pattern.split("/"):
+                    node = node.children.setdefault(element, _Node())
+            if subtree:
+                node.subtree = True
+            else:
+                node.exact = True
+
+    def match(self, path: str) -> bool:
+        """Return True if the given folder path is accessible."""
+        node = self.root
+        for element in path.strip("/").split("/"):
+            if node.subtree:
+                return True
+            if (child := node.children.get(element)) is None:
+                return False
+            node = child
+        return node.exact
+
+    def _collect(
+        self,
+        node: _Node,
+        path: str,
+        exact: list[str],
+        prefixes: list[str],
+    ) -> None:
+        if node.exact and path:
+            exact.append(path)
+        if node.subtree:
+            # descendants are covered by the prefix
+            prefixes.append(f"{path}/" if path else "")
+            return
+        for element, child in node.children.items():
+            self._collect(
+                child, f"{path}/{element}" if path else element, exact, prefixes
+            )
+
+    def sql_condition(self, column: str = "hierarchy.path") -> str:
+        """Return an SQL condition matching accessible paths in the column.
+
+        Paths in the column are expected without the leading slash
+        (as stored in `entity_paths`).
+        """
+        exact: list[str] = []
+        prefixes: list[str] = []
+        self._collect(self.root, "", exact, prefixes)
+
+        conditions = []
+        if "" in prefixes:
+            return "TRUE"
+        if exact:
+            conditions.append(f"{column} IN ({', '.join(map(_sql_string, exact))})")
+        for prefix in prefixes:
+            conditions.append(
+                f"{column} LIKE {_sql_string(_like_prefix(prefix) + '%')}"
+            )
+        if not conditions:
+            return "FALSE"
+        return f"({' OR '.join(conditions)})"
+
+
+@functools.lru_cache(maxsize=1024)
+def _compile(access_list: tuple[str, ...]) -> PathAccessMatcher:
+    return PathAccessMatcher(list(access_list))
+
+
+def compile_path_access(access_list: list[str]) -> PathAccessMatcher:
+    """Return a matcher of the given folder access list.
+
+    Compiled matchers are cached, so users sharing the same
+    access list share the matcher as well.
+    """
+    return _compile(tuple(access_list))
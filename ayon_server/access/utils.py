@@ -1,9 +1,13 @@
-from typing import TYPE_CHECKING, Literal
+from collections.abc import Iterable
+from typing import TYPE_CHECKING, Any, Literal
 
+from strawberry.dataloader import DataLoader
+
+from ayon_server.access.path_access import compile_path_access
 from ayon_server.exceptions import ForbiddenException
 from ayon_server.lib.postgres import Postgres
 from ayon_server.types import AccessType, ProjectLevelEntityType
-from ayon_server.utils import SQLTool
+from ayon_server.utils import EntityID
 
 if TYPE_CHECKING:
     from ayon_server.entities import UserEntity
@@ -106,10 +110,10 @@ async def folder_access_list(
                 SELECT
                     h.path
                 FROM
-                    project_{project_name}.hierarchy as h
+                    project_{project_name}.entity_paths as h
                 INNER JOIN
                     project_{project_name}.tasks as t
-                    ON h.id = t.folder_id
+                    ON h.entity_id = t.folder_id
                 WHERE
                     '{user.name}' = ANY (t.assignees)
                 """
@@ -136,36 +140,33 @@ async def folder_access_list(
     return path_list
 
 
-async def ensure_entity_access(
-    user: "UserEntity",
+EntityAccessCheck = tuple[ProjectLevelEntityType, str, AccessType]
+
+
+def _entity_access_query(
     project_name: str,
     entity_type: ProjectLevelEntityType,
-    entity_id: str,
-    access_type: AccessType = "read",
-) -> Literal[True]:
-    """Check whether the user has access to a given entity.
-
-    Warning: THIS IS SLOW. DO NOT USE IN BATCHES!
+    access_type: AccessType,
+    ids_arg: int,
+    path_condition: str,
+) -> str:
+    """Return a query selecting accessible entities of the given type.
+
+    `ids_arg` is the positional argument of the checked ids,
+    `path_condition` limits the accessible folder paths.
     """
 
-    access_list = await folder_access_list(
-        user,
-        project_name,
-        access_type=access_type,
-    )
-    if access_list is None:
-        return True
-
-    conditions = [f"hierarchy.path like ANY ('{{{', '.join(access_list)}}}')"]
     joins = []
+    id_column = "hierarchy.entity_id"
 
     if entity_type in ("product", "version", "representation"):
         joins.append(
             f"""
             INNER JOIN project_{project_name}.products
-            ON products.folder_id = hierarchy.id
+            ON products.folder_id = hierarchy.entity_id
             """
         )
+        id_column = "products.id"
         if entity_type in ("version", "representation"):
             joins.append(
                 f"""
@@ -173,6 +174,7 @@ async def ensure_entity_access(
                 ON versions.product_id = products.id
                 """
             )
+            id_column = "versions.id"
             if entity_type == "representation":
                 joins.append(
                     f"""
@@ -180,14 +182,16 @@ async def ensure_entity_access(
                     ON representations.version_id = versions.id
                     """
                 )
+                id_column = "representations.id"
 
     elif entity_type in ("task", "workfile"):
         joins.append(
             f"""
             INNER JOIN project_{project_name}.tasks
-            ON tasks.folder_id = hierarchy.id
+            ON tasks.folder_id = hierarchy.entity_id
             """
         )
+        id_column = "tasks.id"
 
         if entity_type == "workfile":
             joins.append(
@@ -196,18 +200,140 @@ async def ensure_entity_access(
                 ON workfiles.task_id = tasks.id
                 """
             )
+            id_column = "workfiles.id"
+
+    return f"""
+        SELECT
+            '{entity_type}' AS entity_type,
+            '{access_type}' AS access_type,
+            {id_column} AS id
+        FROM project_{project_name}.entity_paths AS hierarchy
+        {" ".join(joins)}
+        WHERE {path_condition}
+        AND {id_column} = ANY(${ids_arg}::UUID[])
+    """
 
-    if entity_type == "folder":
-        conditions.append(f"hierarchy.id = '{entity_id}'")
-    else:
-        conditions.append(f"{entity_type}s.id = '{entity_id}'")
 
-    query = f"""
-        SELECT hierarchy.id FROM project_{project_name}.hierarchy
-        {" ".join(joins)}
-        {SQLTool.conditions(conditions)}
+async def get_entity_access(
+    user: "UserEntity",
+    project_name: str,
+    checks: Iterable[EntityAccessCheck],
+) -> dict[EntityAccessCheck, bool]:
+    """Check user's access to multiple entities using a single query.
+
+    Checks are provided as (entity_type, entity_id, access_type) tuples.
+    Returns a dict mapping each check to a boolean (True if allowed).
+    Entity ids may be provided with or without dashes, invalid ids
+    are denied.
     """
 
-    async for _ in Postgres.iterate(query):
+    checks = set(checks)
+    if user.is_manager:
+        return {check: True for check in checks}
+
+    # Accessible paths of each access type (None means unlimited)
+    access_lists: dict[AccessType, list[str] | None] = {}
+    for access_type in {check[2] for check in checks}:
+        try:
+            access_list = await folder_access_list(user, project_name, access_type)
+        except ForbiddenException:
+            access_list = []
+        access_lists[access_type] = access_list
+
+    result: dict[EntityAccessCheck, bool] = {}
+    groups: dict[tuple[ProjectLevelEntityType, AccessType], set[str]] = {}
+    # Checks with entity ids normalized to the format returned by the query
+    queried: dict[EntityAccessCheck, EntityAccessCheck] = {}
+    for check in checks:
+        entity_type, entity_id, access_type = check
+        access_list = access_lists[access_type]
+        result[check] = access_list is None
+        if not access_list:
+            continue
+        try:
+            normalized_id = EntityID.parse(entity_id)
+        except ValueError:
+            continue
+        assert normalized_id is not None
+        queried[check] = (entity_type, normalized_id, access_type)
+        groups.setdefault((entity_type, access_type), set()).add(normalized_id)
+
+    if not groups:
+        return result
+
+    queries: list[str] = []
+    args: list[Any] = []
+    for (entity_type, access_type), entity_ids in groups.items():
+        args.append(list(entity_ids))
+        matcher = compile_path_access(access_lists[access_type] or [])
+        queries.append(
+            _entity_access_query(
+                project_name,
+                entity_type,
+                access_type,
+                ids_arg=len(args),
+                path_condition=matcher.sql_condition("hierarchy.path"),
+            )
+        )
+
+    allowed = {
+        (row["entity_type"], row["id"], row["access_type"])
+        for row in await Postgres.fetch(" UNION ALL ".join(queries), *args)
+    }
+    for check, normalized_check in queried.items():
+        result[check] = normalized_check in allowed
+    return result
+
+
+def _get_access_loader(
+    user: "UserEntity",
+    project_name: str,
+) -> DataLoader[EntityAccessCheck, bool]:
+    """Return a loader coalescing concurrent access checks of the user.
+
+    Checks requested in the same event loop iteration (for example
+    `ensure_*_access` methods of multiple entities awaited using
+    asyncio.gather) are resolved using a single query.
+    Results are not cached, as access may change within the request
+    (e.g. when a parent folder is created).
+    """
+
+    if user.access_loaders is None:
+        user.access_loaders = {}
+    if (loader := user.access_loaders.get(project_name)) is None:
+
+        async def load_access(checks: list[EntityAccessCheck]) -> list[bool]:
+            access = await get_entity_access(user, project_name, checks)
+            return [access[check] for check in checks]
+
+        loader = DataLoader(load_fn=load_access, cache=False)
+        user.access_loaders[project_name] = loader
+    return loader
+
+
+async def ensure_entity_access(
+    user: "UserEntity",
+    project_name: str,
+    entity_type: ProjectLevelEntityType,
+    entity_id: str,
+    access_type: AccessType = "read",
+) -> Literal[True]:
+    """Check whether the user has access to a given entity.
+
+    Concurrent checks are batched. To check access to many entities,
+    await the checks using asyncio.gather or use `get_entity_access`.
+    """
+
+    if user.is_manager:
+        return True
+
+    try:
+        normalized_id = EntityID.parse(entity_id)
+    except ValueError:
+        raise ForbiddenException("Entity access denied") from None
+    assert normalized_id is not None
+
+    loader = _get_access_loader(user, project_name)
+    if await loader.load((entity_type, normalized_id, access_type)):
         return True
     raise ForbiddenException("Entity access denied")
@@ -33,7 +33,8 @@ class ActivityFeedEventHook:
 
         This method is called once, when the server is started.
         EventStream class then calls the appropriate handlers
-        when new events are published.
+        when new events are published. Handlers run in the background,
+        so requests changing the entities do not wait for the activities.
         """
         cls.topics = {
             "entity.folder.status_changed": cls.handle_status_changed,
@@ -44,7 +45,9 @@ class ActivityFeedEventHook:
             "entity.version.created": cls.handle_version_created,
         }
         for topic, handler in cls.topics.items():
-            event_stream.subscribe(topic, handler)
+            # Handlers create activities, so they are not retried
+            # (a timed out call may have already created them)
+            event_stream.subscribe(topic, handler, background=True)
 
     @classmethod
     async def handle_status_changed(cls, event: "EventModel"):
@@ -143,7 +146,7 @@ class ActivityFeedEventHook:
             p.name product_name,
             p.product_type product_type,
 
-            h.id folder_id,
+            h.entity_id folder_id,
             f.name folder_name,
             f.label folder_label,
             h.path folder_path,
@@ -155,7 +158,8 @@ class ActivityFeedEventHook:
 
             FROM project_{event.project}.versions v
             INNER JOIN project_{event.project}.products p ON v.product_id = p.id
-            INNER JOIN project_{event.project}.hierarchy h ON p.folder_id = h.id
+            INNER JOIN project_{event.project}.entity_paths h
+                ON p.folder_id = h.entity_id
             INNER JOIN project_{event.project}.folders f ON p.folder_id = f.id
             LEFT JOIN project_{event.project}.tasks t ON v.task_id = t.id
 
@@ -0,0 +1,45 @@
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ayon_server.background.request_accounting import request_accounting
+
+
+class RequestAccountingMiddleware:
+    """Count requests and their duration per user and endpoint.
+
+    The user name is stored in the request state by `dep_current_user`,
+    the endpoint is the matched route. Requests to unknown routes
+    (frontend files, 404s) are not counted per endpoint.
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start_time = time.monotonic()
+        status = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            user_name = scope.get("state", {}).get("user_name")
+            endpoint = None
+            if (route_path := getattr(scope.get("route"), "path", None)) is not None:
+                endpoint = f"{scope['method']} {route_path}"
+            request_accounting.record(
+                user_name,
+                endpoint,
+                time.monotonic() - start_time,
+                status,
+            )
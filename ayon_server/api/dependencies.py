@@ -11,13 +11,11 @@ from ayon_server.entities import UserEntity
 from ayon_server.exceptions import (
     BadRequestException,
     ForbiddenException,
-    NotFoundException,
     UnauthorizedException,
     UnsupportedMediaException,
 )
-from ayon_server.helpers.project_list import build_project_list, get_project_list
+from ayon_server.helpers.project_list import get_canonical_project_name
 from ayon_server.lib.postgres import Postgres
-from ayon_server.lib.redis import Redis
 from ayon_server.types import (
     API_KEY_REGEX,
     NAME_REGEX,
@@ -110,8 +108,8 @@ async def dep_current_user(
     """
 
     if api_key := x_api_key or api_key:
-        hashed_key = hash_password(api_key)
         if (session_data := await Session.check(api_key, request)) is None:
+            hashed_key = hash_password(api_key)
             result = await Postgres.fetch(
                 "SELECT * FROM users WHERE data->>'apiKey' = $1 LIMIT 1",
                 hashed_key,
@@ -128,8 +126,9 @@ async def dep_current_user(
 
     if not session_data:
         raise UnauthorizedException("Invalid access token")
-    await Redis.incr("user-requests", session_data.user.name)
-    user = UserEntity.from_record(session_data.user.dict())
+    # Used by the request accounting middleware
+    request.state.user_name = session_data.user.name
+    user = UserEntity.from_model(session_data.user)
 
     if x_as_user is not None and user.is_service:
         # sudo :)
@@ -219,20 +218,7 @@ async def dep_project_name(
     to match the database record.
     """
 
-    project_list = await get_project_list()
-
-    for pn in project_list:
-        if project_name.lower() == pn.name.lower():
-            return pn.name
-
-    # try again
-    project_list = await build_project_list()
-
-    for pn in project_list:
-        if project_name.lower() == pn.name.lower():
-            return pn.name
-
-    raise NotFoundException(f"Project {project_name} not found")
+    return await get_canonical_project_name(project_name)
 
 
 ProjectName = Annotated[str, Depends(dep_project_name)]
@@ -13,6 +13,7 @@ from ayon_server.auth.session import Session
 from ayon_server.background.background_worker import BackgroundWorker
 from ayon_server.config import ayonconfig
 from ayon_server.entities import UserEntity
+from ayon_server.lib.local_cache import INVALIDATION_TOPIC
 from ayon_server.lib.redis import Redis
 from ayon_server.utils import get_nickname, json_dumps, json_loads, obscure
 
@@ -88,6 +89,28 @@ class Client:
             return None
         return message
 
+    def accepts(self, message: dict[str, Any]) -> bool:
+        """Check whether the client should receive the message"""
+        project_name = message.get("project", None)
+        if self.project_name is not None and message.get("topic") != "inbox.message":
+            if project_name and project_name != self.project_name:
+                return False
+
+        if project_name and self.user and (not self.user.is_manager):
+            access_groups = self.user.data.get("accessGroups", {})
+            if project_name not in access_groups:
+                return False
+
+        recipients = message.get("recipients", None)
+        if isinstance(recipients, list):
+            if self.user_name not in recipients:
+                return False
+
+        for topic in self.topics:
+            if topic == "*" or message["topic"].startswith(topic):
+                return True
+        return False
+
     @property
     def is_valid(self) -> bool:
         if self.disconnected:
@@ -97,9 +120,80 @@ class Client:
         return True
 
 
+class SubscriptionIndex:
+    """Index of authorized clients by subscribed topic, project and user.
+
+    Used to find clients, which may be interested in a message, without
+    checking all connected clients. Subscriptions are topic prefixes
+    ("*" is stored as an empty prefix), so the clients subscribed to
+    a topic are found by looking up all prefixes of the topic.
+    """
+
+    def __init__(self) -> None:
+        self.by_topic: dict[str, set[str]] = {}
+        self.by_project: dict[str | None, set[str]] = {}
+        self.by_user: dict[str | None, set[str]] = {}
+        self.keys: dict[str, tuple[list[str], str | None, str | None]] = {}
+
+    @staticmethod
+    def _add(index: dict[Any, set[str]], key: Any, client_id: str) -> None:
+        index.setdefault(key, set()).add(client_id)
+
+    @staticmethod
+    def _discard(index: dict[Any, set[str]], key: Any, client_id: str) -> None:
+        if (ids := index.get(key)) is not None:
+            ids.discard(client_id)
+            if not ids:
+                del index[key]
+
+    def add(self, client: Client) -> None:
+        self.remove(client.id)
+        prefixes = ["" if topic == "*" else topic for topic in client.topics]
+        for prefix in prefixes:
+            self._add(self.by_topic, prefix, client.id)
+        self._add(self.by_project, client.project_name, client.id)
+        self._add(self.by_user, client.user_name, client.id)
+        self.keys[client.id] = (prefixes, client.project_name, client.user_name)
+
+    def remove(self, client_id: str) -> None:
+        if (keys := self.keys.pop(client_id, None)) is None:
+            return
+        prefixes, project_name, user_name = keys
+        for prefix in prefixes:
+            self._discard(self.by_topic, prefix, client_id)
+        self._discard(self.by_project, project_name, client_id)
+        self._discard(self.by_user, user_name, client_id)
+
+    def candidates(self, message: dict[str, Any]) -> set[str]:
+        """Return ids of clients, which may receive the message.
+
+        The result is a superset of the recipients, `Client.accepts`
+        should be used to check the access.
+        """
+        recipients = message.get("recipients", None)
+        if isinstance(recipients, list):
+            ids: set[str] = set()
+            for user_name in recipients:
+                ids.update(self.by_user.get(user_name, ()))
+        else:
+            topic = message["topic"]
+            ids = set()
+            for i in range(len(topic) + 1):
+                ids.update(self.by_topic.get(topic[:i], ()))
+
+        project_name = message.get("project", None)
+        if project_name and message["topic"] != "inbox.message":
+            # Clients without a project receive messages of all projects
+            ids = (ids & self.by_project.get(project_name, set())) | (
+                ids & self.by_project.get(None, set())
+            )
+        return ids
+
+
 class Messaging(BackgroundWorker):
     def initialize(self):
         self.clients: dict[str, Client] = {}
+        self.index = SubscriptionIndex()
 
     async def join(self, websocket: WebSocket):
         if not self.is_running:
@@ -110,6 +204,23 @@ class Messaging(BackgroundWorker):
         self.clients[client.id] = client
         return client
 
+    async def authorize(
+        self,
+        client: Client,
+        access_token: str,
+        topics: list[str],
+        project: str | None = None,
+    ) -> bool:
+        if not await client.authorize(access_token, topics, project):
+            return False
+        self.index.add(client)
+        return True
+
+    def remove(self, client_id: str) -> None:
+        self.index.remove(client_id)
+        with suppress(KeyError):
+            del self.clients[client_id]
+
     async def purge(self):
         to_rm = []
         for client_id, client in list(self.clients.items()):
@@ -119,8 +230,7 @@ class Messaging(BackgroundWorker):
                         await client.sock.close(code=1000)
                 to_rm.append(client_id)
         for client_id in to_rm:
-            with suppress(KeyError):
-                del self.clients[client_id]
+            self.remove(client_id)
 
     async def run(self) -> None:
         self.pubsub = await Redis.pubsub()
@@ -142,43 +252,23 @@ class Messaging(BackgroundWorker):
                         continue
                 else:
                     message = json_loads(raw_message["data"])
+                    if message.get("topic") == INVALIDATION_TOPIC:
+                        # handled by the local cache listener
+                        continue
 
-                # TODO: much much smarter logic here
-                for _client_id, client in self.clients.items():
-                    project_name = message.get("project", None)
-                    if (
-                        client.project_name is not None
-                        and message.get("topic") != "inbox.message"
-                    ):
-                        if project_name and project_name != client.project_name:
-                            continue
-
-                    if project_name and client.user and (not client.user.is_manager):
-                        access_groups = client.user.data.get("accessGroups", {})
-                        if project_name not in access_groups:
-                            continue
-
-                    recipients = message.get("recipients", None)
-                    if isinstance(recipients, list):
-                        if client.user_name not in recipients:
-                            continue
-
-                    for topic in client.topics:
-                        if topic == "*" or message["topic"].startswith(topic):
-                            if (
-                                client.is_guest
-                                and message.get("user") != client.user_name
-                            ):
-                                m = copy.deepcopy(message)
-                                if m.get("user"):
-                                    m["user"] = get_nickname(m["user"])
-                                if message["topic"].startswith("log"):
-                                    m["description"] = obscure(m["description"])
-                                await client.send(m)
-                            else:
-                                m = copy.deepcopy(message)
-                                m.pop("recipients", None)
-                                await client.send(m)
+                for client_id in self.index.candidates(message):
+                    client = self.clients.get(client_id)
+                    if client is None or not client.accepts(message):
+                        continue
+                    m = copy.deepcopy(message)
+                    if client.is_guest and message.get("user") != client.user_name:
+                        if m.get("user"):
+                            m["user"] = get_nickname(m["user"])
+                        if message["topic"].startswith("log"):
+                            m["description"] = obscure(m["description"])
+                    else:
+                        m.pop("recipients", None)
+                    await client.send(m)
 
                 if message["topic"] == "server.restart_requested":
                     restart_server()
@@ -14,6 +14,7 @@ from fastapi.websockets import WebSocket, WebSocketDisconnect
 from nxtools import log_to_file, log_traceback, logging, slugify
 
 from ayon_server.addons import AddonLibrary
+from ayon_server.api.accounting import RequestAccountingMiddleware
 from ayon_server.api.frontend import init_frontend
 from ayon_server.api.messaging import Messaging
 from ayon_server.api.metadata import app_meta, tags_meta
@@ -41,6 +42,8 @@ app = fastapi.FastAPI(
     **app_meta,
 )
 
+app.add_middleware(RequestAccountingMiddleware)
+
 #
 # Error handling
 #
@@ -261,16 +264,14 @@ async def ws_endpoint(websocket: WebSocket) -> None:
                 continue
 
             if message["topic"] == "auth":
-                await client.authorize(
+                await messaging.authorize(
+                    client,
                     message.get("token"),
                     topics=message.get("subscribe", []),
                     project=message.get("project"),
                 )
     except WebSocketDisconnect:
-        try:
-            del messaging.clients[client.id]
-        except KeyError:
-            pass
+        messaging.remove(client.id)
 
 
 #
@@ -383,6 +384,7 @@ async def startup_event() -> None:
 
     await ayon_init()
     await load_access_groups()
+    await Session.rebuild_index()
 
     # Start background tasks
 
@@ -1,17 +1,20 @@
 __all__ = ["Session"]
 
+import asyncio
 import time
 from typing import Any, AsyncGenerator
 
 from fastapi import Request
+from nxtools import log_traceback
 
 from ayon_server.api.clientinfo import ClientInfo, get_client_info, get_real_ip
 from ayon_server.config import ayonconfig
 from ayon_server.entities import UserEntity
 from ayon_server.events import EventStream
-from ayon_server.lib.redis import Redis
+from ayon_server.lib.local_cache import LocalCache
+from ayon_server.lib.redis import Redis, RedisPipeline
 from ayon_server.types import OPModel
-from ayon_server.utils import create_hash, json_dumps, json_loads
+from ayon_server.utils import create_hash, json_loads
 
 
 class SessionModel(OPModel):
@@ -40,12 +43,129 @@ def is_local_ip(ip: str) -> bool:
 
 
 class Session:
+    """Session store.
+
+    Each session is stored under its token. Additionally, the store
+    maintains a set of tokens per user and a sorted set of all tokens
+    ordered by their expiration time, so sessions of a user and expired
+    sessions can be found without scanning all sessions.
+    """
+
     ns = "session"
+    user_index_ns = "session.user"
+    expiry_ns = "session.expiry"
+    expiry_key = "all"
+
+    # Time of the last use of sessions, which lifetime should be
+    # extended. Written in batches by `flush_touches`.
+    pending_touches: dict[str, float] = {}
+    touch_task: asyncio.Task[None] | None = None
+    touch_delay: float = 1.0
+
+    @classmethod
+    def get_ttl(cls, session: SessionModel) -> int:
+        return 600 if session.is_service else ayonconfig.session_ttl
 
     @classmethod
     def is_expired(cls, session: SessionModel) -> bool:
-        ttl = 600 if session.is_service else ayonconfig.session_ttl
-        return time.time() - session.last_used > ttl
+        return time.time() - session.last_used > cls.get_ttl(session)
+
+    @classmethod
+    async def load(cls, token: str) -> SessionModel | None:
+        """Load a session from Redis, bypassing the local cache."""
+        data = await Redis.get(cls.ns, token)
+        if not data:
+            return None
+        return SessionModel(**json_loads(data))
+
+    @classmethod
+    def _queue_store(cls, pipe: RedisPipeline, session: SessionModel) -> None:
+        expires = session.last_used + cls.get_ttl(session)
+        pipe.set(cls.ns, session.token, session.json())
+        pipe.sadd(cls.user_index_ns, session.user.name, session.token)
+        pipe.zadd(cls.expiry_ns, cls.expiry_key, {session.token: expires})
+
+    @classmethod
+    async def store(cls, session: SessionModel) -> None:
+        """Save a session to Redis and invalidate its cached copies."""
+        async with Redis.pipeline(transaction=True) as pipe:
+            cls._queue_store(pipe, session)
+            await pipe.execute()
+        await LocalCache.invalidate(cls.ns, session.token)
+
+    @classmethod
+    def touch(cls, session: SessionModel) -> None:
+        """Extend the session lifetime without waiting for the write.
+
+        Touches are collected and written in a single batch
+        after `touch_delay` seconds.
+        """
+        cls.pending_touches[session.token] = time.time()
+        if cls.touch_task is None or cls.touch_task.done():
+            cls.touch_task = asyncio.create_task(cls._flush_touches_later())
+
+    @classmethod
+    async def _flush_touches_later(cls) -> None:
+        await asyncio.sleep(cls.touch_delay)
+        try:
+            await cls.flush_touches()
+        except Exception:
+            log_traceback("Unable to extend sessions")
+
+    @classmethod
+    async def flush_touches(cls) -> None:
+        """Write pending session touches.
+
+        Sessions are reloaded before the write, so changes made since
+        they were touched are kept and deleted sessions are not revived.
+        """
+        touches, cls.pending_touches = cls.pending_touches, {}
+        if not touches:
+            return
+        tokens = list(touches)
+        sessions = []
+        for data in await Redis.mget(cls.ns, tokens):
+            if data is None:
+                continue
+            session = SessionModel(**json_loads(data))
+            session.last_used = max(session.last_used, touches[session.token])
+            sessions.append(session)
+        if not sessions:
+            return
+
+        async with Redis.pipeline(transaction=True) as pipe:
+            for session in sessions:
+                cls._queue_store(pipe, session)
+            await pipe.execute()
+        for session in sessions:
+            await LocalCache.invalidate(cls.ns, session.token)
+
+    @classmethod
+    async def remove(cls, token: str, user_name: str | None = None) -> None:
+        """Remove a session and its index entries without dispatching events."""
+        async with Redis.pipeline(transaction=True) as pipe:
+            pipe.delete(cls.ns, token)
+            if user_name is not None:
+                pipe.srem(cls.user_index_ns, user_name, token)
+            pipe.zrem(cls.expiry_ns, cls.expiry_key, token)
+            await pipe.execute()
+        await LocalCache.invalidate(cls.ns, token)
+
+    @classmethod
+    async def rebuild_index(cls) -> None:
+        """Index sessions stored before the indexes were introduced.
+
+        Runs only when the expiration index is empty.
+        """
+        if await Redis.zcount(cls.expiry_ns, cls.expiry_key):
+            return
+        async for _, data in Redis.iterate(cls.ns):
+            session = SessionModel(**json_loads(data))
+            expires = session.last_used + cls.get_ttl(session)
+            async with Redis.pipeline() as pipe:
+                pipe.sadd(cls.user_index_ns, session.user.name, session.token)
+                pipe.zadd(cls.expiry_ns, cls.expiry_key, {session.token: expires})
+                await pipe.execute()
 
     @classmethod
     async def check(cls, token: str, request: Request | None) -> SessionModel | None:
@@ -56,11 +176,12 @@ class Session:
         If it's not expired, update the last_used field and extend
         its lifetime.
         """
-        data = await Redis.get(cls.ns, token)
-        if not data:
+        session = await LocalCache.get(cls.ns, token, lambda: cls.load(token))
+        if session is None:
             return None
 
-        session = SessionModel(**json_loads(data))
+        # the cached instance is shared
+        session = session.copy()
 
         if cls.is_expired(session):
             await cls.delete(token, "Session expired")
@@ -73,7 +194,7 @@ class Session:
             ):
                 session.client_info = get_client_info(request)
                 session.last_used = time.time()
-                await Redis.set(cls.ns, token, session.json())
+                await cls.store(session)
             elif not ayonconfig.disable_check_session_ip:
                 real_ip = get_real_ip(request)
                 if not is_local_ip(real_ip):
@@ -92,8 +213,7 @@ class Session:
 
         if not session.is_service:
             if time.time() - session.created > ayonconfig.session_ttl / 2:
-                session.last_used = time.time()
-                await Redis.set(cls.ns, token, json_dumps(session.dict()))
+                cls.touch(session)
 
         return session
 
@@ -120,7 +240,7 @@ class Session:
             client_info=client_info,
         )
         event_summary = client_info.dict() if client_info else {}
-        await Redis.set(cls.ns, token, session.json())
+        await cls.store(session)
         if not user.is_service:
             await EventStream.dispatch(
                 "auth.login",
@@ -139,30 +259,47 @@ class Session:
         client_info: ClientInfo | None = None,
     ) -> None:
         """Update a session with new user data."""
-        data = await Redis.get(cls.ns, token)
-        if not data:
+        session = await cls.load(token)
+        if session is None:
             # TODO: shouldn't be silent!
             return None
 
-        session = SessionModel(**json_loads(data))
         session.user = user.dict()
         if client_info is not None:
             session.client_info = client_info
         session.last_used = time.time()
-        await Redis.set(cls.ns, token, session.json())
+        await cls.store(session)
 
     @classmethod
     async def delete(cls, token: str, message: str = "User logged out") -> None:
-        data = await Redis.get(cls.ns, token)
-        if data:
-            session = SessionModel(**json_loads(data))
-            if not session.user.data.get("isService"):
-                await EventStream.dispatch(
-                    "auth.logout",
-                    description=message,
-                    user=session.user.name,
-                )
-        await Redis.delete(cls.ns, token)
+        session = await cls.load(token)
+        if session is None:
+            await cls.remove(token)
+            return
+        if not session.user.data.get("isService"):
+            await EventStream.dispatch(
+                "auth.logout",
+                description=message,
+                user=session.user.name,
+            )
+        await cls.remove(token, session.user.name)
+
+    @classmethod
+    async def delete_expired(cls) -> None:
+        """Delete sessions, which expired since the last call"""
+        while tokens := await Redis.zrangebyscore(
+            cls.expiry_ns,
+            cls.expiry_key,
+            max_score=time.time(),
+            limit=1000,
+        ):
+            for token in tokens:
+                await cls.delete(token, message="Session expired")
+
+    @classmethod
+    async def count(cls) -> int:
+        """Return the number of active sessions"""
+        return await Redis.zcount(cls.expiry_ns, cls.expiry_key, min_score=time.time())
 
     @classmethod
     async def list(
@@ -174,14 +311,26 @@ class Session:
         from the database.
         """
 
-        async for _, data in Redis.iterate("session"):
-            if data is None:
-                continue  # this should never happen, but keeps mypy happy
+        await cls.delete_expired()
 
-            session = SessionModel(**json_loads(data))
-            if cls.is_expired(session):
-                await cls.delete(session.token, message="Session expired")
-                continue
+        if user_name is None:
+            tokens = await Redis.zrangebyscore(cls.expiry_ns, cls.expiry_key)
+        else:
+            tokens = await Redis.smembers(cls.user_index_ns, user_name)
+
+        for i in range(0, len(tokens), 1000):
+            batch = tokens[i : i + 1000]
+            for token, data in zip(batch, await Redis.mget(cls.ns, batch)):
+                if data is None:
+                    # The session has been deleted in the meantime
+                    # or the index is stale
+                    await cls.remove(token, user_name)
+                    continue
+
+                session = SessionModel(**json_loads(data))
+                if cls.is_expired(session):
+                    await cls.delete(session.token, message="Session expired")
+                    continue
 
-            if user_name is None or session.user.name == user_name:
-                yield session
+                if user_name is None or session.user.name == user_name:
+                    yield session
@@ -4,8 +4,10 @@ import time
 
 from nxtools import log_traceback, logging
 
+from ayon_server.auth.session import Session
 from ayon_server.background.background_worker import BackgroundWorker
 from ayon_server.config import ayonconfig
+from ayon_server.events.watermarks import clear_enroll_watermarks
 from ayon_server.helpers.project_files import delete_unused_files
 from ayon_server.helpers.project_list import get_project_list
 from ayon_server.lib.postgres import Postgres
@@ -137,6 +139,11 @@ async def clear_events() -> None:
             break
 
 
+async def clear_sessions() -> None:
+    """Delete expired sessions."""
+    await Session.delete_expired()
+
+
 class AyonCleanUp(BackgroundWorker):
     """Background task for periodic clean-up of stuff."""
 
@@ -170,7 +177,13 @@ class AyonCleanUp(BackgroundWorker):
 
         # This clears not project-specific items (events)
 
-        for func in (clear_actions, clear_logs, clear_events):
+        for func in (
+            clear_actions,
+            clear_logs,
+            clear_events,
+            clear_sessions,
+            clear_enroll_watermarks,
+        ):
             try:
                 await func()
             except Exception:
@@ -0,0 +1,58 @@
+import asyncio
+
+from nxtools import log_traceback
+
+from ayon_server.background.background_worker import BackgroundWorker
+from ayon_server.config import ayonconfig
+from ayon_server.events.waiters import EnrollWaiter
+from ayon_server.lib.entity_cache import EntityCache
+from ayon_server.lib.local_cache import INVALIDATION_TOPIC, LocalCache
+from ayon_server.lib.redis import Redis
+from ayon_server.utils import json_loads
+
+
+class LocalCacheListener(BackgroundWorker):
+    """Drop local cache entries invalidated by other workers.
+
+    Entity events are used to invalidate the shared GraphQL entity cache.
+    All events wake up enroll requests waiting for new jobs.
+
+    The local cache is enabled only while the listener is subscribed
+    to the channel. Entries cached before (re)subscribing are dropped,
+    because their invalidation could have been missed.
+    """
+
+    async def run(self) -> None:
+        pubsub = await Redis.pubsub()
+        await pubsub.subscribe(ayonconfig.redis_channel)
+        LocalCache.clear()
+        EntityCache.drop()
+        LocalCache.enabled = True
+
+        try:
+            while True:
+                raw_message = await pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=2,
+                )
+                if raw_message is None:
+                    await asyncio.sleep(0.01)
+                    continue
+
+                try:
+                    message = json_loads(raw_message["data"])
+                    if message.get("topic") == INVALIDATION_TOPIC:
+                        await LocalCache.handle_message(message)
+                    else:
+                        EntityCache.handle_event(message)
+                        EnrollWaiter.notify(message)
+                except Exception:
+                    log_traceback("Unable to process cache invalidation message")
+        finally:
+            LocalCache.enabled = False
+            LocalCache.clear()
+            EntityCache.drop()
+            await pubsub.close()
+
+
+local_cache_listener = LocalCacheListener()
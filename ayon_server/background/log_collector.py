@@ -19,7 +19,7 @@ except ModuleNotFoundError:
     has_nxtools = False
 
 else:
-    from ayon_server.events import dispatch_event
+    from ayon_server.events import EventStream, dispatch_event
 
 
 def parse_log_message(message):
@@ -55,6 +55,8 @@ def parse_log_message(message):
 
 
 class LogCollector(BackgroundWorker):
+    batch_size: int = 100
+
     def initialize(self):
         self.queue: queue.Queue[dict[str, Any]] = queue.Queue()
         self.msg_id = 0
@@ -71,25 +73,33 @@ class LogCollector(BackgroundWorker):
             return
         self.queue.put(kwargs)
 
-    async def process_message(self, record):
-        self.msg_id += 1
-        try:
-            message = parse_log_message(record)
-        except ValueError:
+    async def process_messages(self, records: list[dict[str, Any]]) -> None:
+        messages = []
+        for record in records:
+            self.msg_id += 1
+            try:
+                messages.append(parse_log_message(record))
+            except ValueError:
+                continue
+
+        if not messages:
             return
 
         try:
-            await dispatch_event(
-                message["topic"],
-                # user=None, (TODO: implement this?)
-                description=message["description"],
-                payload=message["payload"],
-            )
+            # user=None, (TODO: implement this?)
+            await EventStream.dispatch_many(messages)
         except Exception:
-            m = f"Unable to dispatch log message: {message['description']}"
+            m = f"Unable to dispatch {len(messages)} log messages"
             # do not use the logger, if you don't like recursion
             print(m, flush=True)
 
+    def get_batch(self) -> list[dict[str, Any]]:
+        """Get queued records to be dispatched at once"""
+        records: list[dict[str, Any]] = []
+        while len(records) < self.batch_size and not self.queue.empty():
+            records.append(self.queue.get())
+        return records
+
     async def run(self):
         # During the startup, we cannot write to the database
         # so the following loop patiently waits for the database
@@ -109,8 +119,7 @@ class LogCollector(BackgroundWorker):
                 await asyncio.sleep(0.1)
                 continue
 
-            record = self.queue.get()
-            await self.process_message(record)
+            await self.process_messages(self.get_batch())
 
     async def finalize(self):
         while not self.queue.empty():
@@ -119,8 +128,7 @@ class LogCollector(BackgroundWorker):
                 handlers=None,
                 user="server",
             )
-            record = self.queue.get()
-            await self.process_message(record)
+            await self.process_messages(self.get_batch())
 
 
 log_collector = LogCollector()
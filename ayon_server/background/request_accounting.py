@@ -0,0 +1,144 @@
+import asyncio
+import collections
+from typing import DefaultDict
+
+from nxtools import log_traceback
+
+from ayon_server.background.background_worker import BackgroundWorker
+from ayon_server.lib.redis import Redis
+
+# Redis hashes (in the "global" namespace) the counters are flushed to
+USER_REQUESTS = "user-requests"
+USER_REQUEST_ERRORS = "user-request-errors"
+USER_REQUEST_SECONDS = "user-request-seconds"
+ENDPOINT_REQUESTS = "endpoint-requests"
+ENDPOINT_REQUEST_SECONDS = "endpoint-request-seconds"
+
+
+class RequestAccounting(BackgroundWorker):
+    """Per-user and per-endpoint request accounting.
+
+    Requests are counted in the worker memory and the counters
+    are periodically added to the shared Redis hashes using a single
+    pipeline, so the request itself does not wait for Redis.
+    """
+
+    flush_interval: float = 10
+
+    def initialize(self) -> None:
+        self.user_requests: DefaultDict[str, int] = collections.defaultdict(int)
+        self.user_errors: DefaultDict[str, int] = collections.defaultdict(int)
+        self.user_seconds: DefaultDict[str, float] = collections.defaultdict(float)
+        self.endpoint_requests: DefaultDict[str, int] = collections.defaultdict(int)
+        self.endpoint_seconds: DefaultDict[str, float] = collections.defaultdict(float)
+
+    def record(
+        self,
+        user_name: str | None,
+        endpoint: str | None,
+        duration: float,
+        status: int,
+    ) -> None:
+        self.record_many(user_name, endpoint, 1, duration, int(status >= 500))
+
+    def record_many(
+        self,
+        user_name: str | None,
+        endpoint: str | None,
+        count: int,
+        duration: float,
+        errors: int = 0,
+    ) -> None:
+        if user_name is not None:
+            self.user_requests[user_name] += count
+            self.user_seconds[user_name] += duration
+            if errors:
+                self.user_errors[user_name] += errors
+        if endpoint is not None:
+            self.endpoint_requests[endpoint] += count
+            self.endpoint_seconds[endpoint] += duration
+
+    async def flush(self) -> None:
+        if not (self.user_requests or self.endpoint_requests):
+            return
+        user_requests = self.user_requests
+        user_errors = self.user_errors
+        user_seconds = self.user_seconds
+        endpoint_requests = self.endpoint_requests
+        endpoint_seconds = self.endpoint_seconds
+        self.initialize()
+
+        try:
+            async with Redis.pipeline() as pipe:
+                for key, counts in (
+                    (USER_REQUESTS, user_requests),
+                    (USER_REQUEST_ERRORS, user_errors),
+                    (ENDPOINT_REQUESTS, endpoint_requests),
+                ):
+                    for field, count in counts.items():
+                        pipe.hincrby("global", key, field, count)
+                for key, sums in (
+                    (USER_REQUEST_SECONDS, user_seconds),
+                    (ENDPOINT_REQUEST_SECONDS, endpoint_seconds),
+                ):
+                    for field, seconds in sums.items():
+                        pipe.hincrbyfloat("global", key, field, seconds)
+                await pipe.execute()
+        except Exception:
+            # Keep the counters for the next attempt
+            for name in user_requests:
+                self.record_many(
+                    name,
+                    None,
+                    user_requests[name],
+                    user_seconds[name],
+                    user_errors.get(name, 0),
+                )
+            for endpoint in endpoint_requests:
+                self.record_many(
+                    None,
+                    endpoint,
+                    endpoint_requests[endpoint],
+                    endpoint_seconds[endpoint],
+                )
+            raise
+
+    async def run(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception:
+                log_traceback("Unable to flush request accounting")
+
+    async def finalize(self) -> None:
+        try:
+            await self.flush()
+        except Exception:
+            log_traceback("Unable to flush request accounting")
+
+    async def render_prometheus(self) -> str:
+        """Render the accumulated counters of all workers."""
+        metrics = (
+            (USER_REQUESTS, "user_requests", "name"),
+            (USER_REQUEST_ERRORS, "user_request_errors", "name"),
+            (USER_REQUEST_SECONDS, "user_request_seconds", "name"),
+            (ENDPOINT_REQUESTS, "endpoint_requests", "endpoint"),
+            (ENDPOINT_REQUEST_SECONDS, "endpoint_request_seconds", "endpoint"),
+        )
+        async with Redis.pipeline() as pipe:
+            for key, _, _ in metrics:
+                pipe.hgetall("global", key)
+            hashes = await pipe.execute()
+
+        result = ""
+        for (_, metric, label), values in zip(metrics, hashes):
+            for name, value in sorted(values.items()):
+                name = name.decode("utf-8")
+                value = value.decode("ascii")
+                if float(value) > 0:
+                    result += f'ayon_{metric}{{{label}="{name}"}} {value}\n'
+        return result
+
+
+request_accounting = RequestAccounting()
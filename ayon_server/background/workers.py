@@ -1,9 +1,12 @@
+from ayon_server.events.hooks import hook_executor
 from ayon_server.installer import background_installer
 
 from .background_worker import BackgroundWorker
 from .clean_up import clean_up
+from .local_cache_listener import local_cache_listener
 from .log_collector import log_collector
 from .metrics_collector import metrics_collector
+from .request_accounting import request_accounting
 
 
 class BackgroundWorkers:
@@ -13,6 +16,9 @@ class BackgroundWorkers:
             log_collector,
             metrics_collector,
             clean_up,
+            local_cache_listener,
+            request_accounting,
+            hook_executor,
         ]
 
     def start(self):
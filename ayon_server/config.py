@@ -103,6 +103,25 @@ class AyonConfig(BaseModel):
         example=20,
     )
 
+    postgres_statement_cache_size: int = Field(
+        1024,
+        description="Number of prepared statements cached per connection",
+        example=1024,
+    )
+
+    graphql_entity_cache: bool = Field(
+        default=False,
+        description=(
+            "Share entities loaded by GraphQL dataloaders between requests. "
+            "The cache is invalidated by entity events."
+        ),
+    )
+
+    graphql_entity_cache_ttl: int = Field(
+        default=30,
+        description="Maximum age of a shared GraphQL entity cache entry in seconds",
+    )
+
     session_ttl: int = Field(
         default=24 * 3600,
         description="Session lifetime in seconds",
@@ -176,14 +176,141 @@ class ProjectLevelEntity(BaseEntity):
             return cls.from_record(project_name, record)
         raise NotFoundException("Entity not found")
 
+    @classmethod
+    async def load_many(
+        cls,
+        project_name: str,
+        entity_ids: list[str],
+        transaction: Connection | None = None,
+        for_update=False,
+    ) -> list[Any]:
+        """Return entity instances of the given IDs using a single query.
+
+        Entities, which don't exist, are omitted from the result, so the caller
+        should compare the result with the requested IDs. The order of the
+        result is not guaranteed.
+
+        Set for_update=True and pass a transaction to lock the rows
+        for update.
+        """
+
+        query = f"""
+            SELECT  *
+            FROM project_{project_name}.{cls.entity_type}s
+            WHERE id = ANY($1)
+            {'FOR UPDATE' if transaction and for_update else ''}
+            """
+
+        return [
+            cls.from_record(project_name, record)
+            async for record in Postgres.iterate(
+                query, entity_ids, transaction=transaction
+            )
+        ]
+
     #
     # Save
     #
 
+    def _get_own_attrib(self) -> dict[str, Any]:
+        attrib = {}
+        for key in self.own_attrib:
+            with suppress(AttributeError):
+                if (value := getattr(self.attrib, key)) is not None:
+                    attrib[key] = value
+        return attrib
+
+    def _get_insert_fields(self) -> dict[str, Any]:
+        """Return columns and values used to insert the entity."""
+        fields = dict_exclude(
+            self.dict(exclude_none=True),
+            self.model.dynamic_fields,
+        )
+        fields["attrib"] = self._get_own_attrib()
+        return fields
+
+    def _get_update_fields(self) -> dict[str, Any]:
+        """Return columns and values used to update the entity."""
+        fields = dict_exclude(
+            self.dict(),
+            ["id", "created_at", "updated_at"] + self.model.dynamic_fields,
+        )
+        fields["attrib"] = self._get_own_attrib()
+        fields["updated_at"] = datetime.now()
+        return fields
+
     async def pre_save(self, insert: bool, transaction: Connection) -> None:
         """Hook called before saving the entity to the database."""
         pass
 
+    @classmethod
+    async def pre_save_many(cls, entities: list[Any], transaction: Connection) -> None:
+        """Hook called before saving multiple entities using `save_many`.
+
+        By default, `pre_save` is called for each entity. Reimplement it
+        when the hook can be handled using fewer queries.
+        """
+        for entity in entities:
+            await entity.pre_save(not entity.exists, transaction)
+
+    @classmethod
+    async def save_many(cls, entities: list[Any], transaction: Connection) -> None:
+        """Save multiple entities of the same type using multi-row statements.
+
+        This is a bulk counterpart of `save`: Entities may be both new and
+        existing and all of them must belong to the same project.
+        It must be called within a transaction and (as with `save` with a
+        transaction) `commit` of each entity is expected to be called
+        by the caller at the end of the transaction block.
+        """
+        if not entities:
+            return
+
+        project_name = entities[0].project_name
+        table = f"project_{project_name}.{cls.entity_type}s"
+
+        default_statuses: dict[str | None, str] = {}
+        for entity in entities:
+            if entity.status is None:
+                subtype = entity.entity_subtype
+                if subtype not in default_statuses:
+                    default_statuses[subtype] = await entity.get_default_status()
+                entity.status = default_statuses[subtype]
+
+        await cls.pre_save_many(entities, transaction)
+
+        # Inserted entities may have different sets of columns (None values
+        # are omitted to use the column defaults). Consecutive entities with
+        # the same columns are inserted using one statement, so the order
+        # of the entities (e.g. parents before children) is preserved.
+        inserts: list[tuple[tuple[str, ...], list[list[Any]]]] = []
+        updates: list[list[Any]] = []
+        update_keys: list[str] = []
+
+        for entity in entities:
+            if entity.exists:
+                fields = entity._get_update_fields()
+                update_keys = list(fields.keys())
+                updates.append([entity.id, *fields.values()])
+            else:
+                fields = entity._get_insert_fields()
+                keys = tuple(fields.keys())
+                if not inserts or inserts[-1][0] != keys:
+                    inserts.append((keys, []))
+                inserts[-1][1].append(list(fields.values()))
+
+        for keys, values in inserts:
+            query, *_ = SQLTool.insert(table, **{key: None for key in keys})
+            await transaction.executemany(query, values)
+
+        if updates:
+            query = f"""
+                UPDATE {table}
+                SET {', '.join(f'{key} = ${i+2}' for i, key in enumerate(update_keys))}
+                WHERE id = $1
+                """
+            await transaction.executemany(query, updates)
+
     async def save(self, transaction: Connection | None = None) -> None:
         """Save the entity to the database.
 
@@ -201,21 +328,9 @@ class ProjectLevelEntity(BaseEntity):
             self.status = await self.get_default_status()
 
         async def _save(conn: Connection) -> None:
-            attrib = {}
-            for key in self.own_attrib:
-                with suppress(AttributeError):
-                    if (value := getattr(self.attrib, key)) is not None:
-                        attrib[key] = value
-
             if self.exists:
                 # Update existing entity
-                fields = dict_exclude(
-                    self.dict(),
-                    ["id", "created_at", "updated_at"] + self.model.dynamic_fields,
-                )
-                fields["attrib"] = attrib
-                fields["updated_at"] = datetime.now()
-
+                fields = self._get_update_fields()
                 await self.pre_save(False, conn)
                 await conn.execute(
                     *SQLTool.update(
@@ -227,12 +342,7 @@ class ProjectLevelEntity(BaseEntity):
 
             else:
                 # Create a new entity
-                fields = dict_exclude(
-                    self.dict(exclude_none=True),
-                    self.model.dynamic_fields,
-                )
-                fields["attrib"] = attrib
-
+                fields = self._get_insert_fields()
                 await self.pre_save(True, conn)
                 await conn.execute(
                     *SQLTool.insert(
@@ -11,17 +11,33 @@ from ayon_server.exceptions import (
     ForbiddenException,
     NotFoundException,
 )
-from ayon_server.helpers.hierarchy_cache import rebuild_hierarchy_cache
-from ayon_server.helpers.inherited_attributes import rebuild_inherited_attributes
+from ayon_server.helpers.commit_scheduler import (
+    commit_folder_count_changes,
+    commit_hierarchy_changes,
+)
+from ayon_server.helpers.entity_paths import (
+    create_folder_paths,
+    delete_folder_paths,
+    update_folder_paths,
+)
+from ayon_server.helpers.inherited_attributes import propagate_inherited_attributes
 from ayon_server.lib.postgres import Connection, Postgres
 from ayon_server.types import ProjectLevelEntityType
-from ayon_server.utils import EntityID, SQLTool, dict_exclude
+from ayon_server.utils import EntityID, SQLTool
 
 
 class FolderEntity(ProjectLevelEntity):
     entity_type: ProjectLevelEntityType = "folder"
     model: ModelSet = ModelSet("folder", attribute_library["folder"])
 
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # Ids of folders, which hierarchy cache entries need to be updated
+        # on commit. None means the whole cache needs to be rebuilt.
+        self._hierarchy_changes: set[str] | None = set()
+        # Ids of folders, which child counts need to be updated on commit
+        self._count_changes: set[str] = set()
+
     @classmethod
     async def load(
         cls,
@@ -33,13 +49,35 @@ class FolderEntity(ProjectLevelEntity):
         """Load a folder from the database by its project name and IDself.
 
         This is reimplemented, because we need to select dynamic
-        attribute hierarchy.path along with the base data and
+        attribute path (from entity_paths) along with the base data and
         the attributes inherited from parent entities.
         """
 
         if EntityID.parse(entity_id) is None:
             raise ValueError(f"Invalid {cls.entity_type} ID specified")
 
+        for folder in await cls.load_many(
+            project_name,
+            [entity_id],
+            transaction=transaction,
+            for_update=for_update,
+        ):
+            return folder
+        raise NotFoundException("Entity not found")
+
+    @classmethod
+    async def load_many(
+        cls,
+        project_name: str,
+        entity_ids: list[str],
+        transaction: Connection | None = None,
+        for_update: bool = False,
+    ) -> list["FolderEntity"]:
+        """Load multiple folders using a single query.
+
+        Folders, which don't exist, are omitted from the result.
+        """
+
         query = f"""
             SELECT
                 f.id as id,
@@ -60,21 +98,24 @@ class FolderEntity(ProjectLevelEntity):
                 p.attrib AS project_attrib
             FROM project_{project_name}.folders as f
             INNER JOIN
-                project_{project_name}.hierarchy as h
-                ON f.id = h.id
+                project_{project_name}.entity_paths as h
+                ON f.id = h.entity_id
             LEFT JOIN
                 project_{project_name}.exported_attributes as ia
                 ON f.parent_id = ia.folder_id
             INNER JOIN public.projects as p
-                ON p.name ILIKE $2
-            WHERE f.id=$1
+                ON LOWER(p.name) = LOWER($2)
+            WHERE f.id = ANY($1)
             {'FOR UPDATE OF f'
                 if transaction and for_update else ''
             }
             """
 
+        result = []
         try:
-            async for record in Postgres.iterate(query, entity_id, project_name):
+            async for record in Postgres.iterate(
+                query, entity_ids, project_name, transaction=transaction
+            ):
                 record = dict(record)
                 path = record.pop("path")
                 if path is not None:
@@ -99,14 +140,31 @@ class FolderEntity(ProjectLevelEntity):
                 attrib.update(record["attrib"])
                 own_attrib = list(record["attrib"].keys())
                 payload = {**record, "attrib": attrib}
-                return cls.from_record(
-                    project_name=project_name,
-                    payload=payload,
-                    own_attrib=own_attrib,
+                result.append(
+                    cls.from_record(
+                        project_name=project_name,
+                        payload=payload,
+                        own_attrib=own_attrib,
+                    )
                 )
         except Postgres.UndefinedTableError:
             raise NotFoundException(f"Project {project_name} not found")
-        raise NotFoundException("Entity not found")
+        return result
+
+    def _get_update_fields(self) -> dict[str, Any]:
+        return {
+            "name": self.name,
+            "label": self.label,
+            "folder_type": self.folder_type,
+            "parent_id": self.parent_id,
+            "thumbnail_id": self.thumbnail_id,
+            "status": self.status,
+            "tags": self.tags,
+            "attrib": self._get_own_attrib(),
+            "data": self.data,
+            "active": self.active,
+            "updated_at": datetime.now(),
+        }
 
     async def save(self, transaction: Connection | None = None) -> None:
         if not transaction:
@@ -119,8 +177,8 @@ class FolderEntity(ProjectLevelEntity):
     async def _save(self, transaction: Connection) -> None:
         """Save the folder to the database.
 
-        This overriden method also clears exported_attributes,
-        which is then repopulated during commit.
+        This overriden method also updates paths and inherited
+        attributes of the folder and its descendants (when changed).
         """
 
         if self.status is None:
@@ -137,31 +195,32 @@ class FolderEntity(ProjectLevelEntity):
                 raise AyonException("No folder types defined")
             self.folder_type = res[0]["name"]
 
-        attrib = {}
-        for key in self.own_attrib:
-            if not hasattr(self.attrib, key):
-                continue
-            if (value := getattr(self.attrib, key)) is not None:
-                attrib[key] = value
+        changes: set[str] = {self.id}
+        if self.parent_id:
+            changes.add(self.parent_id)  # parent may have its first child
 
         if self.exists:
             # Update existing entity
 
+            res = await transaction.fetch(
+                f"""
+                SELECT parent_id FROM project_{self.project_name}.folders
+                WHERE id = $1
+                """,
+                self.id,
+            )
+            if res and res[0]["parent_id"]:
+                changes.add(res[0]["parent_id"])  # folder may have been moved
+            if res and res[0]["parent_id"] != self.parent_id:
+                for parent_id in (res[0]["parent_id"], self.parent_id):
+                    if parent_id:
+                        self._count_changes.add(parent_id)
+
             await transaction.execute(
                 *SQLTool.update(
                     f"project_{self.project_name}.{self.entity_type}s",
                     f"WHERE id = '{self.id}'",
-                    name=self.name,
-                    label=self.label,
-                    folder_type=self.folder_type,
-                    parent_id=self.parent_id,
-                    thumbnail_id=self.thumbnail_id,
-                    status=self.status,
-                    tags=self.tags,
-                    attrib=attrib,
-                    data=self.data,
-                    active=self.active,
-                    updated_at=datetime.now(),
+                    **self._get_update_fields(),
                 )
             )
 
@@ -170,29 +229,149 @@ class FolderEntity(ProjectLevelEntity):
             await transaction.execute(
                 *SQLTool.insert(
                     f"project_{self.project_name}.{self.entity_type}s",
-                    **dict_exclude(self.dict(exclude_none=True), ["own_attrib"]),
+                    **self._get_insert_fields(),
                 )
             )
+            if self.parent_id:
+                self._count_changes.add(self.parent_id)
 
-    async def commit(self, transaction: Connection | None = None) -> None:
-        """Refresh hierarchy materialized view on folder save."""
+        changes.update(
+            await update_folder_paths(self.project_name, self.id, transaction)
+        )
+        updated = await propagate_inherited_attributes(
+            self.project_name,
+            self.id,
+            transaction=transaction,
+        )
+        if updated is None or self._hierarchy_changes is None:
+            self._hierarchy_changes = None
+        else:
+            self._hierarchy_changes.update(changes, updated)
 
-        async def _commit(conn):
-            await conn.execute(
+    @classmethod
+    async def save_many(
+        cls,
+        entities: list["FolderEntity"],
+        transaction: Connection,
+    ) -> None:
+        """Save multiple folders using multi-row statements.
+
+        New folders, which are children of other new folders,
+        must follow their parents in the list.
+        Paths and inherited attributes are updated for all saved
+        subtrees at once.
+        """
+        if not entities:
+            return
+        project_name = entities[0].project_name
+
+        if any(entity.folder_type is None for entity in entities):
+            res = await transaction.fetch(
                 f"""
-                REFRESH MATERIALIZED VIEW CONCURRENTLY
-                project_{self.project_name}.hierarchy
+                SELECT name from project_{project_name}.folder_types
+                ORDER BY position ASC LIMIT 1
                 """
             )
-            await rebuild_inherited_attributes(self.project_name, transaction=conn)
-            await rebuild_hierarchy_cache(self.project_name, transaction=conn)
+            if not res:
+                raise AyonException("No folder types defined")
+            for entity in entities:
+                if entity.folder_type is None:
+                    entity.folder_type = res[0]["name"]
+
+        changes: set[str] = set()
+        count_changes: set[str] = set()
+        for entity in entities:
+            changes.add(entity.id)
+            if entity.parent_id:
+                changes.add(entity.parent_id)
+                if not entity.exists:
+                    count_changes.add(entity.parent_id)
+
+        existing_ids = [entity.id for entity in entities if entity.exists]
+        if existing_ids:
+            # Folders may have been moved
+            res = await transaction.fetch(
+                f"""
+                SELECT id, parent_id FROM project_{project_name}.folders
+                WHERE id = ANY($1)
+                """,
+                existing_ids,
+            )
+            changes.update(row["parent_id"] for row in res if row["parent_id"])
+            new_parents = {entity.id: entity.parent_id for entity in entities}
+            for row in res:
+                if row["parent_id"] != new_parents[row["id"]]:
+                    for parent_id in (row["parent_id"], new_parents[row["id"]]):
+                        if parent_id:
+                            count_changes.add(parent_id)
+
+        await super().save_many(entities, transaction)
+
+        created_ids = [entity.id for entity in entities if not entity.exists]
+        if created_ids:
+            changes.update(
+                await create_folder_paths(project_name, created_ids, transaction)
+            )
+        for folder_id in existing_ids:
+            changes.update(
+                await update_folder_paths(project_name, folder_id, transaction)
+            )
 
-        if transaction is not None:
-            await _commit(transaction)
-            return
+        # Nested new folders are handled while crawling their parents
+        created = set(created_ids)
+        roots = [
+            entity.id
+            for entity in entities
+            if entity.exists or entity.parent_id not in created
+        ]
+        updated = await propagate_inherited_attributes(
+            project_name,
+            roots,
+            transaction=transaction,
+        )
+
+        # Changes of the whole batch are committed by the first folder,
+        # so they are not repeated when the folders are committed one by one.
+        rebuild = updated is None
+        for entity in entities:
+            if entity._hierarchy_changes is None:
+                rebuild = True
+            else:
+                changes.update(entity._hierarchy_changes)
+            entity._hierarchy_changes = set()
+            count_changes.update(entity._count_changes)
+            entity._count_changes = set()
+        entities[0]._count_changes = count_changes
+        if rebuild:
+            entities[0]._hierarchy_changes = None
         else:
-            async with Postgres.acquire() as conn, conn.transaction():
-                await _commit(conn)
+            entities[0]._hierarchy_changes = changes | set(updated or [])
+
+    async def commit(self, transaction: Connection | None = None) -> None:
+        """Update hierarchy cache entries and counts of folders affected
+        by the save.
+
+        Folder paths and inherited attributes are maintained
+        incrementally during save, so they don't need to be refreshed here.
+        Within a commit batch, the update is deferred (see commit_scheduler).
+        """
+
+        if self._count_changes:
+            await commit_folder_count_changes(
+                self.project_name,
+                self._count_changes,
+                transaction=transaction,
+            )
+            self._count_changes = set()
+
+        changes = self._hierarchy_changes
+        self._hierarchy_changes = set()
+        if changes is None or changes:
+            await commit_hierarchy_changes(
+                self.project_name,
+                changes,
+                transaction=transaction,
+            )
 
     async def delete(self, transaction: Connection | None = None, **kwargs) -> bool:
         if not transaction:
@@ -206,19 +385,33 @@ class FolderEntity(ProjectLevelEntity):
             logging.info(f"Force deleting folder and all its children. {self.path}")
             await transaction.execute(
                 f"""
+                WITH RECURSIVE subtree AS (
+                    SELECT id FROM project_{self.project_name}.folders
+                    WHERE id = $1
+                    UNION ALL
+                    SELECT f.id FROM project_{self.project_name}.folders f
+                    INNER JOIN subtree s ON f.parent_id = s.id
+                )
                 DELETE FROM project_{self.project_name}.products
-                WHERE folder_id IN (
-                    SELECT id FROM project_{self.project_name}.hierarchy
-                    WHERE path = $1
-                    OR path LIKE $1 || '/%'
-                ) RETURNING name
+                WHERE folder_id IN (SELECT id FROM subtree)
+                RETURNING name
                 """,
-                self.path.lstrip("/"),
+                self.id,
             )
 
+        deleted_ids = await delete_folder_paths(self.project_name, self.id, transaction)
         res = await super().delete(transaction=transaction, **kwargs)
         if res:
-            await rebuild_hierarchy_cache(self.project_name, transaction=transaction)
+            await commit_hierarchy_changes(
+                self.project_name,
+                [*deleted_ids, self.id, self.parent_id],
+                transaction=transaction,
+            )
+            await commit_folder_count_changes(
+                self.project_name,
+                [self.parent_id],
+                transaction=transaction,
+            )
         return res
 
     async def get_versions(self, transaction: Connection | None = None) -> list[str]:
@@ -1,6 +1,8 @@
 from ayon_server.access.utils import ensure_entity_access
 from ayon_server.entities.core import ProjectLevelEntity, attribute_library
 from ayon_server.entities.models import ModelSet
+from ayon_server.helpers.commit_scheduler import commit_folder_count_changes
+from ayon_server.lib.postgres import Connection
 from ayon_server.types import ProjectLevelEntityType
 
 
@@ -8,6 +10,12 @@ class ProductEntity(ProjectLevelEntity):
     entity_type: ProjectLevelEntityType = "product"
     model = ModelSet("product", attribute_library["product"])
 
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # Used to update the product count of the original folder
+        # when the product is moved
+        self._original_folder_id = self.folder_id if self.exists else None
+
     #
     # Properties
     #
@@ -23,6 +31,28 @@ class ProductEntity(ProjectLevelEntity):
             self.product_type,
         )
 
+    @classmethod
+    async def pre_save_many(cls, entities, transaction) -> None:
+        """Ensure product types of all saved products exist."""
+        product_types = {entity.product_type for entity in entities}
+        await transaction.executemany(
+            """
+            INSERT INTO product_types (name)
+            VALUES ($1)
+            ON CONFLICT DO NOTHING
+            """,
+            [(product_type,) for product_type in sorted(product_types)],
+        )
+
+    async def commit(self, transaction: Connection | None = None) -> None:
+        """Update product count of the parent folder."""
+        await commit_folder_count_changes(
+            self.project_name,
+            [self.folder_id, self._original_folder_id],
+            transaction=transaction,
+        )
+        self._original_folder_id = self.folder_id
+
     async def ensure_create_access(self, user, **kwargs) -> None:
         if user.is_manager:
             return
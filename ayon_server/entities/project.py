@@ -11,7 +11,8 @@ from ayon_server.entities.core import TopLevelEntity, attribute_library
 from ayon_server.entities.models import ModelSet
 from ayon_server.entities.models.submodels import LinkTypeModel
 from ayon_server.exceptions import NotFoundException
-from ayon_server.helpers.inherited_attributes import rebuild_inherited_attributes
+from ayon_server.helpers.commit_scheduler import commit_hierarchy_changes
+from ayon_server.helpers.inherited_attributes import propagate_inherited_attributes
 from ayon_server.helpers.project_list import build_project_list
 from ayon_server.lib.postgres import Postgres
 from ayon_server.utils import SQLTool, dict_exclude, get_nickname
@@ -129,7 +130,7 @@ class ProjectEntity(TopLevelEntity):
                 f"""
             SELECT  *
             FROM public.projects
-            WHERE name ILIKE $1
+            WHERE LOWER(name) = LOWER($1)
             {'FOR UPDATE' if transaction and for_update else ''}
             """,
                 name,
@@ -251,7 +252,11 @@ class ProjectEntity(TopLevelEntity):
             )
 
             if self.original_attributes != fields["attrib"]:
-                await rebuild_inherited_attributes(self.name, fields["attrib"])
+                updated = await propagate_inherited_attributes(
+                    self.name,
+                    pattr=fields["attrib"],
+                )
+                await commit_hierarchy_changes(self.name, updated)
 
         else:
             # Create a project record
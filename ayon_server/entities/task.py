@@ -6,6 +6,10 @@ from ayon_server.access.utils import ensure_entity_access
 from ayon_server.entities.core import ProjectLevelEntity, attribute_library
 from ayon_server.entities.models import ModelSet
 from ayon_server.exceptions import AyonException, NotFoundException
+from ayon_server.helpers.commit_scheduler import (
+    commit_folder_count_changes,
+    commit_hierarchy_changes,
+)
 from ayon_server.lib.postgres import Connection, Postgres
 from ayon_server.types import ProjectLevelEntityType
 from ayon_server.utils import EntityID
@@ -15,6 +19,12 @@ class TaskEntity(ProjectLevelEntity):
     entity_type: ProjectLevelEntityType = "task"
     model = ModelSet("task", attribute_library["task"])
 
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # Used to update the hierarchy cache and counts of the original
+        # folder when the task is moved
+        self._original_folder_id = self.folder_id if self.exists else None
+
     @classmethod
     async def load(
         cls,
@@ -32,6 +42,28 @@ class TaskEntity(ProjectLevelEntity):
         if EntityID.parse(entity_id) is None:
             raise ValueError(f"Invalid {cls.entity_type} ID specified")
 
+        for task in await cls.load_many(
+            project_name,
+            [entity_id],
+            transaction=transaction,
+            for_update=for_update,
+        ):
+            return task
+        raise NotFoundException("Entity not found")
+
+    @classmethod
+    async def load_many(
+        cls,
+        project_name: str,
+        entity_ids: list[str],
+        transaction=None,
+        for_update=False,
+    ) -> list["TaskEntity"]:
+        """Load multiple tasks using a single query.
+
+        Tasks, which don't exist, are omitted from the result.
+        """
+
         query = f"""
             SELECT
                 t.id as id,
@@ -53,14 +85,17 @@ class TaskEntity(ProjectLevelEntity):
             LEFT JOIN
                 project_{project_name}.exported_attributes as ia
                 ON t.folder_id = ia.folder_id
-            WHERE t.id=$1
+            WHERE t.id = ANY($1)
             {'FOR UPDATE OF t'
                 if transaction and for_update else ''
             }
             """
 
+        result = []
         try:
-            async for record in Postgres.iterate(query, entity_id):
+            async for record in Postgres.iterate(
+                query, entity_ids, transaction=transaction
+            ):
                 attrib: dict[str, Any] = {}
                 if (ia := record["inherited_attrib"]) is not None:
                     for key, value in ia.items():
@@ -74,14 +109,16 @@ class TaskEntity(ProjectLevelEntity):
                 attrib |= record["attrib"]
                 own_attrib = list(record["attrib"].keys())
                 payload = {**record, "attrib": attrib}
-                return cls.from_record(
-                    project_name=project_name,
-                    payload=payload,
-                    own_attrib=own_attrib,
+                result.append(
+                    cls.from_record(
+                        project_name=project_name,
+                        payload=payload,
+                        own_attrib=own_attrib,
+                    )
                 )
         except Postgres.UndefinedTableError:
             raise NotFoundException(f"Project {project_name} not found")
-        raise NotFoundException("Entity not found")
+        return result
 
     async def save(self, transaction: Connection | None = None) -> None:
         if self.task_type is None:
@@ -97,6 +134,42 @@ class TaskEntity(ProjectLevelEntity):
 
         await super().save(transaction=transaction)
 
+    @classmethod
+    async def save_many(
+        cls,
+        entities: list["TaskEntity"],
+        transaction: Connection,
+    ) -> None:
+        if any(entity.task_type is None for entity in entities):
+            res = await transaction.fetch(
+                f"""
+                SELECT name from project_{entities[0].project_name}.task_types
+                ORDER BY position ASC LIMIT 1
+                """
+            )
+            if not res:
+                raise AyonException("No task types defined")
+            for entity in entities:
+                if entity.task_type is None:
+                    entity.task_type = res[0]["name"]
+
+        await super().save_many(entities, transaction)
+
+    async def commit(self, transaction: Connection | None = None) -> None:
+        """Update task names in the hierarchy cache and task count
+        of the parent folder."""
+        await commit_hierarchy_changes(
+            self.project_name,
+            [self.folder_id, self._original_folder_id],
+            transaction=transaction,
+        )
+        await commit_folder_count_changes(
+            self.project_name,
+            [self.folder_id, self._original_folder_id],
+            transaction=transaction,
+        )
+        self._original_folder_id = self.folder_id
+
     async def ensure_create_access(self, user, **kwargs) -> None:
         if user.is_manager:
             return
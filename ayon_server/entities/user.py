@@ -4,6 +4,7 @@ import re
 from typing import Any
 
 from nxtools import logging
+from pydantic import BaseModel
 
 from ayon_server.access.access_groups import AccessGroups
 from ayon_server.access.permissions import Permissions
@@ -38,6 +39,11 @@ class UserEntity(TopLevelEntity):
     # project_name[access_type]: [path1, path2, ...]
     path_access_cache: dict[str, dict[AccessType, list[str]]] | None = None
 
+    # Loaders batching entity access checks (see access.utils)
+    # the structure is as follows:
+    # project_name: DataLoader
+    access_loaders: dict[str, Any] | None = None
+
     #
     # Load
     #
@@ -68,6 +74,22 @@ class UserEntity(TopLevelEntity):
             raise NotFoundException(f"Unable to load user {name}")
         return cls.from_record(user_data[0])
 
+    @classmethod
+    def from_model(cls, model: BaseModel) -> "UserEntity":
+        """Create an existing user entity from an already validated model.
+
+        Used to build the current user from the session without
+        validating the data again. The model is copied, so the entity
+        may be modified without affecting the source.
+        """
+        entity = cls.__new__(cls)
+        entity._payload = model.copy(deep=True)
+        entity.own_attrib = list(model.attrib.__fields__)  # type: ignore
+        entity.exists = True
+        entity.was_active = entity.active
+        entity.was_service = entity.is_service
+        return entity
+
     #
     # Save
     #
@@ -4,6 +4,7 @@ from ayon_server.access.utils import ensure_entity_access
 from ayon_server.entities.core import ProjectLevelEntity, attribute_library
 from ayon_server.entities.models import ModelSet
 from ayon_server.exceptions import ConstraintViolationException
+from ayon_server.helpers.commit_scheduler import commit_version_list_changes
 from ayon_server.lib.postgres import Connection, Postgres
 from ayon_server.types import ProjectLevelEntityType
 
@@ -12,6 +13,12 @@ class VersionEntity(ProjectLevelEntity):
     entity_type: ProjectLevelEntityType = "version"
     model = ModelSet("version", attribute_library["version"])
 
+    def __init__(self, *args, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        # Used to update the version list of the original product
+        # when the version is moved
+        self._original_product_id = self.product_id if self.exists else None
+
     async def save(self, transaction: Connection | None = None) -> None:
         """Save entity to database."""
 
@@ -44,22 +51,56 @@ class VersionEntity(ProjectLevelEntity):
                 self.task_id,
             )
 
-    async def commit(self, transaction=None) -> None:
-        """Refresh hierarchy materialized view on folder save."""
+    @classmethod
+    async def save_many(
+        cls,
+        entities: list["VersionEntity"],
+        transaction: Connection,
+    ) -> None:
+        if not entities:
+            return
+        project_name = entities[0].project_name
 
-        async def _commit(conn):
-            await conn.execute(
+        if heroes := [entity for entity in entities if entity.version < 0]:
+            # Ensure there is no previous hero version
+            product_ids = [entity.product_id for entity in heroes]
+            if len(set(product_ids)) != len(product_ids):
+                raise ConstraintViolationException("Hero version already exists.")
+            res = await transaction.fetch(
                 f"""
-                REFRESH MATERIALIZED VIEW CONCURRENTLY
-                project_{self.project_name}.version_list
-                """
+                SELECT id FROM project_{project_name}.versions
+                WHERE
+                    version < 0
+                AND NOT id = ANY($1)
+                AND product_id = ANY($2)
+                """,
+                [entity.id for entity in heroes],
+                product_ids,
             )
+            if res:
+                raise ConstraintViolationException("Hero version already exists.")
 
-        if transaction:
-            await _commit(transaction)
-        else:
-            async with Postgres.acquire() as conn, conn.transaction():
-                await _commit(conn)
+        await super().save_many(entities, transaction)
+
+        if task_ids := list({entity.task_id for entity in entities if entity.task_id}):
+            await transaction.execute(
+                f"""
+                UPDATE project_{project_name}.tasks
+                SET updated_at = NOW()
+                WHERE id = ANY($1)
+                """,
+                task_ids,
+            )
+
+    async def commit(self, transaction=None) -> None:
+        """Update version list of the parent product on version save."""
+
+        await commit_version_list_changes(
+            self.project_name,
+            [self.product_id, self._original_product_id],
+            transaction=transaction,
+        )
+        self._original_product_id = self.product_id
 
     async def ensure_create_access(self, user, **kwargs) -> None:
         if user.is_manager:
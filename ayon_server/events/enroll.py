@@ -1,6 +1,13 @@
+import datetime
+
 from ayon_server.events.eventstream import EventStream
+from ayon_server.events.watermarks import (
+    WATERMARK_MARGIN,
+    get_enroll_watermark,
+    set_enroll_watermark,
+)
 from ayon_server.exceptions import ConstraintViolationException
-from ayon_server.lib.postgres import Postgres
+from ayon_server.lib.postgres import Connection, Postgres
 from ayon_server.sqlfilter import Filter, build_filter
 from ayon_server.types import Field, OPModel
 from ayon_server.utils import hash_data
@@ -37,134 +44,200 @@ async def enroll_job(
 
     filter_query = build_filter(filter, table_prefix="source_events") or "TRUE"
 
-    # Iterate thru unprocessed source events starting
-    # by the oldest one
-
     if isinstance(source_topic, str):
-        topic_cond = "topic LIKE $1"
+        source_topics = [source_topic]
+        topic_cond = "source_events.topic LIKE $1"
     else:
-        topic_cond = "topic = ANY($1)"
-
-    query = f"""
-        WITH excluded_events AS (
-            SELECT depends_on
-            FROM events
-            WHERE topic = $2
+        source_topics = source_topic
+        topic_cond = "source_events.topic = ANY($1)"
+
+    watermark_key = hash_data(
+        [source_topic, target_topic, sender, sequential, max_retries, filter_query]
+    )
+    watermark = await get_enroll_watermark(watermark_key)
+    if watermark is None:
+        since = datetime.datetime.min.replace(tzinfo=datetime.timezone.utc)
+    else:
+        since = watermark - WATERMARK_MARGIN
+
+    args = [source_topic, target_topic, max_retries, since]
+
+    # NO KEY UPDATE lock does not block inserting the target event,
+    # which references the source event.
+    if sequential:
+        # Sequential jobs must be processed in order. Wait for other
+        # workers claiming the oldest event and don't skip events
+        # processed by other workers (we will stop there).
+        lock_clause = "FOR NO KEY UPDATE OF source_events"
+        taken_cond = "FALSE"
+    else:
+        # Skip events being claimed and events processed by other workers
+        lock_clause = "FOR NO KEY UPDATE OF source_events SKIP LOCKED"
+        taken_cond = """(
+            target_events.status IN ('pending', 'in_progress')
+            AND target_events.sender IS DISTINCT FROM $5
+        )"""
+        args.append(sender)
+
+    # Candidate source events starting by the oldest one. Events processed
+    # (or taken) are excluded using the index on (depends_on, topic), events
+    # older than the watermark are not scanned at all.
+
+    candidates_query = f"""
+        FROM events AS source_events
+        WHERE {topic_cond}
+        AND source_events.status = 'finished'
+        AND source_events.created_at >= $4
+        AND NOT EXISTS (
+            SELECT 1 FROM events AS target_events
+            WHERE target_events.depends_on = source_events.id
+            AND target_events.topic = $2
             AND (
-                status = 'finished'
-                OR (status = 'failed' AND retries > $3)
+                target_events.status = 'finished'
+                OR (target_events.status = 'failed' AND target_events.retries > $3)
+                OR {taken_cond}
             )
-        ),
-        source_events AS (
-            SELECT *
-            FROM events
-            WHERE {topic_cond}
-            AND status = 'finished'
-            AND id NOT IN (SELECT depends_on FROM excluded_events)
         )
-
-        SELECT
-            source_events.id AS source_id,
-            target_events.status AS target_status,
-            target_events.sender AS target_sender,
-            target_events.retries AS target_retries,
-            target_events.hash AS target_hash,
-            target_events.retries AS target_retries,
-            target_events.id AS target_id
-        FROM
-            source_events
-        LEFT JOIN events AS target_events
-        ON
-            target_events.depends_on = source_events.id
-            AND target_events.topic = $2
-        WHERE
-            {filter_query}
-        ORDER BY
-            source_events.created_at ASC
-        LIMIT 1000  -- Pool of 1000 events should be enough
+        AND {filter_query}
     """
 
-    async for row in Postgres.iterate(
-        query,
-        source_topic,
-        target_topic,
-        max_retries,
-    ):
-        # Check if target event already exists
-        if row["target_status"] is not None:
-            if row["target_status"] in ["failed", "restarted"]:
-                # events which have reached max retries are already
-                # filtered out by the query above,
-                # so we can just retry them - update status to pending
-                # and increase retries counter
-
-                retries = row["target_retries"]
-                if row["target_status"] == "failed":
-                    retries += 1
-
-                event_id = row["target_id"]
-                await EventStream.update(
-                    event_id,
-                    status="pending",
-                    sender=sender,
-                    user=user_name,
-                    retries=retries,
-                    description="Restarting failed event",
-                )
-                return EnrollResponseModel(
-                    id=event_id,
-                    hash=row["target_hash"],
-                    depends_on=row["source_id"],
-                    status="pending",
+    # Target events are published after the claim transaction is committed,
+    # so nobody sees (or waits for) an event, which may roll back.
+    async with EventStream.deferred_publishing():
+        async with Postgres.acquire() as conn, conn.transaction():
+            # The watermark is computed without skipping locked rows,
+            # so it never moves past events claimed by other workers,
+            # which may roll back.
+            new_watermark = await conn.fetchval(
+                f"SELECT MIN(source_events.created_at) {candidates_query}", *args
+            )
+            if new_watermark is None:
+                new_watermark = await conn.fetchval("SELECT NOW()")
+            if new_watermark != watermark:
+                await set_enroll_watermark(
+                    watermark_key,
+                    source_topics,
+                    target_topic,
+                    watermark,
+                    new_watermark,
+                    transaction=conn,
                 )
 
-            if row["target_sender"] != sender:
-                # There is already a target event for this source event.
-                # Check who is the sender. If it's not us, then we can't
-                # enroll for this job (the other worker is already working on it)
-                if sequential:
-                    return None
-                continue
-
-            # We are the sender of the target event, so it is possible that,
-            # for some reason, we have not finished processing it yet.
-            # In this case, we can't enroll for this job again.
-
-            return EnrollResponseModel(
-                id=row["target_id"],
-                depends_on=row["source_id"],
-                status=row["target_status"],
-                hash=row["target_hash"],
+            # Claimed row stays locked until the target event is created
+            # (or updated), so concurrent workers don't race for it.
+            source_id = await conn.fetchval(
+                f"""
+                SELECT source_events.id {candidates_query}
+                ORDER BY source_events.created_at ASC
+                LIMIT 1
+                {lock_clause}
+                """,
+                *args,
             )
+            if source_id is None:
+                return None
 
-        # Target event does not exist yet. Create a new one
-        new_hash = hash_data((target_topic, row["source_id"]))
-        try:
-            new_id = await EventStream.dispatch(
+            return await _enroll_source_event(
+                source_id,
                 target_topic,
                 sender=sender,
-                hash=new_hash,
-                depends_on=row["source_id"],
-                user=user_name,
+                user_name=user_name,
                 description=description,
-                finished=False,
+                conn=conn,
             )
 
-        except ConstraintViolationException:
-            # for some reason, the event already exists
-            # most likely because another worker took it
 
-            # in that case, we abort (if sequential) or
-            # continue to the next event
-            if sequential:
-                return None
-            continue
+async def _enroll_source_event(
+    source_id: str,
+    target_topic: str,
+    *,
+    sender: str,
+    user_name: str | None,
+    description: str,
+    conn: Connection,
+) -> EnrollResponseModel | None:
+    """Create (or restart) the target event of a claimed source event.
+
+    Returns None if the source event is processed by another worker.
+    """
+    res = await conn.fetch(
+        """
+        SELECT id, status, sender, retries, hash FROM events
+        WHERE depends_on = $1 AND topic = $2
+        """,
+        source_id,
+        target_topic,
+    )
+
+    # Check if target event already exists
+    if res:
+        row = res[0]
+        if row["status"] in ["failed", "restarted"]:
+            # events which have reached max retries are already
+            # filtered out by the query above,
+            # so we can just retry them - update status to pending
+            # and increase retries counter
+
+            retries = row["retries"]
+            if row["status"] == "failed":
+                retries += 1
+
+            event_id = row["id"]
+            await EventStream.update(
+                event_id,
+                status="pending",
+                sender=sender,
+                user=user_name,
+                retries=retries,
+                description="Restarting failed event",
+                transaction=conn,
+            )
+            return EnrollResponseModel(
+                id=event_id,
+                hash=row["hash"],
+                depends_on=source_id,
+                status="pending",
+            )
+
+        if row["sender"] != sender:
+            # There is already a target event for this source event.
+            # Check who is the sender. If it's not us, then we can't
+            # enroll for this job (the other worker is already working on it)
+            return None
+
+        # We are the sender of the target event, so it is possible that,
+        # for some reason, we have not finished processing it yet.
+        # In this case, we can't enroll for this job again.
 
         return EnrollResponseModel(
-            id=new_id,
+            id=row["id"],
+            depends_on=source_id,
+            status=row["status"],
+            hash=row["hash"],
+        )
+
+    # Target event does not exist yet. Create a new one
+    new_hash = hash_data((target_topic, source_id))
+    try:
+        new_id = await EventStream.dispatch(
+            target_topic,
+            sender=sender,
             hash=new_hash,
-            depends_on=row["source_id"],
-            status="pending",
+            depends_on=source_id,
+            user=user_name,
+            description=description,
+            finished=False,
+            transaction=conn,
         )
 
-    return None
+    except ConstraintViolationException:
+        # for some reason, the event already exists
+        # most likely because another worker took it
+        return None
+
+    return EnrollResponseModel(
+        id=new_id,
+        hash=new_hash,
+        depends_on=source_id,
+        status="pending",
+    )
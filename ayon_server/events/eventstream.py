@@ -1,30 +1,64 @@
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
 from datetime import datetime
-from typing import Any, Awaitable, Callable, Type
+from typing import Any, Type
 
 from nxtools import logging
 
 from ayon_server.exceptions import ConstraintViolationException, NotFoundException
-from ayon_server.lib.postgres import Postgres
+from ayon_server.lib.postgres import Connection, Postgres
 from ayon_server.lib.redis import Redis
 from ayon_server.utils import SQLTool, json_dumps
 
 from .base import EventModel, EventStatus, create_id
+from .hooks import EventHook, HandlerType, run_hooks
+from .watermarks import lower_enroll_watermarks
 
-HandlerType = Callable[[EventModel], Awaitable[None]]
+# Messages (and events to run hooks for) collected by a `deferred_publishing` block
+_deferred: ContextVar[list[tuple[dict[str, Any], EventModel | None]] | None] = (
+    ContextVar("deferred_event_messages", default=None)
+)
 
 
 class EventStream:
     model: Type[EventModel] = EventModel
-    hooks: dict[str, list[HandlerType]] = {}
+    hooks: dict[str, list[EventHook]] = {}
 
     @classmethod
-    def subscribe(cls, topic: str, handler: HandlerType) -> None:
+    def subscribe(
+        cls,
+        topic: str,
+        handler: HandlerType,
+        *,
+        background: bool = False,
+        concurrency: int = 4,
+        timeout: float | None = 60,
+        max_retries: int = 0,
+    ) -> None:
+        """Call the handler when an event with the given topic is dispatched.
+
+        background:
+            run the handler by the hook executor, so the dispatching
+            request does not wait for it (see ayon_server.events.hooks)
+
+        concurrency, timeout, max_retries:
+            limits of the background execution
+        """
+        hook = EventHook(
+            topic,
+            handler,
+            background=background,
+            concurrency=concurrency,
+            timeout=timeout,
+            max_retries=max_retries,
+        )
         if topic not in cls.hooks:
             cls.hooks[topic] = []
-        cls.hooks[topic].append(handler)
+        cls.hooks[topic].append(hook)
 
     @classmethod
-    async def dispatch(
+    def _create_event(
         cls,
         topic: str,
         *,
@@ -37,20 +71,7 @@ class EventStream:
         summary: dict[str, Any] | None = None,
         payload: dict[str, Any] | None = None,
         finished: bool = True,
-        store: bool = True,
-        recipients: list[str] | None = None,
-    ) -> str:
-        """
-
-        finished:
-            whether the event one shot and should be marked as finished upon creation
-
-        store:
-            whether to store the event in the database
-
-        recipients:
-            list of user names to notify via websocket (None for all users)
-        """
+    ) -> EventModel:
         if summary is None:
             summary = {}
         if payload is None:
@@ -62,10 +83,7 @@ class EventStream:
         if hash is None:
             hash = f"{event_id}"
 
-        status: str = "finished" if finished else "pending"
-        progress: float = 100 if finished else 0.0
-
-        event = EventModel(
+        return EventModel(
             id=event_id,
             hash=hash,
             sender=sender,
@@ -73,74 +91,282 @@ class EventStream:
             project=project,
             user=user,
             depends_on=depends_on,
-            status=status,
+            status="finished" if finished else "pending",
             description=description,
             summary=summary,
             payload=payload,
             retries=0,
         )
 
-        if store:
-            query = SQLTool.insert(
-                table="events",
-                id=event.id,
-                hash=event.hash,
-                sender=event.sender,
-                topic=event.topic,
-                project_name=event.project,
-                user_name=event.user,
-                depends_on=depends_on,
-                status=status,
-                description=description,
-                summary=event.summary,
-                payload=event.payload,
-            )
+    @classmethod
+    def _message(
+        cls,
+        event: EventModel,
+        *,
+        progress: float,
+        store: bool,
+        recipients: list[str] | None,
+    ) -> dict[str, Any]:
+        """Create a message published to the Redis channel on dispatch"""
+        depends_on = (
+            str(event.depends_on).replace("-", "") if event.depends_on else None
+        )
+        return {
+            "id": str(event.id).replace("-", ""),
+            "topic": event.topic,
+            "project": event.project,
+            "user": event.user,
+            "dependsOn": depends_on,
+            "description": event.description,
+            "summary": event.summary,
+            "status": event.status,
+            "progress": progress,
+            "sender": event.sender,
+            "store": store,  # useful to allow querying details
+            "recipients": recipients,
+            "createdAt": event.created_at,
+            "updatedAt": event.updated_at,
+        }
 
-            try:
-                await Postgres.execute(*query)
-            except Postgres.ForeignKeyViolationError as e:
-                raise ConstraintViolationException(
-                    "Event depends on non-existing event",
-                ) from e
+    @classmethod
+    async def _run_hooks(cls, event: EventModel) -> None:
+        await run_hooks(cls.hooks.get(event.topic, []), event)
 
-            except Postgres.UniqueViolationError as e:
-                raise ConstraintViolationException(
-                    "Event with same hash already exists",
-                ) from e
+    @classmethod
+    async def _publish(
+        cls,
+        message: dict[str, Any],
+        event: EventModel | None = None,
+    ) -> None:
+        """Publish the message and run hooks of the event (if given)"""
+        if (pending := _deferred.get()) is not None:
+            pending.append((message, event))
+            return
+        await Redis.publish(json_dumps(message))
+        if event is not None:
+            await cls._run_hooks(event)
 
-        depends_on = (
-            str(event.depends_on).replace("-", "") if event.depends_on else None
+    @classmethod
+    @asynccontextmanager
+    async def deferred_publishing(cls) -> AsyncIterator[None]:
+        """Publish events dispatched (or updated) within the block
+        and run their hooks when the block exits.
+
+        Use it around a transaction, in which events are stored, so
+        nobody is notified about events, which are not committed yet.
+        Nothing is published when the block raises an exception.
+        """
+        pending: list[tuple[dict[str, Any], EventModel | None]] = []
+        token = _deferred.set(pending)
+        try:
+            yield
+        finally:
+            _deferred.reset(token)
+        for message, event in pending:
+            await cls._publish(message, event)
+
+    @classmethod
+    async def _insert(
+        cls,
+        event: EventModel,
+        transaction: Connection | None = None,
+    ) -> None:
+        query = SQLTool.insert(
+            table="events",
+            id=event.id,
+            hash=event.hash,
+            sender=event.sender,
+            topic=event.topic,
+            project_name=event.project,
+            user_name=event.user,
+            depends_on=event.depends_on,
+            status=event.status,
+            description=event.description,
+            summary=event.summary,
+            payload=event.payload,
         )
-        await Redis.publish(
-            json_dumps(
-                {
-                    "id": str(event.id).replace("-", ""),
-                    "topic": event.topic,
-                    "project": event.project,
-                    "user": event.user,
-                    "dependsOn": depends_on,
-                    "description": event.description,
-                    "summary": event.summary,
-                    "status": event.status,
-                    "progress": progress,
-                    "sender": sender,
-                    "store": store,  # useful to allow querying details
-                    "recipients": recipients,
-                    "createdAt": event.created_at,
-                    "updatedAt": event.updated_at,
-                }
-            )
+
+        try:
+            if transaction is None:
+                await Postgres.execute(*query)
+            else:
+                # Savepoint keeps the transaction usable on conflicts
+                async with transaction.transaction():
+                    await transaction.execute(*query)
+        except Postgres.ForeignKeyViolationError as e:
+            raise ConstraintViolationException(
+                "Event depends on non-existing event",
+            ) from e
+
+        except Postgres.UniqueViolationError as e:
+            raise ConstraintViolationException(
+                "Event with same hash already exists",
+            ) from e
+
+    @classmethod
+    async def dispatch(
+        cls,
+        topic: str,
+        *,
+        sender: str | None = None,
+        hash: str | None = None,
+        project: str | None = None,
+        user: str | None = None,
+        depends_on: str | None = None,
+        description: str | None = None,
+        summary: dict[str, Any] | None = None,
+        payload: dict[str, Any] | None = None,
+        finished: bool = True,
+        store: bool = True,
+        recipients: list[str] | None = None,
+        transaction: Connection | None = None,
+    ) -> str:
+        """
+
+        finished:
+            whether the event one shot and should be marked as finished upon creation
+
+        store:
+            whether to store the event in the database
+
+        recipients:
+            list of user names to notify via websocket (None for all users)
+
+        transaction:
+            connection of an open transaction to store the event with.
+            Use it within `deferred_publishing`, so the event is published
+            after the transaction is committed.
+        """
+        event = cls._create_event(
+            topic,
+            sender=sender,
+            hash=hash,
+            project=project,
+            user=user,
+            depends_on=depends_on,
+            description=description,
+            summary=summary,
+            payload=payload,
+            finished=finished,
         )
+        progress: float = 100 if finished else 0.0
 
-        handlers = cls.hooks.get(event.topic, [])
-        for handler in handlers:
-            try:
-                await handler(event)
-            except Exception as e:
-                logging.debug(f"Error in event handler: {e}")
+        if store:
+            await cls._insert(event, transaction)
 
+        message = cls._message(
+            event,
+            progress=progress,
+            store=store,
+            recipients=recipients,
+        )
+        await cls._publish(message, event)
         return event.id
 
+    @classmethod
+    async def dispatch_many(
+        cls,
+        events: list[dict[str, Any]],
+        *,
+        sender: str | None = None,
+        user: str | None = None,
+    ) -> list[str]:
+        """Dispatch multiple events at once.
+
+        Each item contains keyword arguments of `dispatch`. `sender`
+        and `user` are used for events, which do not specify them.
+
+        Stored events are inserted using a single statement, messages
+        are published using a single Redis pipeline and hooks run after
+        the whole batch is dispatched. Events with a hash, which already
+        exists, are skipped. If the batch can't be inserted at once
+        (an event depends on a non-existing event), events are inserted
+        one by one, so only the failing ones are skipped.
+        Returns ids of the dispatched events.
+        """
+        batch: list[tuple[EventModel, bool, list[str] | None]] = []
+        for kwargs in events:
+            kwargs = dict(kwargs)
+            kwargs.setdefault("sender", sender)
+            kwargs.setdefault("user", user)
+            store = kwargs.pop("store", True)
+            recipients = kwargs.pop("recipients", None)
+            batch.append((cls._create_event(**kwargs), store, recipients))
+
+        stored = [event for event, store, _ in batch if store]
+        if stored:
+            inserted = await cls._insert_many(stored)
+            if len(inserted) < len(stored):
+                logging.warning(
+                    f"{len(stored) - len(inserted)} of {len(stored)} "
+                    "events were not stored and dispatched"
+                )
+                batch = [
+                    (event, store, recipients)
+                    for event, store, recipients in batch
+                    if not store or event.id in inserted
+                ]
+
+        if not batch:
+            return []
+
+        async with Redis.pipeline() as pipe:
+            for event, store, recipients in batch:
+                message = cls._message(
+                    event,
+                    progress=100 if event.status == "finished" else 0.0,
+                    store=store,
+                    recipients=recipients,
+                )
+                pipe.publish(json_dumps(message))
+            await pipe.execute()
+
+        for event, _, _ in batch:
+            await cls._run_hooks(event)
+
+        return [event.id for event, _, _ in batch]
+
+    @classmethod
+    async def _insert_many(cls, events: list[EventModel]) -> set[str]:
+        """Insert events and return ids of the inserted ones"""
+        try:
+            rows = await Postgres.fetch(
+                """
+                INSERT INTO events (
+                    id, hash, sender, topic, project_name, user_name,
+                    depends_on, status, description, summary, payload
+                )
+                SELECT * FROM UNNEST(
+                    $1::UUID[], $2::VARCHAR[], $3::VARCHAR[], $4::VARCHAR[],
+                    $5::VARCHAR[], $6::VARCHAR[], $7::UUID[], $8::VARCHAR[],
+                    $9::TEXT[], $10::JSONB[], $11::JSONB[]
+                )
+                ON CONFLICT (hash) DO NOTHING
+                RETURNING id
+                """,
+                [event.id for event in events],
+                [event.hash for event in events],
+                [event.sender for event in events],
+                [event.topic for event in events],
+                [event.project for event in events],
+                [event.user for event in events],
+                [event.depends_on for event in events],
+                [event.status for event in events],
+                [event.description for event in events],
+                [event.summary for event in events],
+                [event.payload for event in events],
+            )
+        except Postgres.ForeignKeyViolationError:
+            inserted: set[str] = set()
+            for event in events:
+                try:
+                    await cls._insert(event)
+                except ConstraintViolationException:
+                    continue
+                inserted.add(event.id)
+            return inserted
+        return {row["id"] for row in rows}
+
     @classmethod
     async def update(
         cls,
@@ -157,7 +383,15 @@ class EventStream:
         store: bool = True,
         retries: int | None = None,
         recipients: list[str] | None = None,
+        transaction: Connection | None = None,
     ) -> bool:
+        """Update the event and publish the change.
+
+        transaction:
+            connection of an open transaction to store the update with.
+            Use it within `deferred_publishing`, so the change is published
+            after the transaction is committed.
+        """
         new_data: dict[str, Any] = {"updated_at": datetime.now()}
 
         if sender is not None:
@@ -201,11 +435,14 @@ class EventStream:
         else:
             query = ["SELECT * FROM events WHERE id=$1", event_id]
 
-        result = await Postgres.fetch(*query)
+        conn = transaction or Postgres
+        result = await conn.fetch(*query)
         for row in result:
             data = dict(row)
             if not store:
                 data.update(new_data)
+            elif status is not None:
+                await lower_enroll_watermarks(data, transaction=transaction)
             message = {
                 "id": data["id"],
                 "topic": data["topic"],
@@ -222,7 +459,7 @@ class EventStream:
             }
             if progress is not None:
                 message["progress"] = progress
-            await Redis.publish(json_dumps(message))
+            await cls._publish(message)
             return True
         return False
 
@@ -0,0 +1,188 @@
+"""Execution of in-process event hooks.
+
+Hooks are subscribed to event topics using `EventStream.subscribe`.
+By default, they are awaited by `EventStream.dispatch` one by one,
+so their duration adds to the request, which dispatched the event.
+
+Hooks subscribed with `background=True` are queued to `HookExecutor`
+instead and the dispatching request only pays for persisting the event.
+The executor runs them in a background worker with a per-hook
+concurrency limit and timeout. Calls are queued per hook and a call
+is passed to the (shared) executor slots only when its hook has free
+capacity, so a slow hook can't occupy slots needed by other hooks.
+Failed calls of hooks with `max_retries` are queued again after a delay,
+so handlers used with retries must be idempotent (a timed out call may
+have already done its work).
+
+When the queue is full, background hooks are dropped (and counted).
+When the executor is not running (e.g. in CLI scripts), they are
+executed inline.
+"""
+
+import asyncio
+from collections import deque
+from typing import Awaitable, Callable
+
+from nxtools import logging
+
+from ayon_server.background.background_worker import BackgroundWorker
+
+from .base import EventModel
+
+HandlerType = Callable[[EventModel], Awaitable[None]]
+
+
+class EventHook:
+    def __init__(
+        self,
+        topic: str,
+        handler: HandlerType,
+        *,
+        background: bool = False,
+        concurrency: int = 4,
+        timeout: float | None = 60,
+        max_retries: int = 0,
+    ) -> None:
+        self.topic = topic
+        self.handler = handler
+        self.background = background
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.concurrency = concurrency
+
+        # Calls waiting for a free capacity of the hook (event, attempt)
+        # and number of calls passed to the executor
+        self.pending: deque[tuple[EventModel, int]] = deque()
+        self.active = 0
+
+        self.name = getattr(handler, "__qualname__", repr(handler))
+        self.processed = 0
+        self.failed = 0
+        self.retried = 0
+        self.dropped = 0
+
+    async def __call__(self, event: EventModel) -> None:
+        if self.timeout is None:
+            await self.handler(event)
+        else:
+            await asyncio.wait_for(self.handler(event), self.timeout)
+
+
+class HookExecutor(BackgroundWorker):
+    """Run background event hooks outside of the dispatching request"""
+
+    queue_size: int = 1000
+    max_tasks: int = 32
+    retry_delay: float = 1
+
+    def initialize(self) -> None:
+        # Calls of hooks with free capacity, waiting for an executor slot
+        self.queue: asyncio.Queue[tuple[EventHook, EventModel, int]] = asyncio.Queue()
+        self.queued = 0
+        self.hooks: dict[tuple[str, str], EventHook] = {}
+        self.tasks: set[asyncio.Task[None]] = set()
+
+    def submit(self, hook: EventHook, event: EventModel, attempt: int = 0) -> None:
+        self.hooks[(hook.topic, hook.name)] = hook
+        if self.queued >= self.queue_size:
+            hook.dropped += 1
+            logging.warning(f"Hook queue is full. Dropping {hook.name} {event.topic}")
+            return
+        self.queued += 1
+        hook.pending.append((event, attempt))
+        self._dispatch(hook)
+
+    def _dispatch(self, hook: EventHook) -> None:
+        """Pass pending calls of the hook to the executor up to its capacity"""
+        while hook.pending and hook.active < hook.concurrency:
+            event, attempt = hook.pending.popleft()
+            hook.active += 1
+            self.queued -= 1
+            self.queue.put_nowait((hook, event, attempt))
+
+    async def execute(
+        self,
+        hook: EventHook,
+        event: EventModel,
+        attempt: int = 0,
+    ) -> None:
+        """Call the hook and count the result.
+
+        Failed calls are queued again after a delay, so retries
+        do not occupy the hook capacity nor the executor slots.
+        """
+        try:
+            await hook(event)
+        except Exception as e:
+            error = e
+        else:
+            hook.processed += 1
+            return
+
+        if attempt < hook.max_retries:
+            hook.retried += 1
+            asyncio.get_running_loop().call_later(
+                self.retry_delay * (attempt + 1),
+                self.submit,
+                hook,
+                event,
+                attempt + 1,
+            )
+            return
+
+        hook.failed += 1
+        if isinstance(error, asyncio.TimeoutError):
+            error = Exception(f"Timed out after {hook.timeout}s")
+        logging.warning(f"Error in event handler {hook.name}: {error}")
+
+    async def run(self) -> None:
+        slots = asyncio.Semaphore(self.max_tasks)
+
+        async def run_task(hook: EventHook, event: EventModel, attempt: int) -> None:
+            try:
+                await self.execute(hook, event, attempt)
+            finally:
+                slots.release()
+                hook.active -= 1
+                self._dispatch(hook)
+
+        while True:
+            hook, event, attempt = await self.queue.get()
+            await slots.acquire()
+            task = asyncio.create_task(run_task(hook, event, attempt))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def finalize(self) -> None:
+        # Let running hooks finish (they are limited by their timeouts).
+        # Queued ones stay in the queue until the worker is restarted.
+        if self.tasks:
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+
+    def render_prometheus(self, prefix: str = "ayon") -> str:
+        queued = self.queued + self.queue.qsize()
+        result = f"{prefix}_event_hooks_queued {queued}\n"
+        for (topic, name), hook in sorted(self.hooks.items()):
+            labels = f'hook="{name}",topic="{topic}"'
+            for metric, value in (
+                ("processed", hook.processed),
+                ("failed", hook.failed),
+                ("retried", hook.retried),
+                ("dropped", hook.dropped),
+            ):
+                result += f"{prefix}_event_hooks_{metric}{{{labels}}} {value}\n"
+        return result
+
+
+hook_executor = HookExecutor()
+
+
+async def run_hooks(hooks: list[EventHook], event: EventModel) -> None:
+    for hook in hooks:
+        if hook.background and hook_executor.is_running:
+            hook_executor.submit(hook, event)
+            continue
+        try:
+            await hook(event)
+        except Exception as e:
+            logging.debug(f"Error in event handler: {e}")
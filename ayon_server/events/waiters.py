@@ -0,0 +1,75 @@
+"""Wake up enroll requests waiting for new jobs.
+
+Service workers may ask the enroll endpoint to wait for a job instead
+of polling it repeatedly. A waiting request registers an `EnrollWaiter`
+and sleeps until an event, which could create a new job, is published
+to the Redis channel (received by the local cache listener), or until
+its timeout expires. Then it tries to enroll again.
+
+Waiters are matched by topics and statuses only, so a wake-up does not
+guarantee a job (the event may not pass the filter or may be taken by
+another worker). Enrolling again is cheap thanks to the watermarks.
+"""
+
+import asyncio
+import re
+from typing import Any
+
+from ayon_server.events.watermarks import REOPENED_STATUSES
+from ayon_server.lib.local_cache import LocalCache
+
+# How long to sleep between enroll attempts while the listener
+# is not subscribed to the channel and waiters are not notified
+POLL_INTERVAL = 2
+
+
+def topic_regex(pattern: str) -> re.Pattern[str]:
+    """Convert SQL LIKE topic pattern to a regular expression."""
+    return re.compile(
+        "".join(".*" if c == "%" else re.escape(c) for c in pattern) + "$"
+    )
+
+
+class EnrollWaiter:
+    waiters: set["EnrollWaiter"] = set()
+
+    def __init__(self, source_topic: str | list[str], target_topic: str):
+        if isinstance(source_topic, str):
+            source_topic = [source_topic]
+        self.source_topics = [topic_regex(topic) for topic in source_topic]
+        self.target_topic = target_topic
+        self.event = asyncio.Event()
+
+    def __enter__(self) -> "EnrollWaiter":
+        self.waiters.add(self)
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.waiters.discard(self)
+
+    def matches(self, message: dict[str, Any]) -> bool:
+        topic = message.get("topic") or ""
+        status = message.get("status")
+        if status == "finished":
+            return any(pattern.match(topic) for pattern in self.source_topics)
+        if status in REOPENED_STATUSES and message.get("dependsOn"):
+            return topic == self.target_topic
+        return False
+
+    async def wait(self, timeout: float) -> bool:
+        """Wait for a matching event. Return False on timeout."""
+        if not LocalCache.enabled:
+            await asyncio.sleep(min(timeout, POLL_INTERVAL))
+            return False
+        try:
+            await asyncio.wait_for(self.event.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    @classmethod
+    def notify(cls, message: dict[str, Any]) -> None:
+        """Wake up waiters matching an event from the Redis channel"""
+        for waiter in cls.waiters:
+            if not waiter.event.is_set() and waiter.matches(message):
+                waiter.event.set()
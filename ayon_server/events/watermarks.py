@@ -0,0 +1,117 @@
+"""Enroll watermarks.
+
+Enrolling for a job looks for the oldest source event, which has not
+been processed yet. Without a starting point, every enroll call would
+walk through the whole history of processed events first.
+
+A watermark is stored for every distinct enroll request (topics,
+sender, filter...): the creation time of the oldest source event,
+which was still a candidate during the last call. Source events older
+than the watermark are all processed (or taken by another worker).
+
+Events may become candidates again: a source event may be finished
+long after it has been created and a target event may fail or be
+restarted. `lower_enroll_watermarks` is called from `EventStream.update`
+on status changes and moves affected watermarks back.
+"""
+
+import datetime
+from typing import Any
+
+from ayon_server.lib.postgres import Connection, Postgres
+
+# Events are inserted with created_at set at the beginning of the
+# transaction, so an event committed a moment later may be slightly
+# older than the watermark. Scanning a bit before the watermark
+# covers these.
+WATERMARK_MARGIN = datetime.timedelta(minutes=1)
+
+# Statuses making the source event of a target event a candidate again
+REOPENED_STATUSES = ("failed", "restarted", "pending")
+
+
+async def get_enroll_watermark(key: str) -> datetime.datetime | None:
+    res = await Postgres.fetch(
+        "SELECT watermark FROM public.enroll_watermarks WHERE key = $1",
+        key,
+    )
+    if not res:
+        return None
+    return res[0]["watermark"]
+
+
+async def set_enroll_watermark(
+    key: str,
+    source_topics: list[str],
+    target_topic: str,
+    old_value: datetime.datetime | None,
+    new_value: datetime.datetime,
+    transaction: Connection | None = None,
+) -> None:
+    """Advance the watermark, unless it was changed since it was read.
+
+    A watermark lowered by a concurrent status change must not
+    be overwritten by a value computed from an older snapshot.
+    """
+    conn = transaction or Postgres
+    await conn.execute(
+        """
+        INSERT INTO public.enroll_watermarks
+            (key, source_topics, target_topic, watermark, updated_at)
+        VALUES ($1, $2, $3, $5, NOW())
+        ON CONFLICT (key) DO UPDATE
+        SET watermark = EXCLUDED.watermark, updated_at = NOW()
+        WHERE enroll_watermarks.watermark IS NOT DISTINCT FROM $4
+        """,
+        key,
+        source_topics,
+        target_topic,
+        old_value,
+        new_value,
+    )
+
+
+async def lower_enroll_watermarks(
+    event: dict[str, Any],
+    transaction: Connection | None = None,
+) -> None:
+    """Move watermarks back to include an event, which status has changed.
+
+    - finished event may become a source of new jobs
+    - failed, restarted (or otherwise reopened) target event makes
+      its source event a candidate again
+    """
+    conn = transaction or Postgres
+    if event["status"] == "finished":
+        await conn.execute(
+            """
+            UPDATE public.enroll_watermarks SET watermark = $2
+            WHERE watermark > $2 AND $1 LIKE ANY(source_topics)
+            """,
+            event["topic"],
+            event["created_at"],
+        )
+
+    elif event["status"] in REOPENED_STATUSES and event.get("depends_on"):
+        await conn.execute(
+            """
+            UPDATE public.enroll_watermarks AS w
+            SET watermark = e.created_at
+            FROM public.events AS e
+            WHERE e.id = $2
+            AND w.target_topic = $1
+            AND w.watermark > e.created_at
+            """,
+            event["topic"],
+            event["depends_on"],
+        )
+
+
+async def clear_enroll_watermarks() -> None:
+    """Delete watermarks of enroll requests, which are no longer used"""
+    await Postgres.execute(
+        """
+        DELETE FROM public.enroll_watermarks
+        WHERE updated_at < NOW() - INTERVAL '1 day'
+        """
+    )
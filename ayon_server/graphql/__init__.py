@@ -44,8 +44,18 @@ from ayon_server.graphql.resolvers.links import get_links
 from ayon_server.graphql.resolvers.projects import get_project, get_projects
 from ayon_server.graphql.resolvers.users import get_user, get_users
 from ayon_server.graphql.types import Info
+from ayon_server.lib.entity_cache import EntityCache
 from ayon_server.lib.postgres import Postgres
 
+# Loaders backed by the shared entity cache (when enabled in the config).
+# Latest versions are not cached, as they change with every new version.
+cached_folder_loader = EntityCache.wrap("folder", folder_loader)
+cached_product_loader = EntityCache.wrap("product", product_loader)
+cached_task_loader = EntityCache.wrap("task", task_loader)
+cached_version_loader = EntityCache.wrap("version", version_loader)
+cached_user_loader = EntityCache.wrap("user", user_loader)
+cached_workfile_loader = EntityCache.wrap("workfile", workfile_loader)
+
 
 async def graphql_get_context(user: CurrentUser) -> dict[str, Any]:
     """Get the current request context"""
@@ -62,13 +72,13 @@ async def graphql_get_context(user: CurrentUser) -> dict[str, Any]:
         "project_from_record": project_from_record,
         "workfile_from_record": workfile_from_record,
         # Data loaders
-        "folder_loader": DataLoader(load_fn=folder_loader),
-        "product_loader": DataLoader(load_fn=product_loader),
-        "task_loader": DataLoader(load_fn=task_loader),
-        "version_loader": DataLoader(load_fn=version_loader),
+        "folder_loader": DataLoader(load_fn=cached_folder_loader),
+        "product_loader": DataLoader(load_fn=cached_product_loader),
+        "task_loader": DataLoader(load_fn=cached_task_loader),
+        "version_loader": DataLoader(load_fn=cached_version_loader),
         "latest_version_loader": DataLoader(load_fn=latest_version_loader),
-        "user_loader": DataLoader(load_fn=user_loader),
-        "workfile_loader": DataLoader(load_fn=workfile_loader),
+        "user_loader": DataLoader(load_fn=cached_user_loader),
+        "workfile_loader": DataLoader(load_fn=cached_workfile_loader),
         # Other
         "activities_resolver": get_activities,
         "links_resolver": get_links,
@@ -4,7 +4,9 @@ because they don't have access to the context object, which we
 need for access control.
 """
 
-from typing import Any, NewType
+import asyncio
+import functools
+from typing import Any, Awaitable, Callable, NewType
 
 from ayon_server.exceptions import AyonException
 from ayon_server.lib.postgres import Postgres
@@ -12,6 +14,7 @@ from ayon_server.utils import SQLTool
 
 KeyType = NewType("KeyType", tuple[str, str])
 KeysType = NewType("KeysType", list[KeyType])
+LoaderType = Callable[[list[KeyType]], Awaitable[list[dict[str, Any] | None]]]
 
 
 def get_project_name(keys: list[KeyType]) -> str:
@@ -21,10 +24,35 @@ def get_project_name(keys: list[KeyType]) -> str:
     return project_names.pop()
 
 
+def group_by_project(loader: LoaderType) -> LoaderType:
+    """Allow a single-project loader to load keys from multiple projects.
+
+    Keys are grouped by project name, the groups are loaded concurrently
+    (one query per project schema) and the results are returned
+    in the order of the keys.
+    """
+
+    @functools.wraps(loader)
+    async def wrapper(keys: list[KeyType]) -> list[dict[str, Any] | None]:
+        groups: dict[str, list[KeyType]] = {}
+        for key in keys:
+            groups.setdefault(key[0], []).append(key)
+        if len(groups) < 2:
+            return await loader(keys)
+
+        results = await asyncio.gather(*(loader(group) for group in groups.values()))
+        result_dict: dict[KeyType, dict[str, Any] | None] = {}
+        for group, rows in zip(groups.values(), results):
+            result_dict.update(zip(group, rows))
+        return [result_dict[k] for k in keys]
+
+    return wrapper
+
+
+@group_by_project
 async def folder_loader(keys: list[KeyType]) -> list[dict[str, Any] | None]:
     """Load a list of folders by their ids (used as a dataloader).
-    keys must be a list of tuples (project_name, folder_id) and project_name
-    values must be the same!
+    keys must be a list of tuples (project_name, folder_id).
     """
 
     result_dict: dict[KeyType, Any] = {k: None for k in keys}
@@ -52,14 +80,14 @@ async def folder_loader(keys: list[KeyType]) -> list[dict[str, Any] | None]:
             project_{project_name}.folders as folders
 
         LEFT JOIN
-            project_{project_name}.hierarchy as hierarchy
-            ON hierarchy.id = folders.id
+            project_{project_name}.entity_paths as hierarchy
+            ON hierarchy.entity_id = folders.id
         LEFT JOIN
             project_{project_name}.exported_attributes AS ex
             ON folders.parent_id = ex.folder_id
         INNER JOIN
             public.projects AS pr
-            ON pr.name ILIKE '{project_name}'
+            ON pr.name = '{project_name}'
 
         WHERE folders.id IN {SQLTool.id_array([k[1] for k in keys])}
 
@@ -73,10 +101,10 @@ async def folder_loader(keys: list[KeyType]) -> list[dict[str, Any] | None]:
     return [result_dict[k] for k in keys]
 
 
+@group_by_project
 async def product_loader(keys: list[KeyType]) -> list[dict[str, Any] | None]:
     """Load a list of products by their ids (used as a dataloader).
-    keys must be a list of tuples (project_name, product_id) and project_name
-    values must be the same!
+    keys must be a list of tuples (project_name, product_id).
     """
 
     result_dict = {k: None for k in keys}
@@ -93,10 +121,10 @@ async def product_loader(keys: list[KeyType]) -> list[dict[str, Any] | None]:
     return [result_dict[k] for k in keys]
 
 
+@group_by_project
 async def task_loader(keys: list[KeyType]) -> list[dict[str, Any] | None]:
     """Load a list of tasks by their ids (used as a dataloader).
-    keys must be a list of tuples (project_name, task_id) and project_name
-    values must be the same!
+    keys must be a list of tuples (project_name, task_id).
     """
 
     result_dict = {k: None for k in keys}
@@ -133,10 +161,10 @@ async def task_loader(keys: list[KeyType]) -> list[dict[str, Any] | None]:
     return [result_dict[k] for k in keys]
 
 
+@group_by_project
 async def workfile_loader(keys: list[KeyType]) -> list[dict[str, Any] | None]:
     """Load a list of workfiles by their ids (used as a dataloader).
-    keys must be a list of tuples (project_name, workfile_id) and project_name
-    values must be the same!
+    keys must be a list of tuples (project_name, workfile_id).
     """
 
     # TODO: query parent tasks?
@@ -155,10 +183,10 @@ async def workfile_loader(keys: list[KeyType]) -> list[dict[str, Any] | None]:
     return [result_dict[k] for k in keys]
 
 
+@group_by_project
 async def version_loader(keys: list[KeyType]) -> list[dict[str, Any] | None]:
     """Load a list of versions by their ids (used as a dataloader).
-    keys must be a list of tuples (project_name, version_id) and project_name
-    values must be the same!
+    keys must be a list of tuples (project_name, version_id).
     """
 
     result_dict = {k: None for k in keys}
@@ -198,6 +226,7 @@ async def version_loader(keys: list[KeyType]) -> list[dict[str, Any] | None]:
     return [result_dict[k] for k in keys]
 
 
+@group_by_project
 async def latest_version_loader(keys: list[KeyType]) -> list[dict[str, Any] | None]:
     """Load a list of latest versions of given products"""
 
@@ -7,10 +7,10 @@ from ayon_server.graphql.resolvers.common import (
     ARGFirst,
     ARGLast,
     FieldInfo,
-    create_pagination,
     resolve,
 )
 from ayon_server.graphql.types import Info
+from ayon_server.helpers.pagination import create_pagination
 from ayon_server.types import validate_name_list
 from ayon_server.utils import SQLTool
 
@@ -143,4 +143,6 @@ async def get_activities(
         first,
         last,
         context=info.context,
+        after=after,
+        before=before,
     )
@@ -5,12 +5,16 @@ import strawberry
 from strawberry.arguments import StrawberryArgumentAnnotation
 
 from ayon_server.access.utils import folder_access_list
+from ayon_server.entities.core import attribute_library
 from ayon_server.exceptions import ForbiddenException
 from ayon_server.graphql.types import Info, PageInfo
+from ayon_server.helpers.pagination import (
+    DEFAULT_PAGE_SIZE,
+    get_page_flags,
+    typed_attrib_key,
+)
 from ayon_server.lib.postgres import Postgres
 
-DEFAULT_PAGE_SIZE = 100
-
 
 @strawberry.enum
 class HasLinksFilter(Enum):
@@ -114,52 +118,13 @@ async def create_folder_access_list(root, info) -> list[str] | None:
     return await folder_access_list(user, project_name)
 
 
-def create_pagination(
-    order_by: list[str],
-    first: int | None = None,
-    after: str | None = None,
-    last: int | None = None,
-    before: str | None = None,
-    need_cursor: bool = True,
-) -> tuple[str, list[str], str]:
-    """
-    Create pagination query and arguments.
-    returns a tuple of
-      - pagination query (ORDER BY... part of the query)
-      - additional conditions (WHERE... part of the query)
-      - cursor (to add to SELECT... part of the query)
-    """
-    pagination = ""
-    sql_conditions = []
-
-    assert order_by, "Order by must not be empty"
-
-    cursor: str  # put to SELECT clause (should be 'SOMETHING as cursor')
-
-    if len(order_by) == 1 or not need_cursor:
-        cursor = f"{order_by[0]}"
-    else:
-        ccols = [f"{col}::text" for col in order_by]
-        cursor = f"({'||'.join(ccols)})"
-
-    if not (last or first):
-        first = 100
-
-    if after:
-        curval = after
-
-    elif before:
-        curval = before
-
-    if first:
-        pagination += f"ORDER BY cursor ASC LIMIT {first}"
-        if after:
-            sql_conditions.append(f"{cursor} > '{curval}'")
-    elif last:
-        pagination += f"ORDER BY cursor DESC LIMIT {last}"
-        if before:
-            sql_conditions.append(f"{cursor} < '{curval}'")
-    return pagination, sql_conditions, f"{cursor} AS cursor"
+def attrib_sort_key(table: str, name: str) -> str:
+    """Return a sort key of an attribute, typed by its definition"""
+    try:
+        attr_type = attribute_library.by_name(name).get("type")
+    except KeyError:
+        attr_type = None
+    return typed_attrib_key(table, name, attr_type)
 
 
 R = TypeVar("R")
@@ -174,8 +139,15 @@ async def resolve(
     first: int | None = None,
     last: int | None = None,
     context: dict[str, Any] | None = None,
+    after: str | None = None,
+    before: str | None = None,
 ) -> R:
-    """Return a connection object from a query."""
+    """Return a connection object from a query.
+
+    When the query returns more rows than requested, the extra row
+    is used to tell whether there is another page in that direction.
+    `after` and `before` cursors mean there are rows in the other one.
+    """
 
     if first is not None:
         count = first
@@ -185,32 +157,27 @@ async def resolve(
         count = first = DEFAULT_PAGE_SIZE
 
     edges: list[Any] = []
+    has_more = False
     async for record in Postgres.iterate(query):
         try:
             node = node_type.from_record(project_name, record, context=context)
         except ForbiddenException:
             continue
-        cursor = record["cursor"]
-        edges.append(edge_type(node=node, cursor=cursor))
         if count and count == len(edges):
+            has_more = True
             break
+        cursor = record["cursor"]
+        edges.append(edge_type(node=node, cursor=cursor))
 
-    has_next_page = False
-    has_previous_page = False
-    start_cursor = None
-    end_cursor = None
-
-    if first:
-        has_next_page = len(edges) >= first
-        has_previous_page = False  # TODO
-        start_cursor = edges[0].cursor if edges else None
-        end_cursor = edges[-1].cursor if edges else None
-    elif last:
-        has_next_page = False  # TODO
-        has_previous_page = len(edges) >= last
-        start_cursor = edges[0].cursor if edges else None
-        end_cursor = edges[-1].cursor if edges else None
-        # edges.reverse()
+    start_cursor = edges[0].cursor if edges else None
+    end_cursor = edges[-1].cursor if edges else None
+    has_next_page, has_previous_page = get_page_flags(
+        has_more,
+        first=first,
+        last=last,
+        after=after,
+        before=before,
+    )
 
     page_info = PageInfo(
         has_next_page=has_next_page,
@@ -15,10 +15,10 @@ from ayon_server.graphql.resolvers.common import (
     ARGLast,
     FieldInfo,
     argdesc,
-    create_pagination,
     resolve,
 )
 from ayon_server.graphql.types import Info
+from ayon_server.helpers.pagination import create_pagination
 from ayon_server.types import (
     validate_name_list,
     validate_topic_list,
@@ -146,4 +146,6 @@ async def get_events(
         first,
         last,
         context=info.context,
+        after=after,
+        before=before,
     )
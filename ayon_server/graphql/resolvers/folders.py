@@ -1,5 +1,6 @@
 from typing import Annotated
 
+from ayon_server.access.path_access import compile_path_access
 from ayon_server.entities.core import attribute_library
 from ayon_server.graphql.connections import FoldersConnection
 from ayon_server.graphql.edges import FolderEdge
@@ -14,13 +15,14 @@ from ayon_server.graphql.resolvers.common import (
     AtrributeFilterInput,
     FieldInfo,
     argdesc,
+    attrib_sort_key,
     create_folder_access_list,
-    create_pagination,
     get_has_links_conds,
     resolve,
     sortdesc,
 )
 from ayon_server.graphql.types import Info
+from ayon_server.helpers.pagination import create_pagination
 from ayon_server.types import (
     validate_name,
     validate_name_list,
@@ -126,12 +128,10 @@ async def get_folders(
         """,
         f"""
         INNER JOIN public.projects AS pr
-        ON pr.name ILIKE '{project_name}'
+        ON pr.name = '{project_name}'
         """,
     ]
-    sql_group_by = ["folders.id", "pr.attrib", "ex.attrib"]
     sql_conditions = []
-    sql_having = []
 
     use_hierarchy = (
         (paths is not None)
@@ -142,47 +142,40 @@ async def get_folders(
     access_list = await create_folder_access_list(root, info)
 
     if access_list is not None:
-        sql_conditions.append(
-            f"hierarchy.path like ANY ('{{ {','.join(access_list)} }}')"
-        )
+        sql_conditions.append(compile_path_access(access_list).sql_condition())
         use_hierarchy = True
 
-    # We need to use children-join
-    if (has_children is not None) or fields.has_any("childount", "hasChildren"):
-        sql_columns.append("COUNT(children.id) AS child_count")
-        sql_joins.append(
-            f"""
-            LEFT JOIN project_{project_name}.folders AS children
-            ON folders.id = children.parent_id
-            """
-        )
+    # Counts are maintained in the folder_counts table (see helpers.folder_counts)
+    # and joined only when they are requested or filtered by
+    use_counts = False
+
+    if (has_children is not None) or fields.has_any("childCount", "hasChildren"):
+        sql_columns.append("COALESCE(counts.child_count, 0) AS child_count")
+        use_counts = True
 
     if (has_products is not None) or fields.has_any("productCount", "hasProducts"):
-        sql_columns.append("COUNT(products.id) AS product_count")
-        sql_joins.append(
-            f"""
-            LEFT JOIN project_{project_name}.products AS products
-            ON folders.id = products.folder_id
-            """
-        )
+        sql_columns.append("COALESCE(counts.product_count, 0) AS product_count")
+        use_counts = True
 
     if (has_tasks is not None) or fields.has_any("taskCount", "hasTasks"):
-        sql_columns.append("COUNT(tasks.id) AS task_count")
+        sql_columns.append("COALESCE(counts.task_count, 0) AS task_count")
+        use_counts = True
+
+    if use_counts:
         sql_joins.append(
             f"""
-            LEFT JOIN project_{project_name}.tasks AS tasks
-            ON folders.id = tasks.folder_id
+            LEFT JOIN project_{project_name}.folder_counts AS counts
+            ON folders.id = counts.folder_id
             """
         )
 
     # We need to join hierarchy view
     if use_hierarchy:
         sql_columns.append("hierarchy.path AS path")
-        sql_group_by.append("hierarchy.path")
         sql_joins.append(
             f"""
-            INNER JOIN project_{project_name}.hierarchy AS hierarchy
-            ON folders.id = hierarchy.id
+            INNER JOIN project_{project_name}.entity_paths AS hierarchy
+            ON folders.id = hierarchy.entity_id
             """
         )
 
@@ -270,17 +263,25 @@ async def get_folders(
         sql_conditions.append(f"tags @> {SQLTool.array(tags, curly=True)}")
 
     if has_products is not None:
-        sql_having.append(
-            "COUNT(products.id) > 0" if has_products else "COUNT(products.id) = 0"
+        sql_conditions.append(
+            "counts.product_count > 0"
+            if has_products
+            else "COALESCE(counts.product_count, 0) = 0"
         )
 
     if has_children is not None:
-        sql_having.append(
-            "COUNT(children.id) > 0" if has_children else "COUNT(children.id) = 0"
+        sql_conditions.append(
+            "counts.child_count > 0"
+            if has_children
+            else "COALESCE(counts.child_count, 0) = 0"
         )
 
     if has_tasks is not None:
-        sql_having.append("COUNT(tasks.id) > 0" if has_tasks else "COUNT(tasks.id) = 0")
+        sql_conditions.append(
+            "counts.task_count > 0"
+            if has_tasks
+            else "COALESCE(counts.task_count, 0) = 0"
+        )
 
     if has_links is not None:
         sql_conditions.extend(
@@ -330,7 +331,7 @@ async def get_folders(
         if sort_by in SORT_OPTIONS:
             order_by.insert(0, SORT_OPTIONS[sort_by])
         elif sort_by.startswith("attrib."):
-            order_by.insert(0, f"folders.attrib->>'{sort_by[7:]}'")
+            order_by.insert(0, attrib_sort_key("folders", sort_by[7:]))
         else:
             raise ValueError(f"Invalid sort_by value: {sort_by}")
 
@@ -367,8 +368,6 @@ async def get_folders(
         FROM project_{project_name}.folders AS folders
         {" ".join(sql_joins)}
         {SQLTool.conditions(sql_conditions)}
-        GROUP BY {",".join(sql_group_by)}
-        {SQLTool.conditions(sql_having).replace("WHERE", "HAVING", 1)}
         {pagination}
     """
 
@@ -381,6 +380,8 @@ async def get_folders(
         first,
         last,
         context=info.context,
+        after=after,
+        before=before,
     )
 
 
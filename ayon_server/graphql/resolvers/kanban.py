@@ -137,7 +137,7 @@ async def get_kanban(
                 ) AS has_reviewables
                 FROM {project_schema}.tasks t
                 JOIN {project_schema}.folders f ON f.id = t.folder_id
-                JOIN {project_schema}.hierarchy h ON h.id = f.id
+                JOIN {project_schema}.entity_paths h ON h.entity_id = f.id
 
                 {SQLTool.conditions(sub_query_conds)}
         """
@@ -1,5 +1,6 @@
 from typing import Annotated
 
+from ayon_server.access.path_access import compile_path_access
 from ayon_server.access.utils import folder_access_list
 from ayon_server.graphql.connections import ProductsConnection
 from ayon_server.graphql.edges import ProductEdge
@@ -13,12 +14,13 @@ from ayon_server.graphql.resolvers.common import (
     ARGLast,
     FieldInfo,
     argdesc,
-    create_pagination,
+    attrib_sort_key,
     get_has_links_conds,
     resolve,
     sortdesc,
 )
 from ayon_server.graphql.types import Info
+from ayon_server.helpers.pagination import create_pagination
 from ayon_server.types import validate_name_list, validate_status_list
 from ayon_server.utils import SQLTool
 
@@ -151,9 +153,7 @@ async def get_products(
         user = info.context["user"]
         access_list = await folder_access_list(user, project_name)
         if access_list is not None:
-            sql_conditions.append(
-                f"hierarchy.path like ANY ('{{ {','.join(access_list)} }}')"
-            )
+            sql_conditions.append(compile_path_access(access_list).sql_condition())
 
     #
     # Join with folders if parent folder is requested
@@ -199,7 +199,7 @@ async def get_products(
                     """,
                     f"""
                     INNER JOIN public.projects AS pr
-                    ON pr.name ILIKE '{project_name}'
+                    ON pr.name = '{project_name}'
                     """,
                 ]
             )
@@ -220,8 +220,8 @@ async def get_products(
             sql_columns.append("hierarchy.path AS _folder_path")
             sql_joins.append(
                 f"""
-                INNER JOIN project_{project_name}.hierarchy AS hierarchy
-                ON folders.id = hierarchy.id
+                INNER JOIN project_{project_name}.entity_paths AS hierarchy
+                ON folders.id = hierarchy.entity_id
                 """
             )
 
@@ -250,7 +250,7 @@ async def get_products(
         if sort_by in SORT_OPTIONS:
             order_by.insert(0, SORT_OPTIONS[sort_by])
         elif sort_by.startswith("attrib."):
-            order_by.insert(0, f"products.attrib->>'{sort_by[7:]}'")
+            order_by.insert(0, attrib_sort_key("products", sort_by[7:]))
         else:
             raise ValueError(f"Invalid sort_by value: {sort_by}")
 
@@ -292,6 +292,8 @@ async def get_products(
         first,
         last,
         context=info.context,
+        after=after,
+        before=before,
     )
 
 
@@ -11,10 +11,10 @@ from ayon_server.graphql.resolvers.common import (
     ARGLast,
     FieldInfo,
     argdesc,
-    create_pagination,
     resolve,
 )
 from ayon_server.graphql.types import Info
+from ayon_server.helpers.pagination import create_pagination
 from ayon_server.types import validate_name
 from ayon_server.utils import SQLTool
 
@@ -42,11 +42,11 @@ async def get_projects(
     sql_conditions = []
     if name is not None:
         validate_name(name)
-        sql_conditions.append(f"projects.name ILIKE '{name}'")
+        sql_conditions.append(f"LOWER(projects.name) = '{name.lower()}'")
 
     if code is not None:
         validate_name(code)
-        sql_conditions.append(f"projects.code ILIKE '{code}'")
+        sql_conditions.append(f"LOWER(projects.code) = '{code.lower()}'")
 
     fields = FieldInfo(info, ["projects.edges.node", "project"])
 
@@ -94,6 +94,8 @@ async def get_projects(
         first,
         last,
         context=info.context,
+        after=after,
+        before=before,
     )
 
 
@@ -1,5 +1,6 @@
 from typing import Annotated
 
+from ayon_server.access.path_access import compile_path_access
 from ayon_server.graphql.connections import RepresentationsConnection
 from ayon_server.graphql.edges import RepresentationEdge
 from ayon_server.graphql.nodes.representation import RepresentationNode
@@ -12,11 +13,11 @@ from ayon_server.graphql.resolvers.common import (
     ARGLast,
     argdesc,
     create_folder_access_list,
-    create_pagination,
     get_has_links_conds,
     resolve,
 )
 from ayon_server.graphql.types import Info
+from ayon_server.helpers.pagination import create_pagination
 from ayon_server.types import validate_name_list, validate_status_list
 from ayon_server.utils import SQLTool
 
@@ -112,9 +113,7 @@ async def get_representations(
 
     access_list = await create_folder_access_list(root, info)
     if access_list is not None:
-        sql_conditions.append(
-            f"hierarchy.path like ANY ('{{ {','.join(access_list)} }}')"
-        )
+        sql_conditions.append(compile_path_access(access_list).sql_condition())
 
         sql_joins.extend(
             [
@@ -127,8 +126,8 @@ async def get_representations(
                 ON products.id = versions.product_id
                 """,
                 f"""
-                INNER JOIN project_{project_name}.hierarchy AS hierarchy
-                ON hierarchy.id = products.folder_id
+                INNER JOIN project_{project_name}.entity_paths AS hierarchy
+                ON hierarchy.entity_id = products.folder_id
                 """,
             ]
         )
@@ -164,6 +163,8 @@ async def get_representations(
         first,
         last,
         context=info.context,
+        after=after,
+        before=before,
     )
 
 
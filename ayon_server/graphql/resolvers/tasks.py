@@ -1,5 +1,6 @@
 from typing import Annotated
 
+from ayon_server.access.path_access import compile_path_access
 from ayon_server.entities.core import attribute_library
 from ayon_server.graphql.connections import TasksConnection
 from ayon_server.graphql.edges import TaskEdge
@@ -14,13 +15,14 @@ from ayon_server.graphql.resolvers.common import (
     AtrributeFilterInput,
     FieldInfo,
     argdesc,
+    attrib_sort_key,
     create_folder_access_list,
-    create_pagination,
     get_has_links_conds,
     resolve,
     sortdesc,
 )
 from ayon_server.graphql.types import Info
+from ayon_server.helpers.pagination import create_pagination
 from ayon_server.types import validate_name_list, validate_status_list
 from ayon_server.utils import SQLTool
 
@@ -140,8 +142,8 @@ async def get_tasks(
             sql_cte.append(
                 f"""
                 top_folder_paths AS (
-                    SELECT path FROM project_{project_name}.hierarchy
-                    WHERE id IN {SQLTool.id_array(folder_ids)}
+                    SELECT path FROM project_{project_name}.entity_paths
+                    WHERE entity_id IN {SQLTool.id_array(folder_ids)}
                 )
                 """
             )
@@ -149,14 +151,14 @@ async def get_tasks(
             sql_cte.append(
                 f"""
                 child_folder_ids AS (
-                    SELECT id FROM project_{project_name}.hierarchy
+                    SELECT entity_id AS id FROM project_{project_name}.entity_paths
                     WHERE EXISTS (
                         SELECT 1
                         FROM top_folder_paths
-                        WHERE project_{project_name}.hierarchy.path
+                        WHERE project_{project_name}.entity_paths.path
                         LIKE top_folder_paths.path || '/%'
                     )
-                    OR project_{project_name}.hierarchy.path = ANY (
+                    OR project_{project_name}.entity_paths.path = ANY (
                         SELECT path FROM top_folder_paths
                     )
                 )
@@ -218,9 +220,7 @@ async def get_tasks(
 
     access_list = await create_folder_access_list(root, info)
     if access_list is not None:
-        sql_conditions.append(
-            f"hierarchy.path like ANY ('{{ {','.join(access_list)} }}')"
-        )
+        sql_conditions.append(compile_path_access(access_list).sql_condition())
 
     if attributes:
         for attribute_input in attributes:
@@ -285,8 +285,8 @@ async def get_tasks(
             sql_columns.append("hierarchy.path AS _folder_path")
             sql_joins.append(
                 f"""
-                LEFT JOIN project_{project_name}.hierarchy AS hierarchy
-                ON folders.id = hierarchy.id
+                LEFT JOIN project_{project_name}.entity_paths AS hierarchy
+                ON folders.id = hierarchy.entity_id
                 """
             )
 
@@ -305,7 +305,7 @@ async def get_tasks(
                     """,
                     f"""
                     INNER JOIN public.projects AS pr
-                    ON pr.name ILIKE '{project_name}'
+                    ON pr.name = '{project_name}'
                     """,
                 ]
             )
@@ -326,7 +326,7 @@ async def get_tasks(
         if sort_by in SORT_OPTIONS:
             order_by.insert(0, SORT_OPTIONS[sort_by])
         elif sort_by.startswith("attrib."):
-            order_by.insert(0, f"tasks.attrib->>'{sort_by[7:]}'")
+            order_by.insert(0, attrib_sort_key("tasks", sort_by[7:]))
         else:
             raise ValueError(f"Invalid sort_by value: {sort_by}")
 
@@ -375,6 +375,8 @@ async def get_tasks(
         first,
         last,
         context=info.context,
+        after=after,
+        before=before,
     )
 
 
@@ -10,10 +10,10 @@ from ayon_server.graphql.resolvers.common import (
     ARGFirst,
     ARGLast,
     argdesc,
-    create_pagination,
     resolve,
 )
 from ayon_server.graphql.types import Info
+from ayon_server.helpers.pagination import create_pagination
 from ayon_server.types import validate_name_list, validate_user_name
 from ayon_server.utils import SQLTool
 
@@ -120,6 +120,8 @@ async def get_users(
         first,
         last,
         context=info.context,
+        after=after,
+        before=before,
     )
 
 
@@ -1,5 +1,6 @@
 from typing import Annotated
 
+from ayon_server.access.path_access import compile_path_access
 from ayon_server.graphql.connections import VersionsConnection
 from ayon_server.graphql.edges import VersionEdge
 from ayon_server.graphql.nodes.version import VersionNode
@@ -12,13 +13,14 @@ from ayon_server.graphql.resolvers.common import (
     ARGLast,
     FieldInfo,
     argdesc,
+    attrib_sort_key,
     create_folder_access_list,
-    create_pagination,
     get_has_links_conds,
     resolve,
     sortdesc,
 )
 from ayon_server.graphql.types import Info
+from ayon_server.helpers.pagination import create_pagination
 from ayon_server.types import validate_name_list, validate_status_list
 from ayon_server.utils import SQLTool
 
@@ -193,9 +195,7 @@ async def get_versions(
 
     access_list = await create_folder_access_list(root, info)
     if access_list is not None:
-        sql_conditions.append(
-            f"hierarchy.path like ANY ('{{ {','.join(access_list)} }}')"
-        )
+        sql_conditions.append(compile_path_access(access_list).sql_condition())
 
         sql_joins.extend(
             [
@@ -204,8 +204,8 @@ async def get_versions(
                 ON products.id = versions.product_id
                 """,
                 f"""
-                INNER JOIN project_{project_name}.hierarchy AS hierarchy
-                ON hierarchy.id = products.folder_id
+                INNER JOIN project_{project_name}.entity_paths AS hierarchy
+                ON hierarchy.entity_id = products.folder_id
                 """,
             ]
         )
@@ -219,7 +219,7 @@ async def get_versions(
         if sort_by in SORT_OPTIONS:
             order_by.insert(0, SORT_OPTIONS[sort_by])
         elif sort_by.startswith("attrib."):
-            order_by.insert(0, f"versions.attrib->>'{sort_by[7:]}'")
+            order_by.insert(0, attrib_sort_key("versions", sort_by[7:]))
         else:
             raise ValueError(f"Invalid sort_by value: {sort_by}")
 
@@ -268,6 +268,8 @@ async def get_versions(
         first,
         last,
         context=info.context,
+        after=after,
+        before=before,
     )
 
 
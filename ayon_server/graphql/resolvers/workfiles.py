@@ -1,5 +1,6 @@
 from typing import Annotated
 
+from ayon_server.access.path_access import compile_path_access
 from ayon_server.graphql.connections import WorkfilesConnection
 from ayon_server.graphql.edges import WorkfileEdge
 from ayon_server.graphql.nodes.workfile import WorkfileNode
@@ -12,13 +13,14 @@ from ayon_server.graphql.resolvers.common import (
     ARGLast,
     FieldInfo,
     argdesc,
+    attrib_sort_key,
     create_folder_access_list,
-    create_pagination,
     get_has_links_conds,
     resolve,
     sortdesc,
 )
 from ayon_server.graphql.types import Info
+from ayon_server.helpers.pagination import create_pagination
 from ayon_server.types import validate_name_list, validate_status_list
 from ayon_server.utils import SQLTool
 
@@ -121,9 +123,7 @@ async def get_workfiles(
 
     access_list = await create_folder_access_list(root, info)
     if access_list is not None:
-        sql_conditions.append(
-            f"hierarchy.path like ANY ('{{ {','.join(access_list)} }}')"
-        )
+        sql_conditions.append(compile_path_access(access_list).sql_condition())
 
         sql_joins.extend(
             [
@@ -132,8 +132,8 @@ async def get_workfiles(
                 ON task.id = workfiles.task_id
                 """,
                 f"""
-                INNER JOIN project_{project_name}.hierarchy AS hierarchy
-                ON hierarchy.id = tasks.folder_id
+                INNER JOIN project_{project_name}.entity_paths AS hierarchy
+                ON hierarchy.entity_id = tasks.folder_id
                 """,
             ]
         )
@@ -148,7 +148,7 @@ async def get_workfiles(
         if sort_by in SORT_OPTIONS:
             order_by.insert(0, SORT_OPTIONS[sort_by])
         elif sort_by.startswith("attrib."):
-            order_by.insert(0, f"workfiles.attrib->>'{sort_by[7:]}'")
+            order_by.insert(0, attrib_sort_key("workfiles", sort_by[7:]))
         else:
             raise ValueError(f"Invalid sort_by value: {sort_by}")
 
@@ -190,6 +190,8 @@ async def get_workfiles(
         first,
         last,
         context=info.context,
+        after=after,
+        before=before,
     )
 
 
@@ -38,7 +38,8 @@ def parse_attrib_data(
     elif (perms := user.permissions(project_name)) is None:
         attr_limit = []  # This shouldn't happen
     elif perms.attrib_read.enabled:
-        attr_limit = perms.attrib_read.attributes
+        # copy, as permissions are cached and shared
+        attr_limit = list(perms.attrib_read.attributes)
     else:
         attr_limit = "all"
 
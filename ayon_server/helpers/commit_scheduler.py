@@ -0,0 +1,237 @@
+"""Deferred and coalesced post-commit work.
+
+Saving an entity requires updating data derived from it (version list
+rows, hierarchy cache entries). When this runs once per entity, bulk
+operations repeat the same work many times. Entities committed within
+a `deferred_commits` block therefore only record what needs to be
+updated, and the work runs once when the block exits:
+
+- version list rows of all affected products and count rows of all
+  affected folders are updated in a single query within the transaction
+  of the block
+- hierarchy cache updates are handed to the `commit_scheduler`, which
+  applies them after a short window, coalescing changes of concurrent
+  requests to the same project.
+
+Pending hierarchy changes are stored in Redis and applied before every
+cache read, so readers in any server process see committed changes
+(read-your-writes). Callers, which need the derived data to be up to date
+immediately, may also use `await commit_scheduler.flush(project_name)`.
+
+Outside of a `deferred_commits` block, the work runs immediately
+(the original behaviour).
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Iterable
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from nxtools import log_traceback
+
+from ayon_server.helpers.folder_counts import update_folder_counts
+from ayon_server.helpers.hierarchy_cache import (
+    add_pending_hierarchy_changes,
+    apply_pending_hierarchy_changes,
+    rebuild_hierarchy_cache,
+    update_hierarchy_cache,
+)
+from ayon_server.helpers.version_list import update_version_list
+from ayon_server.lib.postgres import Connection
+
+
+@dataclass
+class CommitBatch:
+    project_name: str
+    product_ids: set[str] = field(default_factory=set)
+    counted_folder_ids: set[str] = field(default_factory=set)
+    # None means the whole hierarchy cache needs to be rebuilt
+    folder_ids: set[str] | None = field(default_factory=set)
+
+    def add_folders(self, folder_ids: Iterable[str | None] | None) -> None:
+        if folder_ids is None or self.folder_ids is None:
+            self.folder_ids = None
+        else:
+            self.folder_ids.update(fid for fid in folder_ids if fid)
+
+    def add_products(self, product_ids: Iterable[str | None]) -> None:
+        self.product_ids.update(pid for pid in product_ids if pid)
+
+    def add_counted_folders(self, folder_ids: Iterable[str | None]) -> None:
+        self.counted_folder_ids.update(fid for fid in folder_ids if fid)
+
+    async def schedule_hierarchy_changes(self) -> None:
+        """Schedule hierarchy cache changes of the batch.
+
+        Must be called after the changes are committed to the database.
+        """
+        if self.folder_ids is None or self.folder_ids:
+            await commit_scheduler.schedule(self.project_name, self.folder_ids)
+            self.folder_ids = set()
+
+
+_current_batch: ContextVar[CommitBatch | None] = ContextVar(
+    "commit_batch", default=None
+)
+
+
+def get_commit_batch(project_name: str) -> CommitBatch | None:
+    """Return the active commit batch of the given project (if any)."""
+    batch = _current_batch.get()
+    if batch is not None and batch.project_name == project_name:
+        return batch
+    return None
+
+
+class CommitScheduler:
+    """Applies deferred hierarchy cache changes after a short window."""
+
+    def __init__(self, window: float = 0.2) -> None:
+        self.window = window
+        self.projects: set[str] = set()
+        self.task: asyncio.Task[None] | None = None
+
+    async def schedule(
+        self,
+        project_name: str,
+        folder_ids: Iterable[str | None] | None,
+    ) -> None:
+        """Schedule update of the given folders (None for a full rebuild).
+
+        Must be called after the changes are committed to the database.
+        """
+        await add_pending_hierarchy_changes(project_name, folder_ids)
+        self.projects.add(project_name)
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run())
+
+    async def _run(self) -> None:
+        await asyncio.sleep(self.window)
+        projects = self.projects
+        self.projects = set()
+        for project_name in projects:
+            try:
+                await apply_pending_hierarchy_changes(project_name)
+            except Exception:
+                log_traceback(f"Unable to update hierarchy cache of {project_name}")
+
+    async def flush(self, project_name: str) -> None:
+        """Apply all pending changes of the project now.
+
+        Read-your-writes barrier for callers, which need fresh data.
+        """
+        self.projects.discard(project_name)
+        await apply_pending_hierarchy_changes(project_name)
+
+
+commit_scheduler = CommitScheduler()
+
+
+async def _apply_hierarchy_changes(
+    project_name: str,
+    folder_ids: Iterable[str | None] | None,
+    transaction: Connection | None = None,
+) -> None:
+    if folder_ids is None:
+        await rebuild_hierarchy_cache(project_name, transaction=transaction)
+    else:
+        await update_hierarchy_cache(project_name, folder_ids, transaction=transaction)
+
+
+async def commit_hierarchy_changes(
+    project_name: str,
+    folder_ids: Iterable[str | None] | None,
+    transaction: Connection | None = None,
+) -> None:
+    """Update hierarchy cache entries of the given folders.
+
+    `None` requests a full rebuild. Within a commit batch,
+    the update is deferred until the batch is finished.
+    """
+    if (batch := get_commit_batch(project_name)) is not None:
+        batch.add_folders(folder_ids)
+        return
+    await _apply_hierarchy_changes(project_name, folder_ids, transaction)
+
+
+async def commit_version_list_changes(
+    project_name: str,
+    product_ids: Iterable[str | None],
+    transaction: Connection | None = None,
+) -> None:
+    """Update version list rows of the given products.
+
+    Within a commit batch, the update is deferred until the batch is finished.
+    """
+    if (batch := get_commit_batch(project_name)) is not None:
+        batch.add_products(product_ids)
+        return
+    await update_version_list(project_name, product_ids, transaction=transaction)
+
+
+async def commit_folder_count_changes(
+    project_name: str,
+    folder_ids: Iterable[str | None],
+    transaction: Connection | None = None,
+) -> None:
+    """Update count rows of the given folders.
+
+    Within a commit batch, the update is deferred until the batch is finished.
+    """
+    if (batch := get_commit_batch(project_name)) is not None:
+        batch.add_counted_folders(folder_ids)
+        return
+    await update_folder_counts(project_name, folder_ids, transaction=transaction)
+
+
+@asynccontextmanager
+async def deferred_commits(
+    project_name: str,
+    transaction: Connection | None = None,
+) -> AsyncIterator[CommitBatch]:
+    """Defer and coalesce post-commit work of entities of the project.
+
+    When the block is used within a transaction, pass the transaction,
+    so version list and folder count rows are updated as a part of it.
+    Hierarchy changes are passed to the outer block (if any). The outermost
+    block schedules them using the commit scheduler when there is no
+    transaction (changes are already committed).
+
+    Cache entries must not be written from uncommitted data, so an
+    outermost block with a transaction leaves the changes in the yielded
+    batch. The caller schedules them once the transaction is committed:
+
+        async with deferred_commits(project_name, transaction=conn) as batch:
+            ...
+        # after the commit
+        await batch.schedule_hierarchy_changes()
+
+    Nothing is executed when the block raises an exception.
+    """
+    outer = get_commit_batch(project_name)
+    batch = CommitBatch(project_name)
+    token = _current_batch.set(batch)
+    try:
+        yield batch
+    finally:
+        _current_batch.reset(token)
+
+    if batch.product_ids:
+        await update_version_list(
+            project_name,
+            batch.product_ids,
+            transaction=transaction,
+        )
+
+    if batch.counted_folder_ids:
+        await update_folder_counts(
+            project_name,
+            batch.counted_folder_ids,
+            transaction=transaction,
+        )
+
+    if outer is not None:
+        outer.add_folders(batch.folder_ids)
+    elif transaction is None and (batch.folder_ids is None or batch.folder_ids):
+        await commit_scheduler.schedule(project_name, batch.folder_ids)
@@ -0,0 +1,178 @@
+"""Incremental maintenance of the folder path index.
+
+Folder paths are stored in the `entity_paths` table of each project schema
+(without the leading slash, e.g. `assets/characters/hero`). Instead of
+re-evaluating the whole project hierarchy after each change, only the
+subtree of the affected folder is updated.
+
+`rebuild_entity_paths` performs a full rebuild and is meant to be used
+as a repair command.
+"""
+
+import time
+
+from nxtools import logging
+
+from ayon_server.lib.postgres import Connection, Postgres
+
+
+async def update_folder_paths(
+    project_name: str,
+    folder_id: str,
+    transaction: Connection,
+) -> list[str]:
+    """Update the path of a folder and all its descendants.
+
+    Must be called after the folder is saved (within the same transaction).
+    When the path of the folder did not change (e.g. attribute update),
+    the subtree is not touched at all. Returns ids of updated folders.
+    """
+
+    res = await transaction.fetch(
+        f"""
+        SELECT
+            COALESCE(p.path || '/', '') || f.name AS path,
+            e.path AS current_path
+        FROM project_{project_name}.folders f
+        LEFT JOIN project_{project_name}.entity_paths p
+            ON p.entity_id = f.parent_id
+        LEFT JOIN project_{project_name}.entity_paths e
+            ON e.entity_id = f.id
+        WHERE f.id = $1
+        """,
+        folder_id,
+    )
+    if not res:
+        return []
+
+    path = res[0]["path"]
+    if path == res[0]["current_path"]:
+        return []
+
+    res = await transaction.fetch(
+        f"""
+        WITH RECURSIVE subtree AS (
+            SELECT id, $2::VARCHAR AS path
+            FROM project_{project_name}.folders
+            WHERE id = $1
+            UNION ALL
+            SELECT f.id, s.path || '/' || f.name
+            FROM project_{project_name}.folders f
+            INNER JOIN subtree s ON f.parent_id = s.id
+        )
+        INSERT INTO project_{project_name}.entity_paths (entity_id, entity_type, path)
+        SELECT id, 'folder', path FROM subtree
+        ON CONFLICT (entity_id) DO UPDATE SET path = EXCLUDED.path
+        RETURNING entity_id
+        """,
+        folder_id,
+        path,
+    )
+    return [row["entity_id"] for row in res]
+
+
+async def create_folder_paths(
+    project_name: str,
+    folder_ids: list[str],
+    transaction: Connection,
+) -> list[str]:
+    """Create paths of multiple new folders using a single query.
+
+    Folders may be nested (children of other folders in the list), but
+    they must not have any other descendants yet (e.g. created in bulk).
+    Parents, which are not in the list must already have their paths.
+    Returns ids of folders, which paths were created.
+    """
+
+    res = await transaction.fetch(
+        f"""
+        WITH RECURSIVE subtree AS (
+            SELECT f.id, COALESCE(p.path || '/', '') || f.name AS path
+            FROM project_{project_name}.folders f
+            LEFT JOIN project_{project_name}.entity_paths p
+                ON p.entity_id = f.parent_id
+            WHERE f.id = ANY($1)
+            AND (f.parent_id IS NULL OR NOT f.parent_id = ANY($1))
+            UNION ALL
+            SELECT f.id, s.path || '/' || f.name
+            FROM project_{project_name}.folders f
+            INNER JOIN subtree s ON f.parent_id = s.id
+        )
+        INSERT INTO project_{project_name}.entity_paths (entity_id, entity_type, path)
+        SELECT id, 'folder', path FROM subtree
+        ON CONFLICT (entity_id) DO UPDATE SET path = EXCLUDED.path
+        RETURNING entity_id
+        """,
+        folder_ids,
+    )
+    return [row["entity_id"] for row in res]
+
+
+async def delete_folder_paths(
+    project_name: str,
+    folder_id: str,
+    transaction: Connection,
+) -> list[str]:
+    """Remove paths of a folder and all its descendants.
+
+    Must be called before the folder is deleted, while the subtree
+    can still be crawled using the parent_id column.
+    Returns ids of the removed folders.
+    """
+
+    res = await transaction.fetch(
+        f"""
+        WITH RECURSIVE subtree AS (
+            SELECT id FROM project_{project_name}.folders WHERE id = $1
+            UNION ALL
+            SELECT f.id FROM project_{project_name}.folders f
+            INNER JOIN subtree s ON f.parent_id = s.id
+        )
+        DELETE FROM project_{project_name}.entity_paths
+        WHERE entity_id IN (SELECT id FROM subtree)
+        RETURNING entity_id
+        """,
+        folder_id,
+    )
+    return [row["entity_id"] for row in res]
+
+
+async def _rebuild_in_transaction(project_name: str, conn: Connection) -> None:
+    await conn.execute(
+        f"""
+        DELETE FROM project_{project_name}.entity_paths
+        WHERE entity_type = 'folder'
+        """
+    )
+    await conn.execute(
+        f"""
+        WITH RECURSIVE tree AS (
+            SELECT id, name::VARCHAR AS path
+            FROM project_{project_name}.folders
+            WHERE parent_id IS NULL
+            UNION ALL
+            SELECT f.id, t.path || '/' || f.name
+            FROM project_{project_name}.folders f
+            INNER JOIN tree t ON f.parent_id = t.id
+        )
+        INSERT INTO project_{project_name}.entity_paths (entity_id, entity_type, path)
+        SELECT id, 'folder', path FROM tree
+        """
+    )
+
+
+async def rebuild_entity_paths(
+    project_name: str,
+    transaction: Connection | None = None,
+) -> None:
+    """Rebuild paths of all folders in the project."""
+    start = time.monotonic()
+
+    if transaction is None:
+        async with Postgres.acquire() as conn, conn.transaction():
+            await _rebuild_in_transaction(project_name, conn)
+    else:
+        await _rebuild_in_transaction(project_name, transaction)
+
+    elapsed = time.monotonic() - start
+    logging.debug(f"Rebuilt folder paths of {project_name} in {elapsed:.2f}s")
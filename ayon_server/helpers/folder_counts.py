@@ -0,0 +1,124 @@
+"""Incremental maintenance of folder counts.
+
+`folder_counts` table of each project schema holds numbers of direct
+subfolders, products and tasks of each folder. It is used to resolve
+`childCount`, `productCount`, `taskCount` (and `has*` filters) of folders
+without aggregating their children in every query.
+
+Rows are recomputed per folder when its children change, so creating
+a task only touches the row of its folder.
+`rebuild_folder_counts` performs a full rebuild and is meant to be used
+as a repair command.
+"""
+
+import time
+from collections.abc import Iterable
+
+from nxtools import logging
+
+from ayon_server.lib.postgres import Connection, Postgres
+
+
+async def _update_in_transaction(
+    project_name: str,
+    ids: list[str],
+    conn: Connection,
+) -> None:
+    # Serialize concurrent updates of the same folder (see version_list).
+    # NO KEY UPDATE does not conflict with KEY SHARE locks taken
+    # by inserting new children.
+    await conn.execute(
+        f"""
+        SELECT id FROM project_{project_name}.folders
+        WHERE id = ANY($1)
+        ORDER BY id
+        FOR NO KEY UPDATE
+        """,
+        ids,
+    )
+
+    query = f"""
+        INSERT INTO project_{project_name}.folder_counts
+            (folder_id, child_count, product_count, task_count)
+        SELECT
+            f.id,
+            (SELECT COUNT(*) FROM project_{project_name}.folders AS c
+                WHERE c.parent_id = f.id),
+            (SELECT COUNT(*) FROM project_{project_name}.products AS p
+                WHERE p.folder_id = f.id),
+            (SELECT COUNT(*) FROM project_{project_name}.tasks AS t
+                WHERE t.folder_id = f.id)
+        FROM project_{project_name}.folders AS f
+        WHERE f.id = ANY($1)
+        ON CONFLICT (folder_id) DO UPDATE SET
+            child_count = EXCLUDED.child_count,
+            product_count = EXCLUDED.product_count,
+            task_count = EXCLUDED.task_count
+    """
+
+    await conn.execute(query, ids)
+
+
+async def update_folder_counts(
+    project_name: str,
+    folder_ids: Iterable[str | None],
+    transaction: Connection | None = None,
+) -> None:
+    """Update count rows of the given folders.
+
+    Rows of deleted folders are removed by the foreign key.
+    """
+
+    ids = sorted({fid for fid in folder_ids if fid})
+    if not ids:
+        return
+
+    if transaction is None:
+        async with Postgres.acquire() as conn, conn.transaction():
+            await _update_in_transaction(project_name, ids, conn)
+    else:
+        await _update_in_transaction(project_name, ids, transaction)
+
+
+async def rebuild_folder_counts(
+    project_name: str,
+    transaction: Connection | None = None,
+) -> None:
+    """Rebuild counts of all folders in the project."""
+    start = time.monotonic()
+
+    async def _rebuild(conn: Connection) -> None:
+        await conn.execute(f"DELETE FROM project_{project_name}.folder_counts")
+        await conn.execute(
+            f"""
+            INSERT INTO project_{project_name}.folder_counts
+                (folder_id, child_count, product_count, task_count)
+            SELECT
+                f.id,
+                COALESCE(c.count, 0),
+                COALESCE(p.count, 0),
+                COALESCE(t.count, 0)
+            FROM project_{project_name}.folders AS f
+            LEFT JOIN (
+                SELECT parent_id, COUNT(*) AS count
+                FROM project_{project_name}.folders GROUP BY parent_id
+            ) AS c ON c.parent_id = f.id
+            LEFT JOIN (
+                SELECT folder_id, COUNT(*) AS count
+                FROM project_{project_name}.products GROUP BY folder_id
+            ) AS p ON p.folder_id = f.id
+            LEFT JOIN (
+                SELECT folder_id, COUNT(*) AS count
+                FROM project_{project_name}.tasks GROUP BY folder_id
+            ) AS t ON t.folder_id = f.id
+            """
+        )
+
+    if transaction is None:
+        async with Postgres.acquire() as conn, conn.transaction():
+            await _rebuild(conn)
+    else:
+        await _rebuild(transaction)
+
+    elapsed = time.monotonic() - start
+    logging.debug(f"Rebuilt folder counts of {project_name} in {elapsed:.2f}s")
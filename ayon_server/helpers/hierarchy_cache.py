@@ -1,18 +1,198 @@
+"""Folder hierarchy cache.
+
+The cache stores one entry per folder in a Redis hash, so it may be
+updated for a single folder without rebuilding the whole project.
+Every change bumps the project revision and the changed (or deleted)
+folder ids are stored in a sorted set scored by the revision they were
+changed in. That allows clients to request only the folders, which
+changed since the revision they already have.
+
+Keys (namespace, key) used:
+
+- `hierarchy.folders`, project_name: hash folder_id -> JSON entry
+- `hierarchy.changes`, project_name: sorted set folder_id -> revision
+- `hierarchy.revision`, project_name: monotonic revision counter (no TTL)
+- `hierarchy.base`, project_name: revision of the last full rebuild
+- `hierarchy.pending`, project_name: set of folder ids, which changes were
+  committed, but not applied to the cache yet (`*` means full rebuild)
+- `hierarchy.stamps`, project_name: hash folder_id -> database time
+  (in microseconds) the entry was read at. Entries read earlier than
+  the stored ones are not written, so concurrent updates from several
+  server processes can't replace an entry by an older one.
+
+Entries are stored pre-serialized in camelCase, so they can be served
+without re-validation.
+"""
+
+import asyncio
 import time
+from collections import defaultdict
+from collections.abc import Iterable
+from dataclasses import dataclass, field
 from typing import Any
 
 from nxtools import logging
 
 from ayon_server.lib.postgres import Connection, Postgres
 from ayon_server.lib.redis import Redis
-from ayon_server.utils import json_dumps
+from ayon_server.utils import json_dumps, json_loads
 
+CACHE_TTL = 3600
 
-async def rebuild_hierarchy_cache(
+# Start of the reading statement. Its snapshot is taken at the same time,
+# so entries of the later statements are never older.
+STAMP_QUERY = "(EXTRACT(EPOCH FROM statement_timestamp()) * 1000000)::BIGINT"
+
+# KEYS: folders, changes, revision, base, stamps
+# ARGV: ttl, stamp, id1, payload1, id2, payload2...
+
+REBUILD_SCRIPT = """
+local rev = redis.call("INCR", KEYS[3])
+local stamp = tonumber(ARGV[2])
+-- Keep entries (and deletions) read after this rebuild
+local newer = {}
+local stamps = redis.call("HGETALL", KEYS[5])
+for i = 1, #stamps, 2 do
+    if tonumber(stamps[i + 1]) > stamp then
+        newer[stamps[i]] = {stamps[i + 1], redis.call("HGET", KEYS[1], stamps[i])}
+    end
+end
+redis.call("DEL", KEYS[1], KEYS[2], KEYS[5])
+for i = 3, #ARGV, 2 do
+    if not newer[ARGV[i]] then
+        redis.call("HSET", KEYS[1], ARGV[i], ARGV[i + 1])
+        redis.call("HSET", KEYS[5], ARGV[i], stamp)
+        redis.call("ZADD", KEYS[2], rev, ARGV[i])
+    end
+end
+for folder_id, entry in pairs(newer) do
+    if entry[2] then
+        redis.call("HSET", KEYS[1], folder_id, entry[2])
+    end
+    redis.call("HSET", KEYS[5], folder_id, entry[1])
+    redis.call("ZADD", KEYS[2], rev, folder_id)
+end
+redis.call("SET", KEYS[4], rev)
+local ttl = tonumber(ARGV[1])
+if ttl > 0 then
+    redis.call("EXPIRE", KEYS[1], ttl)
+    redis.call("EXPIRE", KEYS[2], ttl)
+    redis.call("EXPIRE", KEYS[4], ttl)
+    redis.call("EXPIRE", KEYS[5], ttl)
+end
+return rev
+"""
+
+# Empty payload means the folder was deleted. Entries read before
+# the stored ones are skipped. Returns the current revision,
+# or 0 when there is no cache to update (it will be rebuilt on read)
+
+UPDATE_SCRIPT = """
+if redis.call("EXISTS", KEYS[4]) == 0 then
+    return 0
+end
+local stamp = tonumber(ARGV[2])
+local changed = {}
+for i = 3, #ARGV, 2 do
+    local current = redis.call("HGET", KEYS[5], ARGV[i])
+    if not current or tonumber(current) <= stamp then
+        changed[#changed + 1] = i
+    end
+end
+if #changed == 0 then
+    return tonumber(redis.call("GET", KEYS[3]))
+end
+local rev = redis.call("INCR", KEYS[3])
+for _, i in ipairs(changed) do
+    if ARGV[i + 1] == "" then
+        redis.call("HDEL", KEYS[1], ARGV[i])
+    else
+        redis.call("HSET", KEYS[1], ARGV[i], ARGV[i + 1])
+    end
+    redis.call("HSET", KEYS[5], ARGV[i], stamp)
+    redis.call("ZADD", KEYS[2], rev, ARGV[i])
+end
+local ttl = tonumber(ARGV[1])
+if ttl > 0 then
+    redis.call("EXPIRE", KEYS[1], ttl)
+    redis.call("EXPIRE", KEYS[2], ttl)
+    redis.call("EXPIRE", KEYS[4], ttl)
+    redis.call("EXPIRE", KEYS[5], ttl)
+end
+return rev
+"""
+
+# ARGV: since (-1 for all folders)
+# Returns {revision, base, id1, payload1, id2, payload2...}
+# or an empty list if there is no cache. Payload is false for deleted folders
+
+READ_SCRIPT = """
+local base = redis.call("GET", KEYS[4])
+if not base then
+    return {}
+end
+local rev = redis.call("GET", KEYS[3])
+local since = tonumber(ARGV[1])
+local result = {tonumber(rev), tonumber(base)}
+if since < tonumber(base) then
+    local entries = redis.call("HGETALL", KEYS[1])
+    for i = 1, #entries do
+        result[#result + 1] = entries[i]
+    end
+    return result
+end
+local ids = redis.call("ZRANGEBYSCORE", KEYS[2], "(" .. since, "+inf")
+for i = 1, #ids do
+    result[#result + 1] = ids[i]
+    result[#result + 1] = redis.call("HGET", KEYS[1], ids[i])
+end
+return result
+"""
+
+# Atomically pop all pending changes
+
+POP_PENDING_SCRIPT = """
+local ids = redis.call("SMEMBERS", KEYS[1])
+redis.call("DEL", KEYS[1])
+return ids
+"""
+
+# Serializes applying of pending changes within the process, so a reader
+# does not read the cache while another coroutine is still updating it.
+# Writes of other processes are ordered by the entry stamps.
+_pending_locks: defaultdict[str, asyncio.Lock] = defaultdict(asyncio.Lock)
+
+
+@dataclass
+class HierarchyCacheSnapshot:
+    revision: int
+    # Revision the entries are relative to. None means full list
+    since: int | None = None
+    folders: list[dict[str, Any]] = field(default_factory=list)
+    deleted: list[str] = field(default_factory=list)
+
+
+def _keys(project_name: str) -> list[tuple[str, str]]:
+    return [
+        ("hierarchy.folders", project_name),
+        ("hierarchy.changes", project_name),
+        ("hierarchy.revision", project_name),
+        ("hierarchy.base", project_name),
+        ("hierarchy.stamps", project_name),
+    ]
+
+
+async def _get_entries(
     project_name: str,
+    folder_ids: list[str] | None = None,
     transaction: Connection | None = None,
-) -> list[dict[str, Any]]:
-    start_time = time.monotonic()
+) -> tuple[dict[str, dict[str, Any]], int]:
+    """Load cache entries of the given folders (or all folders) from the DB
+
+    Returns the entries and the database time (in microseconds)
+    the entries were read at.
+    """
+
     query = f"""
         SELECT
             f.id,
@@ -23,8 +203,13 @@ async def rebuild_hierarchy_cache(
             f.status,
             f.attrib,
             f.updated_at,
+            {STAMP_QUERY} AS stamp,
             ea.attrib as all_attrib,
-            ea.path as path,
+            h.path as path,
+            EXISTS (
+                SELECT 1 FROM project_{project_name}.folders c
+                WHERE c.parent_id = f.id
+            ) AS has_children,
             COUNT (tasks.id) AS task_count,
             array_agg(tasks.name) AS task_names
         FROM
@@ -32,40 +217,162 @@ async def rebuild_hierarchy_cache(
         INNER JOIN
             project_{project_name}.exported_attributes ea
         ON f.id = ea.folder_id
+        INNER JOIN
+            project_{project_name}.entity_paths h
+        ON f.id = h.entity_id
         LEFT JOIN
             project_{project_name}.tasks AS tasks
         ON
             tasks.folder_id = f.id
-        GROUP BY f.id, ea.attrib, ea.path
+        {"WHERE f.id = ANY($1)" if folder_ids is not None else ""}
+        GROUP BY f.id, ea.attrib, h.path
     """
 
-    result = []
-    ids_with_children = set()
-    async for row in Postgres.iterate(query, transaction=transaction):
-        result.append(
-            {
-                "id": row["id"],
-                "path": row["path"],
-                "parent_id": row["parent_id"],
-                "parents": row["path"].strip("/").split("/")[:-1],
-                "name": row["name"],
-                "label": row["label"],
-                "folder_type": row["folder_type"],
-                "has_tasks": row["task_count"] > 0,
-                "task_names": row["task_names"] if row["task_names"] != [None] else [],
-                "status": row["status"],
-                "attrib": row["all_attrib"],
-                "own_attrib": list(row["attrib"].keys()),
-                "updated_at": row["updated_at"],
-            }
-        )
-        if row["parent_id"] is not None:
-            ids_with_children.add(row["parent_id"])
+    args = [folder_ids] if folder_ids is not None else []
+    result = {}
+    stamp: int | None = None
+    async for row in Postgres.iterate(query, *args, transaction=transaction):
+        stamp = row["stamp"]
+        result[row["id"]] = {
+            "id": row["id"],
+            "path": row["path"],
+            "parentId": row["parent_id"],
+            "parents": row["path"].strip("/").split("/")[:-1],
+            "name": row["name"],
+            "label": row["label"],
+            "folderType": row["folder_type"],
+            "hasTasks": row["task_count"] > 0,
+            "hasChildren": row["has_children"],
+            "taskNames": row["task_names"] if row["task_names"] != [None] else [],
+            "status": row["status"],
+            "attrib": row["all_attrib"],
+            "ownAttrib": list(row["attrib"].keys()),
+            "updatedAt": row["updated_at"],
+        }
+
+    if stamp is None:
+        # No folders found. Deleted folders don't come back,
+        # so any later time is fine for the deletions.
+        conn = transaction or Postgres
+        res = await conn.fetch(f"SELECT {STAMP_QUERY} AS stamp")
+        stamp = res[0]["stamp"]
+    return result, stamp
 
-    for folder in result:
-        folder["has_children"] = folder["id"] in ids_with_children
 
-    await Redis.set("project.folders", project_name, json_dumps(result), 3600)
+async def rebuild_hierarchy_cache(
+    project_name: str,
+    transaction: Connection | None = None,
+) -> list[dict[str, Any]]:
+    """Rebuild the hierarchy cache of the whole project.
+
+    Bumps the base revision, so clients requesting changes
+    since an older revision will receive the full list.
+    """
+    start_time = time.monotonic()
+    entries, stamp = await _get_entries(project_name, transaction=transaction)
+
+    args: list[str] = []
+    for folder_id, entry in entries.items():
+        args.extend([folder_id, json_dumps(entry)])
+    await Redis.eval(REBUILD_SCRIPT, _keys(project_name), CACHE_TTL, stamp, *args)
+
     elapsed_time = time.monotonic() - start_time
     logging.debug(f"Rebuilt hierarchy cache for {project_name} in {elapsed_time:.2f} s")
-    return result
+    return list(entries.values())
+
+
+async def update_hierarchy_cache(
+    project_name: str,
+    folder_ids: Iterable[str | None],
+    transaction: Connection | None = None,
+) -> int:
+    """Update cache entries of the given folders.
+
+    Folders, which no longer exist are removed from the cache. Entries
+    updated meanwhile by a later read are kept.
+    Returns the new project revision (or 0 if there was no cache
+    to update - in that case it is rebuilt on the next read).
+    """
+    ids = list({fid for fid in folder_ids if fid})
+    if not ids:
+        return 0
+
+    entries, stamp = await _get_entries(project_name, ids, transaction=transaction)
+    args: list[str] = []
+    for folder_id in ids:
+        entry = entries.get(folder_id)
+        args.extend([folder_id, json_dumps(entry) if entry else ""])
+    return await Redis.eval(UPDATE_SCRIPT, _keys(project_name), CACHE_TTL, stamp, *args)
+
+
+async def add_pending_hierarchy_changes(
+    project_name: str,
+    folder_ids: Iterable[str | None] | None,
+) -> None:
+    """Record folders, which cache entries need to be updated.
+
+    Must be called after the transaction, which changed the folders,
+    is committed. `None` requests a full rebuild. Pending changes are
+    applied by `apply_pending_hierarchy_changes`, which is called before
+    each cache read.
+    """
+    ids = ["*"] if folder_ids is None else list({fid for fid in folder_ids if fid})
+    if not ids:
+        return
+    await Redis.sadd("hierarchy.pending", project_name, *ids)
+    await Redis.expire("hierarchy.pending", project_name, CACHE_TTL)
+
+
+async def apply_pending_hierarchy_changes(project_name: str) -> None:
+    """Apply pending changes of the project hierarchy to the cache."""
+    async with _pending_locks[project_name]:
+        res = await Redis.eval(
+            POP_PENDING_SCRIPT, [("hierarchy.pending", project_name)]
+        )
+        ids = [r.decode() for r in res]
+        if not ids:
+            return
+        try:
+            if "*" in ids:
+                await rebuild_hierarchy_cache(project_name)
+            else:
+                await update_hierarchy_cache(project_name, ids)
+        except Exception:
+            # Keep the changes pending, so they are not lost
+            await Redis.sadd("hierarchy.pending", project_name, *ids)
+            raise
+
+
+async def get_hierarchy_cache(
+    project_name: str,
+    since: int | None = None,
+) -> HierarchyCacheSnapshot:
+    """Return cached folders of the project.
+
+    When `since` is provided and the cache still holds the changes
+    since that revision, only folders changed after it are returned
+    (along with ids of deleted folders). Otherwise the full list is
+    returned and `since` of the snapshot is None.
+    """
+    await apply_pending_hierarchy_changes(project_name)
+
+    keys = _keys(project_name)
+    res = await Redis.eval(READ_SCRIPT, keys, since if since is not None else -1)
+    if not res:
+        await rebuild_hierarchy_cache(project_name)
+        res = await Redis.eval(READ_SCRIPT, keys, -1)
+        if not res:
+            return HierarchyCacheSnapshot(revision=0)
+
+    revision, base = int(res[0]), int(res[1])
+    snapshot = HierarchyCacheSnapshot(
+        revision=revision,
+        since=since if (since is not None and since >= base) else None,
+    )
+
+    for i in range(2, len(res), 2):
+        if res[i + 1] is None:
+            snapshot.deleted.append(res[i].decode())
+        else:
+            snapshot.folders.append(json_loads(res[i + 1]))
+    return snapshot
@@ -12,12 +12,12 @@ async def _rebuild_in_transaction(
 ):
     st_crawl = await conn.prepare(
         f"""
-        SELECT h.id, h.path, f.attrib as own, e.attrib as exported
-        FROM project_{project_name}.hierarchy h
+        SELECT h.entity_id AS id, h.path, f.attrib as own, e.attrib as exported
+        FROM project_{project_name}.entity_paths h
         INNER JOIN project_{project_name}.folders f
-        ON h.id = f.id
+        ON h.entity_id = f.id
         LEFT JOIN project_{project_name}.exported_attributes e
-        ON h.id = e.folder_id
+        ON h.entity_id = e.folder_id
         ORDER BY h.path ASC
         """
     )
@@ -71,17 +71,16 @@ async def _rebuild_in_transaction(
         await st_upsert.executemany(buff)
 
 
-async def rebuild_inherited_attributes(
-    project_name: str, pattr: dict[str, Any] | None = None, transaction=None
-):
-    """Rebuild inherited attributes for all objects in the project."""
-    start = time.monotonic()
-    logging.debug("Rebuilding inherited attributes for", project_name)
-
+async def _get_project_attrib(
+    project_name: str,
+    pattr: dict[str, Any] | None,
+    conn,
+) -> dict[str, Any]:
+    """Return project attributes, which are inherited by root folders."""
     if pattr is None:
         project_attrib = {}
-        res = await Postgres.fetch(
-            "SELECT attrib FROM projects WHERE name = $1", project_name
+        res = await conn.fetch(
+            "SELECT attrib FROM public.projects WHERE name = $1", project_name
         )
         project_attrib.update(res[0]["attrib"])
     else:
@@ -93,12 +92,164 @@ async def rebuild_inherited_attributes(
             continue
         if not attr_type.get("inherit", True):
             del project_attrib[attr_type["name"]]
+    return project_attrib
+
+
+async def rebuild_inherited_attributes(
+    project_name: str, pattr: dict[str, Any] | None = None, transaction=None
+):
+    """Rebuild inherited attributes for all objects in the project.
+
+    This crawls the entire project, so it should be used as a repair
+    command only. Regular changes are handled by
+    `propagate_inherited_attributes`.
+    """
+    start = time.monotonic()
+    logging.debug("Rebuilding inherited attributes for", project_name)
 
     if (transaction is None) or transaction == Postgres:
         async with Postgres.acquire() as conn, conn.transaction():
+            project_attrib = await _get_project_attrib(project_name, pattr, conn)
             await _rebuild_in_transaction(project_name, project_attrib, conn)
     else:
+        project_attrib = await _get_project_attrib(project_name, pattr, transaction)
         await _rebuild_in_transaction(project_name, project_attrib, transaction)
 
     elapsed = time.monotonic() - start
     logging.debug(f"Rebuilt inherited attributes for {project_name} in {elapsed:.2f}s")
+
+
+async def _propagate_in_transaction(
+    project_name: str,
+    folder_id: str | list[str] | None,
+    pattr: dict[str, Any] | None,
+    conn,
+) -> list[str] | None:
+    base_query = f"""
+        SELECT f.id, f.parent_id, h.path, f.attrib as own, e.attrib as exported
+        FROM project_{project_name}.folders f
+        INNER JOIN project_{project_name}.entity_paths h
+        ON h.entity_id = f.id
+        LEFT JOIN project_{project_name}.exported_attributes e
+        ON f.id = e.folder_id
+    """
+
+    # Attributes exported by the parents of the currently processed level
+    parent_attribs: dict[str | None, dict[str, Any]] = {}
+
+    if folder_id is None:
+        records = await conn.fetch(f"{base_query} WHERE f.parent_id IS NULL")
+        parent_attribs[None] = await _get_project_attrib(project_name, pattr, conn)
+    else:
+        folder_ids = [folder_id] if isinstance(folder_id, str) else folder_id
+        records = await conn.fetch(f"{base_query} WHERE f.id = ANY($1)", folder_ids)
+        if not records:
+            return []
+        parent_ids = {record["parent_id"] for record in records}
+        if None in parent_ids:
+            parent_ids.discard(None)
+            parent_attribs[None] = await _get_project_attrib(project_name, pattr, conn)
+        if parent_ids:
+            res = await conn.fetch(
+                f"""
+                SELECT folder_id, attrib
+                FROM project_{project_name}.exported_attributes
+                WHERE folder_id = ANY($1)
+                """,
+                list(parent_ids),
+            )
+            parent_attribs.update({row["folder_id"]: row["attrib"] for row in res})
+            if missing := parent_ids - set(parent_attribs):
+                # Parent is not consistent. This shouldn't happen,
+                # but we can recover by rebuilding the whole project.
+                logging.warning(
+                    f"Missing exported attributes of {', '.join(missing)}"
+                    f" in {project_name}"
+                )
+                project_attrib = await _get_project_attrib(project_name, pattr, conn)
+                await _rebuild_in_transaction(project_name, project_attrib, conn)
+                return None
+
+    st_upsert = await conn.prepare(
+        f"""
+         INSERT INTO project_{project_name}.exported_attributes
+             (folder_id, path, attrib)
+         VALUES
+            ($1, $2, $3)
+         ON CONFLICT (folder_id)
+         DO UPDATE SET attrib = EXCLUDED.attrib, path = EXCLUDED.path
+         """
+    )
+
+    updated: list[str] = []
+    while records:
+        buff: list[tuple[str, str, dict[str, Any]]] = []
+        changed: dict[str | None, dict[str, Any]] = {}
+
+        for record in records:
+            new_attrib_set = {**parent_attribs[record["parent_id"]], **record["own"]}
+            if record["exported"] == new_attrib_set:
+                # Inherited values are either unchanged or overridden by
+                # the folder's own attributes. Its subtree is up to date.
+                continue
+            changed[record["id"]] = new_attrib_set
+            buff.append((record["id"], record["path"], new_attrib_set))
+
+        if not buff:
+            break
+
+        await st_upsert.executemany(buff)
+        updated.extend(fid for fid, _, _ in buff)
+
+        # Descend only to children of folders, which actually changed
+        records = await conn.fetch(
+            f"{base_query} WHERE f.parent_id = ANY($1)",
+            list(changed.keys()),
+        )
+        parent_attribs = changed
+
+    return updated
+
+
+async def propagate_inherited_attributes(
+    project_name: str,
+    folder_id: str | list[str] | None = None,
+    pattr: dict[str, Any] | None = None,
+    transaction=None,
+) -> list[str] | None:
+    """Update inherited attributes of a folder subtree.
+
+    When `folder_id` is set, the exported attributes of the folder
+    are recomputed and the changes are propagated to its descendants.
+    A list of folder ids may be provided to process multiple subtrees
+    at once (e.g. after a bulk save).
+    When `folder_id` is None, propagation starts from the root folders
+    (use this when the project attributes change, optionally providing
+    the new project attributes as `pattr`).
+
+    Only the branches where the exported attributes actually change are
+    crawled: descending stops when a folder's own attributes override all
+    changed inherited values, so the cost scales with the affected subtree.
+
+    Returns ids of updated folders or None if the whole project
+    had to be rebuilt.
+    """
+    start = time.monotonic()
+
+    if (transaction is None) or transaction == Postgres:
+        async with Postgres.acquire() as conn, conn.transaction():
+            updated = await _propagate_in_transaction(
+                project_name, folder_id, pattr, conn
+            )
+    else:
+        updated = await _propagate_in_transaction(
+            project_name, folder_id, pattr, transaction
+        )
+
+    elapsed = time.monotonic() - start
+    if updated:
+        logging.debug(
+            f"Propagated inherited attributes of {len(updated)} folders"
+            f" in {project_name} in {elapsed:.2f}s"
+        )
+    return updated
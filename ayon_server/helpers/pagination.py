@@ -0,0 +1,132 @@
+"""Keyset pagination of GraphQL connections.
+
+Pages are delimited by the sort key values of the boundary rows
+(cursors), instead of offsets, so each page is read by an index scan
+starting at the cursor.
+"""
+
+from typing import Any
+
+from ayon_server.exceptions import BadRequestException
+from ayon_server.utils import json_loads
+
+DEFAULT_PAGE_SIZE = 100
+
+
+def typed_attrib_key(table: str, name: str, attr_type: str | None) -> str:
+    """Return a sort key of an attribute of the given type.
+
+    Numeric attributes are sorted by value, others as text.
+    Missing values are sorted first (NULLs cannot be compared
+    in the page boundary condition).
+    """
+    column = f"{table}.attrib->>'{name}'"
+    if attr_type in ("integer", "float"):
+        return (
+            f"(CASE WHEN jsonb_typeof({table}.attrib->'{name}') = 'number' "
+            f"THEN ({column})::FLOAT8 ELSE '-Infinity'::FLOAT8 END)"
+        )
+    return f"COALESCE({column}, '')"
+
+
+def sql_literal(value: Any) -> str:
+    """Return an SQL literal of a cursor value.
+
+    Strings are passed as untyped literals, so Postgres casts them
+    to the type of the compared column (timestamps, UUIDs...).
+    """
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, (int, float)):
+        return repr(value)
+    if isinstance(value, str):
+        return "'" + value.replace("'", "''") + "'"
+    raise BadRequestException("Invalid pagination cursor")
+
+
+def decode_cursor(cursor: str, size: int) -> list[Any]:
+    """Parse a cursor created by `create_pagination`"""
+    try:
+        values = json_loads(cursor)
+    except Exception:
+        values = None
+    if not isinstance(values, list) or len(values) != size:
+        raise BadRequestException("Invalid pagination cursor")
+    return values
+
+
+def create_pagination(
+    order_by: list[str],
+    first: int | None = None,
+    after: str | None = None,
+    last: int | None = None,
+    before: str | None = None,
+    need_cursor: bool = True,
+) -> tuple[str, list[str], str]:
+    """
+    Create keyset pagination query and arguments.
+    returns a tuple of
+      - pagination query (ORDER BY... part of the query)
+      - additional conditions (WHERE... part of the query)
+      - cursor (to add to SELECT... part of the query)
+
+    The last column of order_by must be unique (creation_order, name...)
+    and columns must not be NULL (see `typed_attrib_key`).
+    The cursor is a JSON array of the sort key values, the page boundary
+    is a row-value comparison against it, which Postgres can satisfy
+    by scanning an index in either direction.
+
+    One more row than requested is fetched, so `resolve` is able to tell
+    whether there is another page.
+    """
+
+    assert order_by, "Order by must not be empty"
+
+    keys = order_by
+
+    if not (last or first):
+        first = DEFAULT_PAGE_SIZE
+
+    sql_conditions = []
+    if first:
+        direction, operator, curval, limit = "ASC", ">", after, first
+    else:
+        assert last
+        direction, operator, curval, limit = "DESC", "<", before, last
+
+    if curval:
+        values = decode_cursor(curval, len(keys))
+        sql_conditions.append(
+            f"({', '.join(keys)}) {operator} ({', '.join(map(sql_literal, values))})"
+        )
+
+    ordering = ", ".join(f"{key} {direction}" for key in keys)
+    pagination = f"ORDER BY {ordering} LIMIT {limit + 1}"
+
+    if need_cursor:
+        cursor = f"json_build_array({', '.join(keys)})::text AS cursor"
+    else:
+        cursor = "NULL AS cursor"
+    return pagination, sql_conditions, cursor
+
+
+def get_page_flags(
+    has_more: bool,
+    *,
+    first: int | None = None,
+    last: int | None = None,
+    after: str | None = None,
+    before: str | None = None,
+) -> tuple[bool, bool]:
+    """Return (has_next_page, has_previous_page) of a page.
+
+    `has_more` tells whether the query returned the extra row,
+    so there is another page in the direction of pagination.
+    `after` and `before` cursors mean there are rows in the other one.
+    """
+    if last and not first:
+        # Edges are returned in descending order
+        return before is not None, has_more
+    return has_more, after is not None
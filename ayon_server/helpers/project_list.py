@@ -1,6 +1,9 @@
+import time
 from datetime import datetime
 from typing import Any
 
+from ayon_server.exceptions import NotFoundException
+from ayon_server.lib.local_cache import LocalCache
 from ayon_server.lib.postgres import Postgres
 from ayon_server.lib.redis import Redis
 from ayon_server.types import OPModel
@@ -19,7 +22,7 @@ async def build_project_list() -> list[ProjectListItem]:
     q = """SELECT name, code, active, created_at FROM projects ORDER BY name ASC"""
     result: list[dict[str, Any]] = []
     try:
-        async for row in Postgres.iterate(q):
+        async for row in Postgres.iterate(q, cursor=False):
             result.append(
                 {
                     "name": row["name"],
@@ -33,10 +36,12 @@ async def build_project_list() -> list[ProjectListItem]:
         # No projects table, return an empty list
         pass
     await Redis.set("global", "project-list", json_dumps(result))
+    await LocalCache.invalidate("global", "project-list")
+    await LocalCache.invalidate("global", "project-name-map")
     return [ProjectListItem(**item) for item in result]
 
 
-async def get_project_list() -> list[ProjectListItem]:
+async def load_project_list() -> list[ProjectListItem]:
     project_list = await Redis.get("global", "project-list")
     if project_list is None:
         project_list = await build_project_list()
@@ -44,3 +49,63 @@ async def get_project_list() -> list[ProjectListItem]:
     else:
         project_list = json_loads(project_list)
         return [ProjectListItem(**item) for item in project_list]
+
+
+async def get_project_list() -> list[ProjectListItem]:
+    """Return the list of all projects.
+
+    The list is cached in the worker memory, callers get copies
+    of the items.
+    """
+    project_list = await LocalCache.get("global", "project-list", load_project_list)
+    return [project.copy() for project in project_list]
+
+
+# Minimal interval (in seconds) between reloads of the project name map
+# caused by lookups of unknown project names in this worker
+NAME_MAP_RELOAD_INTERVAL = 5.0
+_name_map_reloaded_at = 0.0
+
+
+async def load_project_name_map() -> dict[str, str]:
+    project_list = await load_project_list()
+    return {project.name.lower(): project.name for project in project_list}
+
+
+async def query_project_name_map() -> dict[str, str]:
+    result: dict[str, str] = {}
+    try:
+        async for row in Postgres.iterate("SELECT name FROM projects", cursor=False):
+            result[row["name"].lower()] = row["name"]
+    except Postgres.UndefinedTableError:
+        pass
+    return result
+
+
+async def get_canonical_project_name(project_name: str) -> str:
+    """Return the project name as stored in the database.
+
+    Project names are unique case-insensitively, so the lookup
+    is done using the lowercased name. When the project is not found,
+    the name map of this worker is reloaded from the database (the project
+    could be created by another worker a moment ago) before
+    NotFoundException is raised. The reload is throttled, so repeated
+    lookups of a missing project don't hit the database on every request.
+    """
+    global _name_map_reloaded_at
+
+    key = project_name.lower()
+    name_map = await LocalCache.get("global", "project-name-map", load_project_name_map)
+    if (name := name_map.get(key)) is not None:
+        return name
+
+    now = time.monotonic()
+    if now - _name_map_reloaded_at >= NAME_MAP_RELOAD_INTERVAL:
+        _name_map_reloaded_at = now
+        LocalCache.drop("global", "project-name-map")
+        name_map = await LocalCache.get(
+            "global", "project-name-map", query_project_name_map
+        )
+        if (name := name_map.get(key)) is not None:
+            return name
+    raise NotFoundException(f"Project {project_name} not found")
@@ -0,0 +1,112 @@
+"""Incremental maintenance of the version list.
+
+`version_list` table of each project schema holds ids and version numbers
+of all versions of a product (ordered by the version number). It is used
+to get the latest version of a product and to list product versions.
+
+Rows are updated per product when its versions change, so a publish
+only touches the row of the published product.
+`rebuild_version_list` performs a full rebuild and is meant to be used
+as a repair command.
+"""
+
+import time
+from collections.abc import Iterable
+
+from nxtools import logging
+
+from ayon_server.lib.postgres import Connection, Postgres
+
+
+async def _update_in_transaction(
+    project_name: str,
+    ids: list[str],
+    conn: Connection,
+) -> None:
+    # Serialize concurrent updates of the same product. Without the lock,
+    # two concurrent publishes could overwrite each other's row with
+    # an aggregate missing the other's version. NO KEY UPDATE does not
+    # conflict with KEY SHARE locks taken by inserting new versions.
+    await conn.execute(
+        f"""
+        SELECT id FROM project_{project_name}.products
+        WHERE id = ANY($1)
+        ORDER BY id
+        FOR NO KEY UPDATE
+        """,
+        ids,
+    )
+
+    query = f"""
+        WITH aggregated AS (
+            SELECT
+                v.product_id AS product_id,
+                array_agg(v.id ORDER BY v.version) AS ids,
+                array_agg(v.version ORDER BY v.version) AS versions
+            FROM project_{project_name}.versions AS v
+            WHERE v.product_id = ANY($1)
+            GROUP BY v.product_id
+        ),
+
+        deleted AS (
+            DELETE FROM project_{project_name}.version_list
+            WHERE product_id = ANY($1)
+            AND product_id NOT IN (SELECT product_id FROM aggregated)
+        )
+
+        INSERT INTO project_{project_name}.version_list (product_id, ids, versions)
+        SELECT product_id, ids, versions FROM aggregated
+        ON CONFLICT (product_id)
+        DO UPDATE SET ids = EXCLUDED.ids, versions = EXCLUDED.versions
+    """
+
+    await conn.execute(query, ids)
+
+
+async def update_version_list(
+    project_name: str,
+    product_ids: Iterable[str | None],
+    transaction: Connection | None = None,
+) -> None:
+    """Update version list rows of the given products."""
+
+    ids = sorted({pid for pid in product_ids if pid})
+    if not ids:
+        return
+
+    if transaction is None:
+        async with Postgres.acquire() as conn, conn.transaction():
+            await _update_in_transaction(project_name, ids, conn)
+    else:
+        await _update_in_transaction(project_name, ids, transaction)
+
+
+async def rebuild_version_list(
+    project_name: str,
+    transaction: Connection | None = None,
+) -> None:
+    """Rebuild version list of all products in the project."""
+    start = time.monotonic()
+
+    async def _rebuild(conn: Connection) -> None:
+        await conn.execute(f"DELETE FROM project_{project_name}.version_list")
+        await conn.execute(
+            f"""
+            INSERT INTO project_{project_name}.version_list (product_id, ids, versions)
+            SELECT
+                v.product_id,
+                array_agg(v.id ORDER BY v.version),
+                array_agg(v.version ORDER BY v.version)
+            FROM project_{project_name}.versions AS v
+            GROUP BY v.product_id
+            """
+        )
+
+    if transaction is None:
+        async with Postgres.acquire() as conn, conn.transaction():
+            await _rebuild(conn)
+    else:
+        await _rebuild(transaction)
+
+    elapsed = time.monotonic() - start
+    logging.debug(f"Rebuilt version list of {project_name} in {elapsed:.2f}s")
@@ -0,0 +1,166 @@
+"""Shared cache of the entity rows loaded by the GraphQL dataloaders.
+
+Dataloaders are created for every GraphQL request, so they only
+deduplicate loads within a single query. When enabled, the rows they
+load are also kept in the worker memory and shared between requests.
+
+Each entry holds the row together with its revision (`updated_at`).
+Entries are invalidated by the entity events dispatched by
+`EventStream.dispatch` (received from the Redis channel by the local
+cache listener), so a newer revision of an entity replaces the cached
+one. As with `LocalCache`, the cache is bypassed while the listener
+is not subscribed to the channel.
+
+The cache stores raw database rows, access control is still
+applied by the GraphQL nodes for each request.
+"""
+
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+from ayon_server.config import ayonconfig
+from ayon_server.lib.local_cache import LocalCache
+
+LoaderType = Callable[[list[Any]], Awaitable[list[dict[str, Any] | None]]]
+
+# Entity types, whose rows contain data of other entities.
+# Changing a folder affects inherited attributes and paths of
+# its descendants and tasks, changing the project affects all folders.
+PROJECT_WIDE_TOPICS = ("entity.project.", "entity.folder.")
+
+
+class EntityCache:
+    # (entity_type, project_name, key) -> (expiration time, revision, row)
+    entries: OrderedDict[tuple[str, str | None, Hashable], tuple[float, Any, Any]]
+    entries = OrderedDict()
+    max_size: int = 50000
+
+    # Incremented on every invalidation. Rows loaded while
+    # an invalidation happened may be stale, so they are not stored.
+    generation: int = 0
+
+    @classmethod
+    def enabled(cls) -> bool:
+        return ayonconfig.graphql_entity_cache and LocalCache.enabled
+
+    @classmethod
+    def get(
+        cls,
+        entity_type: str,
+        project_name: str | None,
+        key: Hashable,
+    ) -> dict[str, Any] | None:
+        ckey = (entity_type, project_name, key)
+        if (entry := cls.entries.get(ckey)) is None:
+            return None
+        expires, _, row = entry
+        if expires < time.monotonic():
+            cls.entries.pop(ckey, None)
+            return None
+        cls.entries.move_to_end(ckey)
+        return row
+
+    @classmethod
+    def set(
+        cls,
+        entity_type: str,
+        project_name: str | None,
+        key: Hashable,
+        row: dict[str, Any],
+    ) -> None:
+        ckey = (entity_type, project_name, key)
+        revision = row.get("updated_at")
+        if (entry := cls.entries.get(ckey)) is not None:
+            cached_revision = entry[1]
+            if revision and cached_revision and cached_revision > revision:
+                return
+        expires = time.monotonic() + ayonconfig.graphql_entity_cache_ttl
+        cls.entries[ckey] = (expires, revision, row)
+        cls.entries.move_to_end(ckey)
+        while len(cls.entries) > cls.max_size:
+            cls.entries.popitem(last=False)
+
+    @classmethod
+    def drop(
+        cls,
+        entity_type: str | None = None,
+        project_name: str | None = None,
+        key: Hashable | None = None,
+    ) -> None:
+        """Drop matching entries. None values match everything."""
+        cls.generation += 1
+        if entity_type is None and project_name is None:
+            cls.entries.clear()
+            return
+        if entity_type is not None and key is not None:
+            cls.entries.pop((entity_type, project_name, key), None)
+            return
+        for ckey in list(cls.entries):
+            if entity_type is not None and ckey[0] != entity_type:
+                continue
+            if project_name is not None and ckey[1] != project_name:
+                continue
+            cls.entries.pop(ckey, None)
+
+    @classmethod
+    def handle_event(cls, message: dict[str, Any]) -> None:
+        """Invalidate entries affected by an event from the Redis channel"""
+        topic = message.get("topic") or ""
+        project_name = message.get("project")
+
+        if topic.startswith(PROJECT_WIDE_TOPICS):
+            cls.drop(project_name=project_name or None)
+
+        elif topic.startswith("entity.user."):
+            cls.drop("user")
+
+        elif topic.startswith("entity."):
+            entity_type = topic.split(".")[1]
+            entity_id = (message.get("summary") or {}).get("entityId")
+            if project_name and entity_id:
+                cls.drop(entity_type, project_name, entity_id.replace("-", ""))
+            else:
+                cls.drop(entity_type, project_name or None)
+
+        elif topic.startswith("activity.") and project_name:
+            # Activities may add or remove version reviewables
+            cls.drop("version", project_name)
+
+    @classmethod
+    def wrap(cls, entity_type: str, loader: LoaderType) -> LoaderType:
+        """Return a dataloader function backed by the shared cache.
+
+        Keys of project level loaders are (project_name, entity_id)
+        tuples, keys of the user loader are user names.
+        """
+
+        def split_key(key: Any) -> tuple[str | None, Hashable]:
+            if isinstance(key, tuple):
+                return key[0], key[1].replace("-", "")
+            return None, key
+
+        async def cached_loader(keys: list[Any]) -> list[dict[str, Any] | None]:
+            if not cls.enabled():
+                return await loader(keys)
+
+            result: dict[Any, dict[str, Any] | None] = {}
+            missing = []
+            for key in keys:
+                if (row := cls.get(entity_type, *split_key(key))) is not None:
+                    result[key] = row
+                else:
+                    missing.append(key)
+
+            if missing:
+                generation = cls.generation
+                rows = await loader(missing)
+                store = generation == cls.generation
+                for key, row in zip(missing, rows):
+                    result[key] = row
+                    if store and row is not None:
+                        cls.set(entity_type, *split_key(key), row)
+
+            return [result[key] for key in keys]
+
+        return cached_loader
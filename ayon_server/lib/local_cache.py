@@ -0,0 +1,126 @@
+"""In-process cache in front of Redis.
+
+Objects, which are read on (almost) every request but rarely change
+(project list, sessions, primary anatomy preset...), are kept in the
+memory of the worker process, so they don't need to be fetched from
+Redis and parsed again and again.
+
+Coherence between workers is kept using the Redis pubsub channel:
+`LocalCache.invalidate` drops the entry locally and publishes
+a `cache.invalidate` message, which makes all other workers drop
+the entry as well. The cache is bypassed entirely while the
+invalidation listener is not subscribed to the channel, so a worker
+never serves an entry it could have missed the invalidation of.
+"""
+
+import time
+import uuid
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, TypeVar
+
+from nxtools import log_traceback
+
+from ayon_server.lib.redis import Redis
+from ayon_server.utils import json_dumps
+
+INVALIDATION_TOPIC = "cache.invalidate"
+
+T = TypeVar("T")
+InvalidationHandler = Callable[[str | None], Awaitable[None]]
+
+
+class LocalCache:
+    # Identifier of this worker process, used to ignore
+    # own invalidation messages
+    worker_id: str = uuid.uuid1().hex
+
+    # (namespace, key) -> (expiration time, value)
+    entries: OrderedDict[tuple[str, str], tuple[float, Any]] = OrderedDict()
+    max_size: int = 4096
+
+    # Incremented on every invalidation. A value loaded while an
+    # invalidation happened may be stale, so it is not stored.
+    generation: int = 0
+
+    # Set by the invalidation listener while it is subscribed
+    enabled: bool = False
+
+    handlers: dict[str, list[InvalidationHandler]] = {}
+
+    @classmethod
+    async def get(
+        cls,
+        namespace: str,
+        key: str,
+        loader: Callable[[], Awaitable[T]],
+        ttl: float = 60,
+    ) -> T:
+        """Return a cached value or load it using the loader.
+
+        None values are not cached.
+        """
+        ckey = (namespace, key)
+        if cls.enabled and (entry := cls.entries.get(ckey)) is not None:
+            expires, value = entry
+            if expires > time.monotonic():
+                cls.entries.move_to_end(ckey)
+                return value
+            cls.entries.pop(ckey, None)
+
+        generation = cls.generation
+        value = await loader()
+        if value is not None and cls.enabled and generation == cls.generation:
+            cls.entries[ckey] = (time.monotonic() + ttl, value)
+            if len(cls.entries) > cls.max_size:
+                cls.entries.popitem(last=False)
+        return value
+
+    @classmethod
+    def drop(cls, namespace: str, key: str | None = None) -> None:
+        """Remove an entry (or the whole namespace) from the local cache."""
+        cls.generation += 1
+        if key is not None:
+            cls.entries.pop((namespace, key), None)
+            return
+        for ckey in [ckey for ckey in cls.entries if ckey[0] == namespace]:
+            cls.entries.pop(ckey, None)
+
+    @classmethod
+    def clear(cls) -> None:
+        cls.generation += 1
+        cls.entries.clear()
+
+    @classmethod
+    async def invalidate(cls, namespace: str, key: str | None = None) -> None:
+        """Invalidate an entry (or the whole namespace) in all workers.
+
+        Handlers registered for the namespace are called in the other
+        workers. The caller is responsible for updating the local state.
+        """
+        cls.drop(namespace, key)
+        message = {
+            "topic": INVALIDATION_TOPIC,
+            "namespace": namespace,
+            "key": key,
+            "sender": cls.worker_id,
+        }
+        await Redis.publish(json_dumps(message))
+
+    @classmethod
+    def on_invalidate(cls, namespace: str, handler: InvalidationHandler) -> None:
+        """Register a handler called when a namespace is invalidated
+        by another worker"""
+        cls.handlers.setdefault(namespace, []).append(handler)
+
+    @classmethod
+    async def handle_message(cls, message: dict[str, Any]) -> None:
+        if message.get("sender") == cls.worker_id:
+            return
+        namespace = message["namespace"]
+        key = message.get("key")
+        cls.drop(namespace, key)
+        for handler in cls.handlers.get(namespace, []):
+            try:
+                await handler(key)
+            except Exception:
+                log_traceback(f"Unable to handle {namespace} cache invalidation")
@@ -1,4 +1,5 @@
 import asyncio
+import time
 from contextlib import asynccontextmanager
 from typing import TYPE_CHECKING, Any, AsyncGenerator
 
@@ -9,6 +10,7 @@ from asyncpg.pool import PoolConnectionProxy
 
 from ayon_server.config import ayonconfig
 from ayon_server.exceptions import AyonException, ServiceUnavailableException
+from ayon_server.lib.postgres_metrics import query_metrics
 from ayon_server.utils import EntityID, json_dumps, json_loads
 
 if TYPE_CHECKING:
@@ -43,10 +45,13 @@ class Postgres:
         if timeout is None:
             timeout = ayonconfig.postgres_pool_timeout
 
+        start_time = time.monotonic()
         try:
             connection_proxy = await cls.pool.acquire(timeout=timeout)
         except asyncio.TimeoutError:
+            query_metrics.pool_timeouts += 1
             raise ServiceUnavailableException("Database pool timeout")
+        query_metrics.observe_acquire(time.monotonic() - start_time)
 
         try:
             yield connection_proxy
@@ -68,6 +73,15 @@ class Postgres:
             decoder=lambda x: EntityID.parse(x, True),
             schema="pg_catalog",
         )
+        conn.add_query_logger(cls.log_query)
+
+    @staticmethod
+    def log_query(record) -> None:
+        """Record the duration of a query executed on a pooled connection.
+
+        Cursors are not reported by asyncpg, so `iterate` records them itself.
+        """
+        query_metrics.observe_query(record.query, record.elapsed)
 
     @classmethod
     def get_available_connections(cls) -> int:
@@ -91,6 +105,10 @@ class Postgres:
             min_size=10,
             max_size=ayonconfig.postgres_pool_size,
             max_inactive_connection_lifetime=20,
+            # Statements generated by resolvers and loaders are long,
+            # but repeated, so keep them prepared as well.
+            statement_cache_size=ayonconfig.postgres_statement_cache_size,
+            max_cacheable_statement_size=64 * 1024,
             init=cls.init_connection,
         )
 
@@ -121,7 +139,40 @@ class Postgres:
         if cls.pool is None:
             raise ConnectionError
         async with cls.acquire() as connection:
-            return await connection.fetch(query, *args, timeout=timeout)
+            result = await connection.fetch(query, *args, timeout=timeout)
+        query_metrics.observe_rows(query, len(result))
+        return result
+
+    @classmethod
+    async def _iterate_cursor(
+        cls,
+        connection: Connection,
+        query: str,
+        *args: Any,
+    ) -> AsyncGenerator[asyncpg.Record, None]:
+        """Iterate over a server-side cursor, recording the time spent
+        fetching the rows (not processing them)"""
+        elapsed = 0.0
+        rows = 0
+        exhausted = False
+        iterator = connection.cursor(query, *args).__aiter__()
+        try:
+            while True:
+                start_time = time.monotonic()
+                try:
+                    record = await iterator.__anext__()
+                except StopAsyncIteration:
+                    exhausted = True
+                    break
+                finally:
+                    elapsed += time.monotonic() - start_time
+                rows += 1
+                yield record
+        finally:
+            query_metrics.observe_query(query, elapsed)
+            # Only complete results tell the size of the result set
+            if exhausted:
+                query_metrics.observe_rows(query, rows)
 
     @classmethod
     async def iterate(
@@ -129,23 +180,41 @@ class Postgres:
         query: str,
         *args: Any,
         transaction: Connection | None = None,
+        cursor: bool = True,
     ):
-        """Run a query and return a generator yielding resulting rows records."""
+        """Run a query and return a generator yielding resulting rows records.
+
+        Rows are read using a server-side cursor. Callers iterating
+        over small results may pass `cursor=False` to fetch them at once,
+        so the connection is not held (and no transaction is needed)
+        while the rows are processed.
+
+        Statements are prepared and cached per connection.
+        """
         if transaction:  # temporary. will be fixed
             if not transaction.is_in_transaction():
                 raise AyonException(
                     "Iterate called with a connection which is not in transaction."
                 )
-            statement = await transaction.prepare(query)
-            async for record in statement.cursor(*args):
-                yield record
+            if cursor:
+                async for record in cls._iterate_cursor(transaction, query, *args):
+                    yield record
+            else:
+                result = await transaction.fetch(query, *args)
+                query_metrics.observe_rows(query, len(result))
+                for record in result:
+                    yield record
             return
 
         if cls.pool is None:
             raise ConnectionError
 
+        if not cursor:
+            for record in await cls.fetch(query, *args):
+                yield record
+            return
+
         async with cls.acquire() as connection:
             async with connection.transaction():
-                statement = await connection.prepare(query)
-                async for record in statement.cursor(*args):
+                async for record in cls._iterate_cursor(connection, query, *args):
                     yield record
@@ -0,0 +1,152 @@
+"""Query execution metrics.
+
+`Postgres` reports the duration of every query executed on a pooled
+connection, the number of rows returned by `fetch` and `iterate`,
+and the time spent waiting for a connection from the pool.
+
+Queries are grouped by a normalized fingerprint: project schema names
+and literals are replaced by placeholders and whitespace is collapsed,
+so the same query generated for different projects or with different
+inlined values is counted once.
+
+Metrics are kept in memory of the current process and rendered
+in the Prometheus text format by `/api/metrics/system`.
+"""
+
+import functools
+import re
+
+DURATION_BUCKETS = (
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+)
+
+# Maximum number of distinct fingerprints tracked.
+# Anything above is counted as "other" to keep the memory
+# and the metrics output bounded.
+MAX_FINGERPRINTS = 500
+MAX_FINGERPRINT_LENGTH = 200
+
+_RE_PROJECT_SCHEMA = re.compile(r"\bproject_[a-zA-Z0-9_]+\.")
+_RE_STRING = re.compile(r"'(?:[^']|'')*'")
+_RE_NUMBER = re.compile(r"(?<![\w$.])-?\d+(?:\.\d+)?\b")
+_RE_WHITESPACE = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=4096)
+def query_fingerprint(query: str) -> str:
+    """Return a normalized form of the query used to group metrics."""
+    query = _RE_PROJECT_SCHEMA.sub("project_*.", query)
+    query = _RE_STRING.sub("?", query)
+    query = _RE_NUMBER.sub("?", query)
+    query = _RE_WHITESPACE.sub(" ", query).strip()
+    return query
+
+
+class Histogram:
+    __slots__ = ("buckets", "counts", "sum", "count")
+
+    def __init__(self, buckets: tuple[float, ...] = DURATION_BUCKETS) -> None:
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+    def render_prometheus(self, name: str, tags: dict[str, str]) -> str:
+        labels = [f'{k}="{v}"' for k, v in tags.items()]
+        result = ""
+        cumulative = 0
+        for bound, count in zip(self.buckets, self.counts):
+            cumulative += count
+            bucket_labels = ",".join([*labels, f'le="{bound}"'])
+            result += f"{name}_bucket{{{bucket_labels}}} {cumulative}\n"
+        bucket_labels = ",".join([*labels, 'le="+Inf"'])
+        result += f"{name}_bucket{{{bucket_labels}}} {self.count}\n"
+        suffix = f"{{{','.join(labels)}}}" if labels else ""
+        result += f"{name}_sum{suffix} {self.sum}\n"
+        result += f"{name}_count{suffix} {self.count}\n"
+        return result
+
+
+class QueryStats:
+    __slots__ = ("duration", "rows")
+
+    def __init__(self) -> None:
+        self.duration = Histogram()
+        self.rows = 0
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", " ")
+
+
+class QueryMetrics:
+    def __init__(self) -> None:
+        self.queries: dict[str, QueryStats] = {}
+        self.pool_acquire = Histogram()
+        self.pool_timeouts = 0
+
+    def get_stats(self, query: str) -> QueryStats | None:
+        return self.queries.get(query_fingerprint(query))
+
+    def _get_or_create_stats(self, query: str) -> QueryStats:
+        fingerprint = query_fingerprint(query)
+        if (stats := self.queries.get(fingerprint)) is None:
+            if len(self.queries) >= MAX_FINGERPRINTS:
+                fingerprint = "other"
+            stats = self.queries.setdefault(fingerprint, QueryStats())
+        return stats
+
+    def observe_query(self, query: str, duration: float) -> None:
+        self._get_or_create_stats(query).duration.observe(duration)
+
+    def observe_rows(self, query: str, rows: int) -> None:
+        self._get_or_create_stats(query).rows += rows
+
+    def observe_acquire(self, wait: float) -> None:
+        self.pool_acquire.observe(wait)
+
+    def render_prometheus(self, prefix: str = "ayon") -> str:
+        result = f"# TYPE {prefix}_db_pool_acquire_seconds histogram\n"
+        result += self.pool_acquire.render_prometheus(
+            f"{prefix}_db_pool_acquire_seconds", {}
+        )
+        result += f"{prefix}_db_pool_timeouts_total {self.pool_timeouts}\n"
+
+        if not self.queries:
+            return result
+
+        result += f"# TYPE {prefix}_db_query_duration_seconds histogram\n"
+        rows_result = f"# TYPE {prefix}_db_query_rows_total counter\n"
+        for fingerprint, stats in self.queries.items():
+            tags = {"query": _escape_label(fingerprint[:MAX_FINGERPRINT_LENGTH])}
+            result += stats.duration.render_prometheus(
+                f"{prefix}_db_query_duration_seconds", tags
+            )
+            rows_result += (
+                f'{prefix}_db_query_rows_total{{query="{tags["query"]}"}} '
+                f"{stats.rows}\n"
+            )
+        return result + rows_result
+
+
+query_metrics = QueryMetrics()
@@ -1,7 +1,9 @@
-from typing import Any, Awaitable, Union
+from contextlib import asynccontextmanager
+from typing import Any, AsyncGenerator, Awaitable, Union
 
 from redis import asyncio as aioredis
-from redis.asyncio.client import PubSub
+from redis.asyncio.client import Pipeline, PubSub
+from redis.commands.core import AsyncScript
 
 from ayon_server.config import ayonconfig
 
@@ -24,10 +26,91 @@ return total_size
 """
 
 
+class RedisPipeline:
+    """Queue commands and send them to Redis in a single round trip.
+
+    Provides the same namespaced interface as `Redis`. Results
+    of the queued commands are returned by `execute`.
+    """
+
+    def __init__(self, pipeline: Pipeline, prefix: str) -> None:
+        self.pipeline = pipeline
+        self.prefix = prefix
+
+    def _key(self, namespace: str, key: str) -> str:
+        return f"{self.prefix}{namespace}-{key}"
+
+    def get(self, namespace: str, key: str) -> "RedisPipeline":
+        self.pipeline.get(self._key(namespace, key))
+        return self
+
+    def set(
+        self, namespace: str, key: str, value: str | bytes, ttl: int = 0
+    ) -> "RedisPipeline":
+        self.pipeline.set(self._key(namespace, key), value, ex=ttl or None)
+        return self
+
+    def delete(self, namespace: str, *keys: str) -> "RedisPipeline":
+        self.pipeline.delete(*[self._key(namespace, key) for key in keys])
+        return self
+
+    def incr(self, namespace: str, key: str, amount: int = 1) -> "RedisPipeline":
+        self.pipeline.incrby(self._key(namespace, key), amount)
+        return self
+
+    def expire(self, namespace: str, key: str, ttl: int) -> "RedisPipeline":
+        self.pipeline.expire(self._key(namespace, key), ttl)
+        return self
+
+    def hincrby(
+        self, namespace: str, key: str, field: str, amount: int = 1
+    ) -> "RedisPipeline":
+        self.pipeline.hincrby(self._key(namespace, key), field, amount)
+        return self
+
+    def hincrbyfloat(
+        self, namespace: str, key: str, field: str, amount: float
+    ) -> "RedisPipeline":
+        self.pipeline.hincrbyfloat(self._key(namespace, key), field, amount)
+        return self
+
+    def hgetall(self, namespace: str, key: str) -> "RedisPipeline":
+        self.pipeline.hgetall(self._key(namespace, key))
+        return self
+
+    def sadd(self, namespace: str, key: str, *values: str) -> "RedisPipeline":
+        self.pipeline.sadd(self._key(namespace, key), *values)
+        return self
+
+    def srem(self, namespace: str, key: str, *values: str) -> "RedisPipeline":
+        self.pipeline.srem(self._key(namespace, key), *values)
+        return self
+
+    def zadd(
+        self, namespace: str, key: str, mapping: dict[str, float]
+    ) -> "RedisPipeline":
+        self.pipeline.zadd(self._key(namespace, key), mapping)  # type: ignore
+        return self
+
+    def zrem(self, namespace: str, key: str, *values: str) -> "RedisPipeline":
+        self.pipeline.zrem(self._key(namespace, key), *values)
+        return self
+
+    def publish(self, message: str, channel: str | None = None) -> "RedisPipeline":
+        if channel is None:
+            channel = ayonconfig.redis_channel
+        self.pipeline.publish(channel, message)
+        return self
+
+    async def execute(self) -> list[Any]:
+        return await self.pipeline.execute()
+
+
 class Redis:
     connected: bool = False
     redis_pool: aioredis.Redis
     prefix: str = ""
+    scripts: dict[str, AsyncScript] = {}
 
     @classmethod
     async def connect(cls) -> None:
@@ -54,6 +137,20 @@ class Redis:
         value = await cls.redis_pool.get(f"{cls.prefix}{namespace}-{key}")
         return value
 
+    @classmethod
+    async def mget(cls, namespace: str, keys: list[str]) -> list[Any]:
+        """Get multiple values from Redis using a single request.
+
+        Values are returned in the order of the keys, None for missing keys.
+        """
+        if not keys:
+            return []
+        if not cls.connected:
+            await cls.connect()
+        return await cls.redis_pool.mget(
+            [f"{cls.prefix}{namespace}-{key}" for key in keys]
+        )
+
     @classmethod
     async def set(
         cls, namespace: str, key: str, value: str | bytes, ttl: int = 0
@@ -71,11 +168,28 @@ class Redis:
         await cls.redis_pool.execute_command(*command)
 
     @classmethod
-    async def delete(cls, namespace: str, key: str) -> None:
-        """Delete a record from Redis"""
+    async def mset(
+        cls,
+        namespace: str,
+        items: dict[str, str | bytes],
+        ttl: int = 0,
+    ) -> None:
+        """Create/update multiple records in Redis using a single request."""
+        if not items:
+            return
+        async with cls.pipeline(transaction=True) as pipe:
+            for key, value in items.items():
+                pipe.set(namespace, key, value, ttl=ttl)
+            await pipe.execute()
+
+    @classmethod
+    async def delete(cls, namespace: str, *keys: str) -> None:
+        """Delete one or more records from Redis"""
+        if not keys:
+            return
         if not cls.connected:
             await cls.connect()
-        await cls.redis_pool.delete(f"{cls.prefix}{namespace}-{key}")
+        await cls.redis_pool.delete(*[f"{cls.prefix}{namespace}-{key}" for key in keys])
 
     @classmethod
     async def incr(cls, namespace: str, key: str) -> int:
@@ -92,6 +206,165 @@ class Redis:
             await cls.connect()
         await cls.redis_pool.expire(f"{cls.prefix}{namespace}-{key}", ttl)
 
+    @classmethod
+    async def hget(cls, namespace: str, key: str, field: str) -> Any:
+        """Get a field of a hash in Redis"""
+        if not cls.connected:
+            await cls.connect()
+        return await cls.redis_pool.hget(f"{cls.prefix}{namespace}-{key}", field)
+
+    @classmethod
+    async def hgetall(cls, namespace: str, key: str) -> dict[str, Any]:
+        """Get all fields of a hash in Redis"""
+        if not cls.connected:
+            await cls.connect()
+        result = await cls.redis_pool.hgetall(f"{cls.prefix}{namespace}-{key}")
+        return {
+            field.decode("utf-8") if isinstance(field, bytes) else field: value
+            for field, value in result.items()
+        }
+
+    @classmethod
+    async def hset(
+        cls,
+        namespace: str,
+        key: str,
+        mapping: dict[str, str | bytes | int],
+    ) -> None:
+        """Set fields of a hash in Redis"""
+        if not mapping:
+            return
+        if not cls.connected:
+            await cls.connect()
+        await cls.redis_pool.hset(
+            f"{cls.prefix}{namespace}-{key}",
+            mapping=mapping,  # type: ignore[arg-type]
+        )
+
+    @classmethod
+    async def hincrby(
+        cls, namespace: str, key: str, field: str, amount: int = 1
+    ) -> int:
+        """Increment a field of a hash in Redis"""
+        if not cls.connected:
+            await cls.connect()
+        return await cls.redis_pool.hincrby(
+            f"{cls.prefix}{namespace}-{key}", field, amount
+        )
+
+    @classmethod
+    async def hdel(cls, namespace: str, key: str, *fields: str) -> None:
+        """Delete fields of a hash in Redis"""
+        if not fields:
+            return
+        if not cls.connected:
+            await cls.connect()
+        await cls.redis_pool.hdel(f"{cls.prefix}{namespace}-{key}", *fields)
+
+    @classmethod
+    @asynccontextmanager
+    async def pipeline(
+        cls, transaction: bool = False
+    ) -> AsyncGenerator[RedisPipeline, None]:
+        """Create a pipeline sending queued commands in a single round trip.
+
+        With `transaction=True`, the commands are executed atomically
+        (MULTI/EXEC). Queued commands are sent by calling `execute`.
+        """
+        if not cls.connected:
+            await cls.connect()
+        async with cls.redis_pool.pipeline(transaction=transaction) as pipe:
+            yield RedisPipeline(pipe, cls.prefix)
+
+    @classmethod
+    async def sadd(cls, namespace: str, key: str, *values: str) -> int:
+        """Add values to a set in Redis"""
+        if not cls.connected:
+            await cls.connect()
+        return await cls.redis_pool.sadd(f"{cls.prefix}{namespace}-{key}", *values)
+
+    @classmethod
+    async def srem(cls, namespace: str, key: str, *values: str) -> None:
+        """Remove values from a set in Redis"""
+        if not values:
+            return
+        if not cls.connected:
+            await cls.connect()
+        await cls.redis_pool.srem(f"{cls.prefix}{namespace}-{key}", *values)
+
+    @classmethod
+    async def smembers(cls, namespace: str, key: str) -> list[str]:
+        """Get all members of a set in Redis"""
+        if not cls.connected:
+            await cls.connect()
+        result = await cls.redis_pool.smembers(f"{cls.prefix}{namespace}-{key}")
+        return [
+            value.decode("utf-8") if isinstance(value, bytes) else value
+            for value in result
+        ]
+
+    @classmethod
+    async def zrangebyscore(
+        cls,
+        namespace: str,
+        key: str,
+        min_score: float | str = "-inf",
+        max_score: float | str = "+inf",
+        limit: int | None = None,
+    ) -> list[str]:
+        """Get members of a sorted set with scores in the given range,
+        ordered by the score"""
+        if not cls.connected:
+            await cls.connect()
+        result = await cls.redis_pool.zrangebyscore(
+            f"{cls.prefix}{namespace}-{key}",
+            min_score,
+            max_score,
+            start=0 if limit is not None else None,
+            num=limit,
+        )
+        return [
+            value.decode("utf-8") if isinstance(value, bytes) else str(value)
+            for value in result
+        ]
+
+    @classmethod
+    async def zcount(
+        cls,
+        namespace: str,
+        key: str,
+        min_score: float | str = "-inf",
+        max_score: float | str = "+inf",
+    ) -> int:
+        """Count members of a sorted set with scores in the given range"""
+        if not cls.connected:
+            await cls.connect()
+        return await cls.redis_pool.zcount(
+            f"{cls.prefix}{namespace}-{key}", min_score, max_score
+        )
+
+    @classmethod
+    async def eval(
+        cls,
+        script: str,
+        keys: list[tuple[str, str]],
+        *args: Any,
+    ) -> Any:
+        """Run a Lua script atomically.
+
+        Keys are provided as (namespace, key) tuples. Scripts are
+        registered on the first use and then executed using EVALSHA.
+        """
+        if not cls.connected:
+            await cls.connect()
+        if (registered := cls.scripts.get(script)) is None:
+            registered = cls.redis_pool.register_script(script)
+            cls.scripts[script] = registered
+        return await registered(
+            keys=[f"{cls.prefix}{namespace}-{key}" for namespace, key in keys],
+            args=list(args),
+        )
+
     @classmethod
     async def pubsub(cls) -> PubSub:
         """Create a Redis pubsub connection"""
@@ -109,29 +382,53 @@ class Redis:
         await cls.redis_pool.publish(channel, message)
 
     @classmethod
-    async def keys(cls, namespace: str) -> list[str]:
+    async def scan(
+        cls,
+        namespace: str,
+        pattern: str = "*",
+        batch_size: int = 1000,
+    ) -> AsyncGenerator[list[str], None]:
+        """Iterate over keys of a namespace matching a pattern in batches.
+
+        Uses SCAN, so unlike KEYS, it does not block the server
+        while the whole keyspace is traversed. Keys are yielded
+        without the namespace.
+        """
         if not cls.connected:
             await cls.connect()
-        keys = await cls.redis_pool.keys(f"{cls.prefix}{namespace}-*")
-        return [
-            key.decode("ascii").removeprefix(f"{cls.prefix}{namespace}-")
-            for key in keys
-        ]
+
+        key_prefix = f"{cls.prefix}{namespace}-"
+        batch: list[str] = []
+        async for key in cls.redis_pool.scan_iter(
+            match=f"{key_prefix}{pattern}", count=batch_size
+        ):
+            batch.append(key.decode("ascii").removeprefix(key_prefix))
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+        if batch:
+            yield batch
 
     @classmethod
-    async def iterate(cls, namespace: str):
+    async def keys(cls, namespace: str) -> list[str]:
+        result = []
+        async for batch in cls.scan(namespace):
+            result.extend(batch)
+        return result
+
+    @classmethod
+    async def iterate(cls, namespace: str, batch_size: int = 1000):
         """Iterate over stored keys and yield [key, payload] tuples
         matching given namespace.
-        """
-        if not cls.connected:
-            await cls.connect()
 
-        async for key in cls.redis_pool.scan_iter(match=f"{cls.prefix}{namespace}-*"):
-            key_without_ns = key.decode("ascii").removeprefix(
-                f"{cls.prefix}{namespace}-"
-            )
-            payload = await cls.redis_pool.get(key)
-            yield key_without_ns, payload
+        Values are fetched in batches using MGET. Keys removed
+        during the iteration are skipped.
+        """
+        async for keys in cls.scan(namespace, batch_size=batch_size):
+            for key, payload in zip(keys, await cls.mget(namespace, keys)):
+                if payload is None:
+                    continue
+                yield key, payload
 
     @classmethod
     async def get_total_size(cls) -> int:
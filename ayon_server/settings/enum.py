@@ -1,16 +1,30 @@
 from aiocache import cached
 
+from ayon_server.lib.local_cache import LocalCache
 from ayon_server.lib.postgres import Postgres
 from ayon_server.settings.anatomy import Anatomy
 
 
-async def get_primary_anatomy_preset():
+async def load_primary_anatomy_preset() -> Anatomy:
     query = "SELECT * FROM anatomy_presets WHERE is_primary is TRUE"
     async for row in Postgres.iterate(query):
         return Anatomy(**row["data"])
     return Anatomy()
 
 
+async def get_primary_anatomy_preset() -> Anatomy:
+    """Return the primary anatomy preset (or the built-in one).
+
+    The preset is cached in the worker memory, callers get a copy.
+    """
+    anatomy = await LocalCache.get(
+        "global",
+        "primary-anatomy-preset",
+        load_primary_anatomy_preset,
+    )
+    return anatomy.copy(deep=True)
+
+
 async def folder_types_enum(project_name: str | None = None):
     if project_name is None:
         anatomy = await get_primary_anatomy_preset()
@@ -44,7 +44,7 @@ async def get_folder_suggestions(
         LEFT JOIN LATERAL (
             SELECT count(*) as rel_count
             FROM project_{project_name}.tasks t
-            JOIN project_{project_name}.hierarchy h ON t.folder_id = h.id
+            JOIN project_{project_name}.entity_paths h ON t.folder_id = h.entity_id
             WHERE
                 t.assignees @> ARRAY[u.name]
                 AND h.path LIKE '{folder.path.lstrip("/")}%'
@@ -87,7 +87,7 @@ async def get_folder_suggestions(
 
         FROM project_{project_name}.tasks t
         JOIN project_{project_name}.folders f ON t.folder_id = f.id
-        JOIN project_{project_name}.hierarchy h ON t.folder_id = h.id
+        JOIN project_{project_name}.entity_paths h ON t.folder_id = h.entity_id
         WHERE h.path LIKE '{folder.path.lstrip("/")}%'
         ORDER BY t.name ASC;
     """
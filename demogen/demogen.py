@@ -16,6 +16,8 @@ from ayon_server.entities import (
     VersionEntity,
     WorkfileEntity,
 )
+from ayon_server.helpers.hierarchy_cache import rebuild_hierarchy_cache
+from ayon_server.helpers.version_list import rebuild_version_list
 from ayon_server.lib.postgres import Connection, Postgres
 from ayon_server.utils import create_uuid, dict_exclude
 from demogen.generators import generators
@@ -77,13 +79,9 @@ class DemoGen:
             tasks.append(self.create_branch(**folder_data))
 
         await asyncio.gather(*tasks)
-        logging.info("Refreshing views")
-        await Postgres.execute(
-            f"""
-            REFRESH MATERIALIZED VIEW project_{self.project.name}.hierarchy;
-            REFRESH MATERIALIZED VIEW project_{self.project.name}.version_list;
-            """
-        )
+        logging.info("Rebuilding version list and hierarchy cache")
+        await rebuild_version_list(self.project.name)
+        await rebuild_hierarchy_cache(self.project.name)
 
         elapsed_time = time.monotonic() - start_time
         logging.info(f"{self.folder_count} folders created")
@@ -89,8 +89,8 @@ async def query_entities(
             project_{project_name}.versions v
             ON s.id = v.product_id
         INNER JOIN
-            project_{project_name}.hierarchy h
-            ON f.id = h.id
+            project_{project_name}.entity_paths h
+            ON f.id = h.entity_id
         INNER JOIN
             project_{project_name}.version_list l
             ON s.id = l.product_id
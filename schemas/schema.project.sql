@@ -73,9 +73,9 @@ CREATE INDEX IF NOT EXISTS idx_activity_reference_created_at ON activity_referen
 CREATE UNIQUE INDEX IF NOT EXISTS idx_activity_reference_unique ON activity_references(activity_id, entity_id, entity_name, reference_type);
 
 
--- This will be implemented later. 
--- Now we can create the table, but until we start populating it
--- and invalidating it, hierarchy crawling won't work (but won't break)
+-- Entity paths
+-- Folder paths (without leading slash) are maintained incrementally
+-- by the server on folder save / delete (only the affected subtree is updated)
 
 CREATE TABLE IF NOT EXISTS entity_paths (
     entity_id UUID PRIMARY KEY,
@@ -83,6 +83,7 @@ CREATE TABLE IF NOT EXISTS entity_paths (
     path VARCHAR NOT NULL
 );
 CREATE INDEX IF NOT EXISTS entity_paths_path_idx ON entity_paths USING GIN (path public.gin_trgm_ops);
+CREATE INDEX IF NOT EXISTS entity_paths_path_prefix_idx ON entity_paths (path varchar_pattern_ops);
 
 
 CREATE OR REPLACE VIEW activity_feed AS
@@ -170,29 +171,10 @@ CREATE UNIQUE INDEX folder_root_unique_name ON folders (name)
 
 
 -- Hierarchy view
--- Materialized view used as a shorthand to get folder parents/full path
-
-CREATE MATERIALIZED VIEW hierarchy 
-AS 
-    WITH htable AS (
-        WITH RECURSIVE hierarchy AS (
-            SELECT id, name, parent_id, 1 as pos, id as base_id
-            FROM
-                folders
-            UNION
-                SELECT e.id, e.name, e.parent_id, pos + 1, base_id
-                FROM folders e
-                INNER JOIN hierarchy s ON s.parent_id = e.id
-        ) SELECT
-            base_id,
-            string_agg(name, '/' ORDER BY pos DESC) as path
-        FROM
-            hierarchy
-        GROUP BY base_id
-   )
-   SELECT base_id AS id, path FROM htable;
-
-CREATE UNIQUE INDEX hierarchy_id ON hierarchy (id);
+-- Kept for backwards compatibility (addons). Server code reads entity_paths directly.
+
+CREATE OR REPLACE VIEW hierarchy AS
+    SELECT entity_id AS id, path FROM entity_paths WHERE entity_type = 'folder';
 
 
 CREATE TABLE exported_attributes(
@@ -255,6 +237,17 @@ CREATE INDEX product_type_idx ON products(product_type);
 CREATE UNIQUE INDEX product_creation_order_idx ON products(creation_order);
 CREATE UNIQUE INDEX product_unique_name_parent ON products (folder_id, name) WHERE (active IS TRUE);
 
+-- Folder counts
+-- Numbers of direct subfolders, products and tasks of each folder
+-- Maintained by the server per folder when its children change
+
+CREATE TABLE folder_counts(
+    folder_id UUID NOT NULL PRIMARY KEY REFERENCES folders(id) ON DELETE CASCADE,
+    child_count INTEGER NOT NULL DEFAULT 0,
+    product_count INTEGER NOT NULL DEFAULT 0,
+    task_count INTEGER NOT NULL DEFAULT 0
+);
+
 --------------
 -- VERSIONS --
 --------------
@@ -282,20 +275,15 @@ CREATE INDEX version_parent_idx ON versions(product_id);
 CREATE UNIQUE INDEX version_creation_order_idx ON versions(creation_order);
 CREATE UNIQUE INDEX version_unique_version_parent ON versions (product_id, version) WHERE (active IS TRUE);
 
--- Version list VIEW
--- Materialized view used as a shorthand to get product versions
-
-CREATE MATERIALIZED VIEW version_list
-AS
-    SELECT
-        v.product_id AS product_id,
-        array_agg(v.id ORDER BY v.version ) AS ids, 
-        array_agg(v.version ORDER BY v.version ) AS versions
-    FROM
-        versions AS v
-    GROUP BY v.product_id;
+-- Version list
+-- Shorthand to get product versions (ordered by version number)
+-- Maintained by the server per product when its versions change
 
-CREATE UNIQUE INDEX version_list_id ON version_list (product_id);
+CREATE TABLE version_list(
+    product_id UUID NOT NULL PRIMARY KEY REFERENCES products(id) ON DELETE CASCADE,
+    ids UUID[] NOT NULL,
+    versions INTEGER[] NOT NULL
+);
 
 ---------------------
 -- REPRESENTATIONS --
@@ -37,6 +37,7 @@ CREATE TABLE IF NOT EXISTS public.users(
 );
 
 CREATE UNIQUE INDEX IF NOT EXISTS username_idx ON public.users (LOWER(name));
+CREATE INDEX IF NOT EXISTS user_api_key_idx ON public.users USING HASH ((data->>'apiKey'));
 
 
 -- Product types
@@ -90,6 +91,20 @@ CREATE INDEX IF NOT EXISTS event_created_at_idx ON events (created_at);
 CREATE INDEX IF NOT EXISTS event_updated_at_idx ON events (updated_at);
 CREATE INDEX IF NOT EXISTS event_status_idx ON events (status);
 CREATE INDEX IF NOT EXISTS event_retries_idx ON events (retries);
+CREATE INDEX IF NOT EXISTS event_depends_on_topic_idx ON events (depends_on, topic);
+CREATE INDEX IF NOT EXISTS event_finished_created_at_idx ON events (created_at) WHERE status = 'finished';
+
+-- Oldest candidate source event of each enroll request (see events.watermarks)
+
+CREATE TABLE IF NOT EXISTS public.enroll_watermarks(
+  key VARCHAR NOT NULL PRIMARY KEY,
+  source_topics VARCHAR[] NOT NULL,
+  target_topic VARCHAR NOT NULL,
+  watermark TIMESTAMPTZ NOT NULL,
+  updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS enroll_watermarks_target_topic_idx ON public.enroll_watermarks (target_topic);
 
 --------------
 -- Settings --
@@ -437,3 +437,128 @@ BEGIN
     END LOOP;
 END $$;
 
+
+----------------
+-- AYON 1.5.0 --
+----------------
+
+-- Replace the hierarchy materialized view with incrementally
+-- maintained entity_paths table
+
+CREATE OR REPLACE FUNCTION migrate_hierarchy_to_entity_paths()
+   RETURNS VOID  AS
+   $$
+   DECLARE rec RECORD;
+   BEGIN
+        FOR rec IN
+          SELECT schemaname FROM pg_matviews
+          WHERE matviewname = 'hierarchy' AND schemaname LIKE 'project_%'
+        LOOP
+            RAISE WARNING 'Migrating hierarchy of %', rec.schemaname;
+            EXECUTE 'SET LOCAL search_path TO ' || quote_ident(rec.schemaname);
+
+            DELETE FROM entity_paths WHERE entity_type = 'folder';
+            WITH RECURSIVE tree AS (
+                SELECT id, name::VARCHAR AS path
+                FROM folders WHERE parent_id IS NULL
+                UNION ALL
+                SELECT f.id, t.path || '/' || f.name
+                FROM folders f INNER JOIN tree t ON f.parent_id = t.id
+            )
+            INSERT INTO entity_paths (entity_id, entity_type, path)
+            SELECT id, 'folder', path FROM tree
+            ON CONFLICT (entity_id) DO UPDATE SET path = EXCLUDED.path;
+
+            CREATE INDEX IF NOT EXISTS entity_paths_path_prefix_idx
+              ON entity_paths (path varchar_pattern_ops);
+
+            DROP MATERIALIZED VIEW hierarchy;
+            CREATE OR REPLACE VIEW hierarchy AS
+                SELECT entity_id AS id, path FROM entity_paths
+                WHERE entity_type = 'folder';
+        END LOOP;
+        RETURN;
+   END;
+   $$ LANGUAGE plpgsql;
+
+SELECT migrate_hierarchy_to_entity_paths();
+DROP FUNCTION IF EXISTS migrate_hierarchy_to_entity_paths();
+
+
+-- Replace the version_list materialized view with incrementally
+-- maintained table
+
+CREATE OR REPLACE FUNCTION migrate_version_list()
+   RETURNS VOID  AS
+   $$
+   DECLARE rec RECORD;
+   BEGIN
+        FOR rec IN
+          SELECT schemaname FROM pg_matviews
+          WHERE matviewname = 'version_list' AND schemaname LIKE 'project_%'
+        LOOP
+            RAISE WARNING 'Migrating version list of %', rec.schemaname;
+            EXECUTE 'SET LOCAL search_path TO ' || quote_ident(rec.schemaname);
+
+            DROP MATERIALIZED VIEW version_list;
+            CREATE TABLE version_list(
+                product_id UUID NOT NULL PRIMARY KEY
+                  REFERENCES products(id) ON DELETE CASCADE,
+                ids UUID[] NOT NULL,
+                versions INTEGER[] NOT NULL
+            );
+            INSERT INTO version_list (product_id, ids, versions)
+            SELECT
+                v.product_id,
+                array_agg(v.id ORDER BY v.version),
+                array_agg(v.version ORDER BY v.version)
+            FROM versions AS v
+            GROUP BY v.product_id;
+        END LOOP;
+        RETURN;
+   END;
+   $$ LANGUAGE plpgsql;
+
+SELECT migrate_version_list();
+DROP FUNCTION IF EXISTS migrate_version_list();
+
+
+-- Add maintained folder counts
+
+CREATE OR REPLACE FUNCTION create_folder_counts()
+   RETURNS VOID  AS
+   $$
+   DECLARE rec RECORD;
+   BEGIN
+        FOR rec IN
+          SELECT DISTINCT table_schema FROM information_schema.tables
+          WHERE table_name = 'folders' AND table_schema LIKE 'project_%'
+          AND table_schema NOT IN (
+            SELECT table_schema FROM information_schema.tables
+            WHERE table_name = 'folder_counts'
+          )
+        LOOP
+            RAISE WARNING 'Creating folder counts of %', rec.table_schema;
+            EXECUTE 'SET LOCAL search_path TO ' || quote_ident(rec.table_schema);
+
+            CREATE TABLE folder_counts(
+                folder_id UUID NOT NULL PRIMARY KEY
+                  REFERENCES folders(id) ON DELETE CASCADE,
+                child_count INTEGER NOT NULL DEFAULT 0,
+                product_count INTEGER NOT NULL DEFAULT 0,
+                task_count INTEGER NOT NULL DEFAULT 0
+            );
+            INSERT INTO folder_counts (folder_id, child_count, product_count, task_count)
+            SELECT
+                f.id,
+                (SELECT COUNT(*) FROM folders AS c WHERE c.parent_id = f.id),
+                (SELECT COUNT(*) FROM products AS p WHERE p.folder_id = f.id),
+                (SELECT COUNT(*) FROM tasks AS t WHERE t.folder_id = f.id)
+            FROM folders AS f;
+        END LOOP;
+        RETURN;
+   END;
+   $$ LANGUAGE plpgsql;
+
+SELECT create_folder_counts();
+DROP FUNCTION IF EXISTS create_folder_counts();
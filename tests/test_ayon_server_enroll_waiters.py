@@ -0,0 +1,37 @@
+import asyncio
+
+from ayon_server.events.waiters import EnrollWaiter
+from ayon_server.lib.local_cache import LocalCache
+
+
+def test_waiter_matches_finished_source_events():
+    waiter = EnrollWaiter(["ftrack.%", "entity.folder.created"], "sync")
+    assert waiter.matches({"topic": "ftrack.update", "status": "finished"})
+    assert waiter.matches({"topic": "entity.folder.created", "status": "finished"})
+    assert not waiter.matches({"topic": "ftrack.update", "status": "in_progress"})
+    assert not waiter.matches({"topic": "entity.folderXcreated", "status": "finished"})
+
+
+def test_waiter_matches_reopened_target_events():
+    waiter = EnrollWaiter("ftrack.update", "sync")
+    assert waiter.matches({"topic": "sync", "status": "failed", "dependsOn": "a"})
+    assert not waiter.matches({"topic": "sync", "status": "failed"})
+    assert not waiter.matches({"topic": "sync", "status": "in_progress"})
+
+
+def test_waiter_is_notified():
+    async def run():
+        LocalCache.enabled = True
+        try:
+            with EnrollWaiter("ftrack.%", "sync") as waiter:
+                loop = asyncio.get_running_loop()
+                message = {"topic": "ftrack.update", "status": "finished"}
+                loop.call_later(0.01, EnrollWaiter.notify, message)
+                assert await waiter.wait(1)
+            assert waiter not in EnrollWaiter.waiters
+            with EnrollWaiter("ftrack.%", "sync") as waiter:
+                assert not await waiter.wait(0.01)
+        finally:
+            LocalCache.enabled = False
+
+    asyncio.run(run())
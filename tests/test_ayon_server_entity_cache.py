@@ -0,0 +1,61 @@
+import asyncio
+import datetime
+
+from ayon_server.config import ayonconfig
+from ayon_server.lib.entity_cache import EntityCache
+from ayon_server.lib.local_cache import LocalCache
+
+NOW = datetime.datetime(2024, 1, 1)
+
+
+class TestEntityCache:
+    def setup_method(self):
+        EntityCache.drop()
+        LocalCache.enabled = True
+        ayonconfig.graphql_entity_cache = True
+        self.loaded: list = []
+
+    def teardown_method(self):
+        EntityCache.drop()
+        LocalCache.enabled = False
+        ayonconfig.graphql_entity_cache = False
+
+    async def loader(self, keys):
+        self.loaded.extend(keys)
+        return [{"id": key[1], "updated_at": NOW} for key in keys]
+
+    def load(self, *keys):
+        cached_loader = EntityCache.wrap("task", self.loader)
+        return asyncio.run(cached_loader(list(keys)))
+
+    def test_shared_between_loads(self):
+        self.load(("p", "a"), ("p", "b"))
+        rows = self.load(("p", "a"), ("p", "c"))
+        assert [row["id"] for row in rows] == ["a", "c"]
+        assert self.loaded == [("p", "a"), ("p", "b"), ("p", "c")]
+
+    def test_entity_event(self):
+        self.load(("p", "a"), ("p", "b"))
+        EntityCache.handle_event(
+            {
+                "topic": "entity.task.status_changed",
+                "project": "p",
+                "summary": {"entityId": "a"},
+            }
+        )
+        self.load(("p", "a"), ("p", "b"))
+        assert self.loaded == [("p", "a"), ("p", "b"), ("p", "a")]
+
+    def test_folder_event_drops_project(self):
+        self.load(("p", "a"), ("q", "a"))
+        EntityCache.handle_event(
+            {"topic": "entity.folder.attrib_changed", "project": "p", "summary": {}}
+        )
+        self.load(("p", "a"), ("q", "a"))
+        assert self.loaded == [("p", "a"), ("q", "a"), ("p", "a")]
+
+    def test_disabled(self):
+        ayonconfig.graphql_entity_cache = False
+        self.load(("p", "a"))
+        self.load(("p", "a"))
+        assert self.loaded == [("p", "a"), ("p", "a")]
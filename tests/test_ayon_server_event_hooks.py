@@ -0,0 +1,87 @@
+import asyncio
+
+from ayon_server.events.base import EventModel
+from ayon_server.events.hooks import EventHook, HookExecutor
+
+
+def create_event() -> EventModel:
+    return EventModel(id="a" * 32, hash="a", topic="test.topic", retries=0)
+
+
+def test_hook_retries_and_failures():
+    calls: list[str] = []
+
+    async def flaky(event):
+        calls.append(event.topic)
+        if len(calls) < 2:
+            raise ValueError("Flaky")
+
+    async def slow(event):
+        await asyncio.sleep(1)
+
+    async def run():
+        executor = HookExecutor()
+        executor.retry_delay = 0
+
+        hook = EventHook("test.topic", flaky, background=True, max_retries=1)
+        await executor.execute(hook, create_event())
+        assert (hook.processed, hook.retried, hook.failed) == (0, 1, 0)
+
+        # Failed call is queued again after the delay
+        await asyncio.sleep(0.01)
+        queued_hook, event, attempt = executor.queue.get_nowait()
+        assert queued_hook is hook and attempt == 1
+        hook.active -= 1
+        await executor.execute(hook, event, attempt)
+        assert (hook.processed, hook.retried, hook.failed) == (1, 1, 0)
+
+        hook = EventHook("test.topic", slow, background=True, timeout=0.01)
+        await executor.execute(hook, create_event())
+        assert (hook.processed, hook.failed) == (0, 1)
+
+    asyncio.run(run())
+
+
+def test_full_queue_drops_hooks():
+    async def handler(event):
+        pass
+
+    async def run():
+        executor = HookExecutor()
+        executor.queue_size = 1
+        hook = EventHook("test.topic", handler, background=True, concurrency=1)
+        executor.submit(hook, create_event())
+        executor.submit(hook, create_event())
+        executor.submit(hook, create_event())
+        assert hook.dropped == 1
+        assert (executor.queue.qsize(), len(hook.pending)) == (1, 1)
+        assert 'topic="test.topic"' in executor.render_prometheus()
+
+    asyncio.run(run())
+
+
+def test_slow_hook_does_not_take_all_slots():
+    async def slow(event):
+        await asyncio.sleep(1)
+
+    async def fast(event):
+        pass
+
+    async def run():
+        executor = HookExecutor()
+        executor.max_tasks = 2
+        slow_hook = EventHook("test.topic", slow, background=True, concurrency=1)
+        fast_hook = EventHook("test.topic", fast, background=True)
+        for _ in range(5):
+            executor.submit(slow_hook, create_event())
+        executor.submit(fast_hook, create_event())
+
+        task = asyncio.create_task(executor.run())
+        await asyncio.sleep(0.05)
+        assert fast_hook.processed == 1
+        assert (slow_hook.active, len(slow_hook.pending)) == (1, 4)
+        task.cancel()
+        for running in executor.tasks:
+            running.cancel()
+
+    asyncio.run(run())
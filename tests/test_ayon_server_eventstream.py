@@ -0,0 +1,48 @@
+import asyncio
+
+import pytest
+
+from ayon_server.events.eventstream import EventStream
+from ayon_server.lib.postgres import Postgres
+from ayon_server.lib.redis import Redis
+
+
+def test_deferred_publishing(monkeypatch):
+    published: list[str] = []
+
+    async def publish(message, *args, **kwargs):
+        published.append(message)
+
+    monkeypatch.setattr(Redis, "publish", publish)
+
+    async def run():
+        async with EventStream.deferred_publishing():
+            await EventStream.dispatch("test.topic", store=False)
+            assert not published
+        assert len(published) == 1
+
+        with pytest.raises(ValueError):
+            async with EventStream.deferred_publishing():
+                await EventStream.dispatch("test.topic", store=False)
+                raise ValueError("Rolled back")
+        assert len(published) == 1
+
+    asyncio.run(run())
+
+
+def test_insert_many_falls_back_to_single_inserts(monkeypatch):
+    events = [EventStream._create_event("test.topic") for _ in range(3)]
+    missing_dependency = events[1].id
+
+    async def fetch(query, *args, **kwargs):
+        raise Postgres.ForeignKeyViolationError("Missing dependency")
+
+    async def execute(query, *args, **kwargs):
+        if missing_dependency in args:
+            raise Postgres.ForeignKeyViolationError("Missing dependency")
+
+    monkeypatch.setattr(Postgres, "fetch", fetch)
+    monkeypatch.setattr(Postgres, "execute", execute)
+
+    inserted = asyncio.run(EventStream._insert_many(events))
+    assert inserted == {events[0].id, events[2].id}
@@ -0,0 +1,56 @@
+import asyncio
+
+from ayon_server.lib.local_cache import LocalCache
+
+
+class TestLocalCache:
+    def setup_method(self):
+        LocalCache.clear()
+        LocalCache.enabled = True
+        self.loads = 0
+
+    def teardown_method(self):
+        LocalCache.clear()
+        LocalCache.enabled = False
+
+    async def loader(self):
+        self.loads += 1
+        return self.loads
+
+    def get(self, key="key", ttl=60):
+        return asyncio.run(LocalCache.get("test", key, self.loader, ttl=ttl))
+
+    def test_cached(self):
+        assert self.get() == 1
+        assert self.get() == 1
+
+    def test_expired(self):
+        assert self.get(ttl=-1) == 1
+        assert self.get() == 2
+
+    def test_drop(self):
+        assert self.get("a") == 1
+        assert self.get("b") == 2
+        LocalCache.drop("test", "a")
+        assert self.get("a") == 3
+        assert self.get("b") == 2
+        LocalCache.drop("test")
+        assert self.get("b") == 4
+
+    def test_disabled(self):
+        LocalCache.enabled = False
+        assert self.get() == 1
+        assert self.get() == 2
+
+    def test_invalidated_while_loading(self):
+        async def loader():
+            LocalCache.drop("test", "key")
+            return "stale"
+
+        asyncio.run(LocalCache.get("test", "key", loader))
+        assert self.get() == 1
+
+    def test_handle_message(self):
+        assert self.get() == 1
+        asyncio.run(LocalCache.handle_message({"namespace": "test", "key": "key"}))
+        assert self.get() == 2
@@ -0,0 +1,29 @@
+from ayon_server.api.messaging import SubscriptionIndex
+
+
+class FakeClient:
+    def __init__(self, id, topics, project_name=None, user_name=None):
+        self.id = id
+        self.topics = topics
+        self.project_name = project_name
+        self.user_name = user_name
+
+
+def test_subscription_index_candidates():
+    index = SubscriptionIndex()
+    index.add(FakeClient("all", ["*"]))
+    index.add(FakeClient("entity", ["entity.folder"], project_name="demo"))
+    index.add(FakeClient("other", ["entity."], project_name="other"))
+    index.add(FakeClient("inbox", ["inbox.message"], user_name="admin"))
+
+    message = {"topic": "entity.folder.created", "project": "demo"}
+    assert index.candidates(message) == {"all", "entity"}
+
+    message = {"topic": "inbox.message", "recipients": ["admin"]}
+    assert index.candidates(message) == {"inbox"}
+
+    index.remove("entity")
+    index.add(FakeClient("all", ["log"]))
+    message = {"topic": "entity.folder.created", "project": "demo"}
+    assert index.candidates(message) == set()
+    assert "" not in index.by_topic
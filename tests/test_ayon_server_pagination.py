@@ -0,0 +1,66 @@
+import pytest
+
+from ayon_server.exceptions import BadRequestException
+from ayon_server.helpers.pagination import (
+    create_pagination,
+    decode_cursor,
+    get_page_flags,
+    sql_literal,
+    typed_attrib_key,
+)
+
+
+def test_sql_literal():
+    assert sql_literal(None) == "NULL"
+    assert sql_literal(True) == "TRUE"
+    assert sql_literal(42) == "42"
+    assert sql_literal(1.5) == "1.5"
+    assert sql_literal("O'Neil") == "'O''Neil'"
+    with pytest.raises(BadRequestException):
+        sql_literal({"a": 1})
+
+
+def test_decode_cursor():
+    assert decode_cursor('["2024-01-01", 5]', 2) == ["2024-01-01", 5]
+    for cursor in ("not json", '{"a": 1}', "[1, 2, 3]"):
+        with pytest.raises(BadRequestException):
+            decode_cursor(cursor, 2)
+
+
+def test_typed_attrib_key():
+    assert typed_attrib_key("f", "fps", "float").startswith("(CASE")
+    assert "::FLOAT8" in typed_attrib_key("f", "frameStart", "integer")
+    assert typed_attrib_key("f", "x", "string") == "COALESCE(f.attrib->>'x', '')"
+    assert typed_attrib_key("f", "x", None) == "COALESCE(f.attrib->>'x', '')"
+
+
+def test_create_pagination_first_after():
+    pagination, conds, cursor = create_pagination(
+        ["name", "creation_order"], first=10, after='["a", 3]'
+    )
+    assert pagination == "ORDER BY name ASC, creation_order ASC LIMIT 11"
+    assert conds == ["(name, creation_order) > ('a', 3)"]
+    assert cursor == "json_build_array(name, creation_order)::text AS cursor"
+
+
+def test_create_pagination_last_before():
+    pagination, conds, cursor = create_pagination(
+        ["creation_order"], last=5, before="[7]", need_cursor=False
+    )
+    assert pagination == "ORDER BY creation_order DESC LIMIT 6"
+    assert conds == ["(creation_order) < (7)"]
+    assert cursor == "NULL AS cursor"
+
+
+def test_create_pagination_default():
+    pagination, conds, _ = create_pagination(["creation_order"])
+    assert pagination == "ORDER BY creation_order ASC LIMIT 101"
+    assert conds == []
+
+
+def test_page_flags():
+    # (has_next_page, has_previous_page)
+    assert get_page_flags(True, first=10) == (True, False)
+    assert get_page_flags(False, first=10, after="[1]") == (False, True)
+    assert get_page_flags(True, last=10) == (False, True)
+    assert get_page_flags(False, last=10, before="[1]") == (True, False)
@@ -0,0 +1,31 @@
+from ayon_server.access.path_access import PathAccessMatcher
+
+
+class TestPathAccessMatcher:
+    def test_match_subtree(self):
+        matcher = PathAccessMatcher(['"assets/characters/%"'])
+        assert matcher.match("assets/characters/hero")
+        assert matcher.match("/assets/characters/hero/rig/")
+        assert not matcher.match("assets/characters")
+        assert not matcher.match("assets/props/hero")
+
+    def test_match_exact(self):
+        matcher = PathAccessMatcher(['"assets"', '"assets/characters"'])
+        assert matcher.match("assets")
+        assert matcher.match("assets/characters")
+        assert not matcher.match("assets/characters/hero")
+
+    def test_like_wildcards_are_literal(self):
+        matcher = PathAccessMatcher(['"assets/char_a/%"'])
+        assert not matcher.match("assets/charXa/hero")
+
+    def test_sql_condition(self):
+        matcher = PathAccessMatcher(
+            ['"assets"', '"assets/char_a/%"', '"assets/char_a/hero"']
+        )
+        assert matcher.sql_condition("path") == (
+            "(path IN ('assets') OR path LIKE 'assets/char\\_a/%')"
+        )
+
+    def test_sql_condition_empty(self):
+        assert PathAccessMatcher([]).sql_condition("path") == "FALSE"
@@ -0,0 +1,42 @@
+from ayon_server.lib.postgres_metrics import QueryMetrics, query_fingerprint
+
+
+class TestQueryFingerprint:
+    def test_project_schema(self):
+        assert query_fingerprint(
+            "SELECT id FROM project_demo.folders"
+        ) == query_fingerprint("SELECT id FROM project_other.folders")
+
+    def test_literals(self):
+        fingerprint = query_fingerprint(
+            "SELECT * FROM t WHERE name = 'it''s'  AND\n x > 10 AND y = $1 LIMIT 5"
+        )
+        assert fingerprint == (
+            "SELECT * FROM t WHERE name = ? AND x > ? AND y = $1 LIMIT ?"
+        )
+
+    def test_identifiers_kept(self):
+        assert query_fingerprint("SELECT col1 FROM t2") == "SELECT col1 FROM t2"
+
+
+class TestQueryMetrics:
+    def test_observe_rows(self):
+        metrics = QueryMetrics()
+        metrics.observe_rows("SELECT * FROM project_demo.tasks", 5)
+        metrics.observe_rows("SELECT * FROM project_other.tasks", 50)
+        stats = metrics.get_stats("SELECT * FROM project_x.tasks")
+        assert stats is not None and stats.rows == 55
+
+    def test_render_prometheus(self):
+        metrics = QueryMetrics()
+        metrics.observe_acquire(0.002)
+        metrics.observe_query('SELECT "a" FROM t', 0.02)
+        metrics.observe_rows('SELECT "a" FROM t', 3)
+        result = metrics.render_prometheus()
+        assert 'ayon_db_pool_acquire_seconds_bucket{le="0.0025"} 1\n' in result
+        assert "ayon_db_pool_acquire_seconds_count 1\n" in result
+        assert (
+            'ayon_db_query_duration_seconds_bucket{query="SELECT \\"a\\" FROM t",'
+            'le="0.01"} 0\n'
+        ) in result
+        assert 'ayon_db_query_rows_total{query="SELECT \\"a\\" FROM t"} 3\n' in result
@@ -0,0 +1,55 @@
+import asyncio
+
+import pytest
+
+from ayon_server.exceptions import NotFoundException
+from ayon_server.helpers import project_list
+from ayon_server.lib.local_cache import LocalCache
+
+
+class TestCanonicalProjectName:
+    def setup_method(self):
+        LocalCache.clear()
+        LocalCache.enabled = True
+        self.queries = 0
+        self.projects = {"demo": "Demo"}
+
+    def teardown_method(self):
+        LocalCache.clear()
+        LocalCache.enabled = False
+
+    @pytest.fixture(autouse=True)
+    def patch_loaders(self, monkeypatch):
+        async def load_project_name_map():
+            return {"demo": "Demo"}
+
+        async def query_project_name_map():
+            self.queries += 1
+            return dict(self.projects)
+
+        monkeypatch.setattr(
+            project_list, "load_project_name_map", load_project_name_map
+        )
+        monkeypatch.setattr(
+            project_list, "query_project_name_map", query_project_name_map
+        )
+        monkeypatch.setattr(project_list, "_name_map_reloaded_at", 0.0)
+
+    def get(self, name):
+        return asyncio.run(project_list.get_canonical_project_name(name))
+
+    def test_known_name(self):
+        assert self.get("DEMO") == "Demo"
+        assert self.queries == 0
+
+    def test_missing_name_reload_is_throttled(self):
+        for _ in range(3):
+            with pytest.raises(NotFoundException):
+                self.get("missing")
+        assert self.queries == 1
+
+    def test_new_project_found_after_reload(self):
+        self.projects["new"] = "New"
+        assert self.get("new") == "New"
+        assert self.get("NEW") == "New"
+        assert self.queries == 1